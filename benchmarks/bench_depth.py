@@ -0,0 +1,89 @@
+"""Benchmark for converting and solving deeply nested formulas.
+
+Builds formulas of increasing length which are as deep as they are long, and times parsing,
+conversion to CNF with each encoding, and finding one solution. Three shapes are measured:
+
+    chain:        a & b & c & ...                 flattened in one pass at the top
+    implications: a -> (b -> (c -> ...))          one OR chain, nested to the right
+    negations:    ~(a & ~(b | ~(c & ...)))        one OR chain, through alternating negations
+
+Every traversal uses an explicit stack, so the formulas do not hit the recursion limit, and
+every chain is built once from all its operands, so the time per term stays roughly constant
+as the depth grows. The benchmark checks this, and fails if the time per term of any step
+grows by more than MAX_GROWTH between the smallest and the largest depth.
+
+    Typical usage example:
+
+    python -m benchmarks.bench_depth
+"""
+
+import time
+
+from bsat.logic import ExpressionBuilder
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver
+
+DEPTHS = [1000, 3000, 10000, 30000]
+
+MAX_GROWTH = 4
+
+
+def variable(i: int) -> str:
+    """Returns the i-th variable name among a, b, ..., z, aa, ab, ..."""
+    name = ''
+    i += 1
+    while i > 0:
+        i, r = divmod(i - 1, 26)
+        name = chr(ord('a') + r) + name
+
+    return name
+
+
+def chain(depth: int) -> str:
+    """Returns a left-nested conjunction of 'depth' distinct variables."""
+    return ' & '.join(variable(i) for i in range(depth))
+
+
+def implications(depth: int) -> str:
+    """Returns a right-nested chain of implications between 'depth' distinct variables."""
+    return ' -> ('.join(variable(i) for i in range(depth)) + ')' * (depth - 1)
+
+
+def negations(depth: int) -> str:
+    """Returns 'depth' distinct variables nested in negations of alternating AND and OR."""
+    operators = ['&', '|']
+    prefix = ''.join(f'~({variable(i)} {operators[i % 2]} ' for i in range(depth - 1))
+    return prefix + variable(depth - 1) + ')' * (depth - 1)
+
+
+SHAPES = {'chain': chain, 'implications': implications, 'negations': negations}
+
+
+def timed(function) -> float:
+    """Returns the time taken by a single call of a function, in seconds."""
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main(depths=DEPTHS):
+    steps = ['parse', 'distribute', 'tseitin', 'solve']
+    for shape, build in SHAPES.items():
+        print(f'{shape:>12} ' + ' '.join(f'{step:>10}' for step in steps) + '   (us/term)')
+        rows = []
+        for depth in depths:
+            formula = build(depth)
+            times = [timed(lambda: ExpressionBuilder.from_proposition(formula)),
+                     timed(lambda: CNF(formula)),
+                     timed(lambda: CNF(formula, CNF.TSEITIN)),
+                     timed(lambda: CDCLSolver().solve(formula, max_solutions=1).is_false)]
+            rows.append([t / depth for t in times])
+            print(f'{depth:>12} ' + ' '.join(f'{t * 1e6:>10.1f}' for t in rows[-1]))
+
+        for step, first, last in zip(steps, rows[0], rows[-1]):
+            assert last <= MAX_GROWTH * first, \
+                f'{shape}: time per term of {step} grew {last / first:.1f}x from depth {depths[0]} to {depths[-1]}'
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Micro-benchmark for parsing propositional formulas.
+
+Compares the per-formula cost of building the lexer and parser for every formula (as
+was done before the tables were shared) with parsing through the shared, precompiled
+parser.
+
+    Typical usage example:
+
+    python -m benchmarks.bench_parser
+"""
+
+import timeit
+
+from bsat.logic.grammar import PropositionParser
+from bsat.logic.grammar import _Lexer, _Parser
+
+FORMULA = '(p -> q) & (q <-> ~r) | (p + s) & ~(r | s) -> t'
+
+
+def parse_rebuilding(formula: str):
+    """Parses a formula after building a new lexer and parser."""
+    lexer = _Lexer.build()
+    parser = _Parser.build()
+    return parser.parse(formula, lexer=lexer)
+
+
+def parse_shared(formula: str):
+    """Parses a formula with the shared parser."""
+    return PropositionParser().parse(formula)
+
+
+def main(number: int = 200):
+    assert parse_rebuilding(FORMULA) == parse_shared(FORMULA)
+
+    rebuilding = timeit.timeit(lambda: parse_rebuilding(FORMULA), number=number) / number
+    shared = timeit.timeit(lambda: parse_shared(FORMULA), number=number) / number
+
+    print(f'rebuilding parser: {rebuilding * 1e6:10.1f} us/formula')
+    print(f'shared parser:     {shared * 1e6:10.1f} us/formula')
+    print(f'speedup:           {rebuilding / shared:10.1f}x')
+
+
+if __name__ == '__main__':
+    main()
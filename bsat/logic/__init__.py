@@ -1,7 +1,7 @@
 """Provides APIs for writing and manipulating Boolean logic expressions..
 """
 
-from ._logic import Expression, UnaryOperation, BinaryOperation, Literal
+from ._logic import Expression, UnaryOperation, BinaryOperation, NaryOperation, Literal
 from .grammar import PropositionParser, Operators
 
 
@@ -23,39 +23,53 @@ class ExpressionBuilder:
     def from_parse_tree(cls, tree) -> Expression:
         """Builds a Boolean expression from a parse tree.
 
+        The tree is traversed with an explicit stack, so its depth is limited only by memory.
+
         Args:
             tree: The parse tree to build the expression from.
         """
         try:
-            if isinstance(tree, list):
-                if len(tree) == 1:
-                    val = tree[0]
-                    if val in list(Operators):
-                        return Operators(val)
+            # Subtrees are built before the operation using them, leaving their results on a stack
+            results = []
+            stack = [(tree, False)]
+            while len(stack) > 0:
+                tree, expanded = stack.pop()
+                if isinstance(tree, list) and len(tree) >= 2:
+                    if not expanded:
+                        stack.append((tree, True))
+                        stack.extend((subtree, False) for subtree in reversed(tree[1:]))
 
                     else:
-                        return Literal(val)
-
-                elif len(tree) == 2:
-                    op = tree[0]
-                    val1 = tree[1]
-                    return UnaryOperation(Operators(op), ExpressionBuilder.from_parse_tree(val1))
-
-                elif len(tree) == 3:
-                    op = tree[0]
-                    val1 = tree[1]
-                    val2 = tree[2]
-                    return BinaryOperation(Operators(op),
-                                           ExpressionBuilder.from_parse_tree(val1),
-                                           ExpressionBuilder.from_parse_tree(val2))
-
-            elif isinstance(tree, str) or isinstance(tree, bool):
-                val = tree
-                if val in list(Operators):
-                    return Operators(val)
+                        operands = results[len(results) - len(tree) + 1:]
+                        del results[len(results) - len(tree) + 1:]
+                        if len(tree) == 2:
+                            results.append(UnaryOperation(Operators(tree[0]), *operands))
+                        elif len(tree) == 3:
+                            results.append(BinaryOperation(Operators(tree[0]), *operands))
+                        else:
+                            results.append(NaryOperation(Operators(tree[0]), operands))
 
                 else:
-                    return Literal(val)
+                    results.append(cls._from_leaf(tree))
+
+            return results[0]
 
         except AssertionError:
             raise RuntimeError('Error reading the parse tree.')
+
+    @staticmethod
+    def _from_leaf(tree):
+        """Builds a literal (or operator) from a leaf of a parse tree, or None if the tree is not valid."""
+        if isinstance(tree, list):
+            if len(tree) != 1:
+                return None
+
+            tree = tree[0]
+
+        elif not isinstance(tree, (str, bool)):
+            return None
+
+        if tree in list(Operators):
+            return Operators(tree)
+
+        return Literal(tree)
@@ -5,8 +5,11 @@ Only the public classes are exported for external use.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List
+from threading import Lock
+from typing import Any, Iterable, List, Tuple
+from weakref import WeakValueDictionary
 
+from ..utils import fold
 from .grammar import FALSE, TRUE, Operators
 
 
@@ -16,111 +19,307 @@ class Expression(ABC):
     Operations are saved as recursive trees, where all operands in the operation may themselves
     be other Boolean operations.
 
+    Expressions are immutable and hash-consed: creating an expression which is structurally equal
+    to an existing one returns the existing object, from a table of all live expressions. Equal
+    subformulas are therefore shared, making the trees a directed acyclic graph (DAG), and two
+    expressions are equal only if they are the same object. Hashes are computed once, from the
+    hashes of the operands, and the parse tree and literals of an expression are computed on first
+    access and cached, so they must not be modified by the caller.
+
+    Expressions are traversed with an explicit stack rather than recursion, so that the depth of
+    a formula is limited only by memory.
+
     Attributes:
         operator: The logical operator in this operation (if any).
         operand_1: The first operand in the operation (if any).
         operand_2: The second operand in the operation (if any).
     """
+    __slots__ = ('operator', 'operand_1', 'operand_2', '_hash', '_parse_tree', '_literals', '__weakref__')
     operator: Operators
 
-    def __init__(self, operator=None, operand_1=None, operand_2=None):
-        """Creates a new Boolean operation.
+    # Unique table of the live expressions, by their type, operator and operands
+    _unique = WeakValueDictionary()
+    _lock = Lock()
+
+    def __new__(cls, operator=None, operand_1=None, operand_2=None):
+        """Returns the Boolean operation with the given operator and operands, creating it if needed.
 
         Args:
             operator: The logical operator in this operation (if any).
             operand_1: The first operand in the operation (if any).
             operand_2: The second operand in the operation (if any).
         """
-        self.operator = operator
-        self.operand_1 = operand_1 if not None else None
-        self.operand_2 = operand_2 if not None else None
+        if operator is not None:
+            operator = Operators(operator)
+
+        return cls._intern((cls, operator, operand_1, operand_2),
+                           operator=operator, operand_1=operand_1, operand_2=operand_2)
+
+    @classmethod
+    def _intern(cls, key: Tuple, **fields) -> 'Expression':
+        """Returns the expression with the given key in the unique table, creating it from its fields if needed."""
+        expr = cls._unique.get(key)
+        if expr is None:
+            expr = object.__new__(cls)
+            for name, value in fields.items():
+                object.__setattr__(expr, name, value)
+
+            object.__setattr__(expr, '_hash', hash(key))
+            object.__setattr__(expr, '_parse_tree', None)
+            object.__setattr__(expr, '_literals', None)
+            with cls._lock:
+                expr = cls._unique.setdefault(key, expr)
+
+        return expr
+
+    def __setattr__(self, name, value):
+        """Prevents modification of the expression, which may be shared."""
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __delattr__(self, name):
+        """Prevents modification of the expression, which may be shared."""
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    @property
+    def operands(self) -> Tuple['Expression', ...]:
+        """Operands of the operation which are themselves expressions, in order."""
+        return tuple(op for op in (self.operand_1, self.operand_2) if isinstance(op, Expression))
 
     @property
     def literals(self) -> List[Any]:
         """List of unique literals in the recursive formula tree."""
+        if self._literals is None:
+            object.__setattr__(self, '_literals', self._get_literals())
+
+        return self._literals
+
+    def _get_literals(self) -> List[Any]:
+        """Internal accessor to calculate the 'literals' property."""
         literals = set()
-        for op in [self.operand_1, self.operand_2]:
-            if op is not None:
-                if isinstance(op, Literal):
-                    literals.update(str(op))
-                elif isinstance(op, Expression):
-                    literals.update(op.literals)
 
+        def visit(node: Expression, _):
+            if isinstance(node, Literal):
+                literals.update(node.literals)
+
+        fold(self, lambda node: node.operands, visit)
         return sorted(literals)
 
     @property
-    @abstractmethod
     def parse_tree(self) -> List[Any]:
         """Parse tree of the recursive Boolean operation as a preorder, nested list."""
+        if self._parse_tree is None:
+            # Trees of the operands are computed (and cached) first, so that they are not built recursively
+            def compute(node: Expression, _):
+                object.__setattr__(node, '_parse_tree', node._get_tree())
+
+            fold(self, lambda node: [op for op in node.operands if op._parse_tree is None], compute)
+
+        return self._parse_tree
+
+    @abstractmethod
+    def _get_tree(self) -> Any:
+        """Internal accessor to calculate the 'parse_tree' property from the trees of the operands."""
+        pass
+
+    def __str__(self) -> str:
+        """Returns a printable representation of the operation."""
+        parts = []
+        stack = [self]
+        while len(stack) > 0:
+            item = stack.pop()
+            if isinstance(item, Expression):
+                # Parts of the operation are pushed in reverse, so that they are printed in order
+                stack.extend(reversed(item._get_parts()))
+            else:
+                parts.append(item)
+
+        return ''.join(parts)
+
+    @abstractmethod
+    def _get_parts(self) -> List[Any]:
+        """Lists the strings and operands which make up the printable representation of the operation."""
         pass
 
     def __eq__(self, obj):
-        """Checks equality of the two Boolean operations."""
-        return isinstance(obj, Expression) and obj.parse_tree == self.parse_tree
+        """Checks equality of the two Boolean operations.
+
+        Equal operations are the same object, so they are compared by identity."""
+        return self is obj
+
+    def __hash__(self):
+        """Returns the hash of the operation, computed when it was created."""
+        return self._hash
 
 
 class Literal(Expression):
     """A literal is a single variable with no operations."""
+    __slots__ = ()
 
-    def __init__(self, value):
+    def __new__(cls, value):
         """Creates a new literal.
 
         Args:
             value: Value of the variable.
         """
-        Expression.__init__(self, operand_1=value)
+        return Expression.__new__(cls, operand_1=value)
 
-    @property
-    def parse_tree(self):
+    def __reduce__(self):
+        """Pickles the literal by its value, so that it is interned again when unpickled."""
+        return Literal, (self.operand_1,)
+
+    def _get_literals(self) -> List[Any]:
+        """See base class."""
+        if isinstance(self.operand_1, bool):
+            return []
+
+        return [str(self.operand_1)]
+
+    def _get_tree(self):
         """See base class."""
         return self.operand_1
 
-    def __str__(self):
-        """Returns a printable representation of the literal."""
+    def _get_parts(self) -> List[Any]:
+        """See base class."""
         if isinstance(self.operand_1, bool):
-            return TRUE if self.operand_1 else FALSE
+            return [TRUE if self.operand_1 else FALSE]
 
         else:
-            return str(self.operand_1)
+            return [str(self.operand_1)]
 
 
 class UnaryOperation(Expression):
     """A unary operation consists of a unary operator applied on a single operand."""
+    __slots__ = ()
 
-    def __init__(self, operator: str, value: Expression):
+    def __new__(cls, operator: str, value: Expression):
         """Creates a new unary operation."""
-        Expression.__init__(self, operator=operator, operand_1=value)
+        return Expression.__new__(cls, operator, value)
 
-    @property
-    def parse_tree(self) -> List[Any]:
+    def __reduce__(self):
+        """Pickles the operation by its operator and operand, so that it is interned again when unpickled."""
+        return UnaryOperation, (self.operator, self.operand_1)
+
+    def _get_tree(self) -> List[Any]:
         """See base class."""
         return [self.operator, self.operand_1.parse_tree]
 
-    def __str__(self) -> str:
-        """Returns a printable representation of the operation."""
+    def _get_parts(self) -> List[Any]:
+        """See base class."""
         if isinstance(self.operand_1, UnaryOperation):
-            return f'{self.operator}({self.operand_1})'
+            return [f'{self.operator}(', self.operand_1, ')']
         else:
-            return f'{self.operator}{self.operand_1}'
+            return [str(self.operator), self.operand_1]
 
 
 class BinaryOperation(Expression):
     """A binary operation consists of a binary operator applied to two different operands."""
+    __slots__ = ()
 
-    def __init__(self, operator: str, operand_1: Expression, operand_2: Expression):
+    def __new__(cls, operator: str, operand_1: Expression, operand_2: Expression):
         """Creates a new binary operation.
 
         Args:
             operator: The logical operator in this operation.
             operand_1: The first operand in the operation.
             operand_2: The second operand in the operation."""
-        Expression.__init__(self, operator, operand_1, operand_2)
+        return Expression.__new__(cls, operator, operand_1, operand_2)
 
-    @property
-    def parse_tree(self) -> List[Any]:
+    def __reduce__(self):
+        """Pickles the operation by its operator and operands, so that it is interned again when unpickled."""
+        return BinaryOperation, (self.operator, self.operand_1, self.operand_2)
+
+    def _get_tree(self) -> List[Any]:
         """See base class."""
         return [self.operator, self.operand_1.parse_tree, self.operand_2.parse_tree]
 
-    def __str__(self) -> str:
-        """Returns a printable representation of the operation."""
-        return f'({self.operand_1} {self.operator} {self.operand_2})'
+    def _get_parts(self) -> List[Any]:
+        """See base class."""
+        return ['(', self.operand_1, f' {self.operator} ', self.operand_2, ')']
+
+
+class NaryOperation(Expression):
+    """An n-ary operation applies AND or OR to any number of operands.
+
+    Operations are normalized when they are created: operands which are themselves chains of the
+    same operator are flattened into the operation, repeated operands are removed, and constants
+    are folded, e.g. (p AND TRUE) = p and (p AND FALSE) = FALSE. The result is a constant if no
+    operands are left, and the operand itself if only one is left.
+
+    The operands are held in a flat tuple, and 'operand_1' and 'operand_2' are None.
+    """
+    __slots__ = ('_operands',)
+
+    def __new__(cls, operator: str, operands: Iterable[Expression]):
+        """Creates a new n-ary operation, or the equivalent simpler expression.
+
+        Args:
+            operator: The logical operator in this operation, AND or OR.
+            operands: The operands of the operation.
+        """
+        operator = Operators(operator)
+        if operator not in [Operators.AND, Operators.OR]:
+            raise ValueError(f'N-ary operations must use {Operators.AND} or {Operators.OR}, not {operator}')
+
+        # An OR with a TRUE operand is TRUE, and FALSE operands can be dropped (and vice versa for AND)
+        absorbing = operator == Operators.OR
+        flat = dict()
+        for operand in cls.flatten(operator, operands):
+            if isinstance(operand, Literal) and isinstance(operand.operand_1, bool):
+                if operand.operand_1 == absorbing:
+                    return Literal(absorbing)
+            else:
+                flat[operand] = None
+
+        if len(flat) == 0:
+            return Literal(not absorbing)
+        elif len(flat) == 1:
+            return next(iter(flat))
+
+        operands = tuple(flat)
+        return cls._intern((cls, operator, operands), operator=operator, operand_1=None, operand_2=None,
+                           _operands=operands)
+
+    @staticmethod
+    def flatten(operator: Operators, operands: Iterable[Expression]) -> List[Expression]:
+        """Lists the operands of chains of the same operator, from left to right.
+
+        Args:
+            operator: The operator of the chains, AND or OR.
+            operands: Expressions which may be chains of the operator, with binary or n-ary operations.
+
+        Returns:
+            Operands of the chains, or the expressions themselves if they do not use the operator.
+        """
+        flat = []
+        stack = list(operands)
+        stack.reverse()
+        while len(stack) > 0:
+            expr = stack.pop()
+            if expr.operator == operator:
+                stack.extend(reversed(expr.operands))
+            else:
+                flat.append(expr)
+
+        return flat
+
+    def __reduce__(self):
+        """Pickles the operation by its operator and operands, so that it is interned again when unpickled."""
+        return NaryOperation, (self.operator, self._operands)
+
+    @property
+    def operands(self) -> Tuple[Expression, ...]:
+        """See base class."""
+        return self._operands
+
+    def _get_tree(self) -> List[Any]:
+        """See base class."""
+        return [self.operator] + [operand.parse_tree for operand in self._operands]
+
+    def _get_parts(self) -> List[Any]:
+        """See base class."""
+        parts = ['(']
+        for operand in self._operands:
+            parts.extend([operand, f' {self.operator} '])
+
+        parts[-1] = ')'
+        return parts
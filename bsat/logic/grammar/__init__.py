@@ -1,16 +1,36 @@
 """Defines the grammar for writing Boolean formulas."""
 
+from threading import Lock
+
 from ._lexer import FALSE, TRUE, Operators
 from ._lexer import Lexer as _Lexer
 from ._parser import Parser as _Parser
 
 
 class PropositionParser:
-    """Parser to create trees from Boolean expressions provided as strings."""
+    """Parser to create trees from Boolean expressions provided as strings.
+
+    The lexer and the LALR parser are built only once per process, from the precompiled
+    tables shipped with the package, and are shared by all instances. Parsing is serialized
+    with a lock, so instances can safely be used from multiple threads.
+    """
+    _lock = Lock()
+    _lexer = None
+    _parser = None
+    _operations = None
 
     def __init__(self):
-        self.lexer = _Lexer.build()
-        self.parser = _Parser.build()
+        self.lexer, self.parser = self._build()
+
+    @classmethod
+    def _build(cls):
+        """Returns the shared lexer and parser, building them on first use."""
+        with cls._lock:
+            if cls._parser is None:
+                cls._lexer = _Lexer.build()
+                cls._parser = _Parser.build()
+
+        return cls._lexer, cls._parser
 
     def parse(self, expression: str):
         """Parses an expression.
@@ -18,9 +38,13 @@ class PropositionParser:
         Args:
             expression: The expression to parse.
         """
-        return self.parser.parse(expression)
+        with self._lock:
+            return self.parser.parse(expression, lexer=self.lexer)
 
     @classmethod
-    def operations(cls) -> list:
+    def operations(cls) -> dict:
         """Returns list of all operations supported by the parser."""
-        return _Parser().operations
+        if cls._operations is None:
+            cls._operations = _Parser().operations
+
+        return cls._operations
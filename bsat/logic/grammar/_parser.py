@@ -2,6 +2,11 @@
 
 Defines the grammar of the propositional logic language, which can then be
 used to parse propositional boolean logic formulas.
+
+The LALR tables for the grammar are precompiled into the 'parsetab' module. After
+changing the grammar, regenerate them with:
+
+    python -c "from bsat.logic.grammar._parser import Parser; Parser.build(write_tables=True)"
 """
 
 import ply.yacc as yacc
@@ -10,6 +15,9 @@ import ply.yacc as yacc
 from ._lexer import tokens, precedence  # need this line to build the parser
 from ._lexer import Operators
 
+# Module with the precompiled LALR tables, relative to this package
+TABMODULE = 'parsetab'
+
 
 class Parser:
     def __init__(self):
@@ -61,7 +69,16 @@ class Parser:
             return not p
 
     @classmethod
-    def build(cls):
+    def build(cls, write_tables: bool = False):
+        """Builds the LALR parser from the precompiled tables shipped with the package.
+
+        Tables are read from the fixed ``parsetab`` module next to this file. They are only
+        regenerated in memory if the grammar no longer matches them, and nothing is written
+        to disk unless explicitly requested.
+
+        Args:
+            write_tables: Optional; Writes regenerated tables to the ``parsetab`` module if True.
+        """
         def p_expr_paren(p):
             """expr : LPAR expr RPAR"""
             p[0] = p[2]
@@ -93,4 +110,4 @@ class Parser:
         def p_error(p):
             raise SyntaxError(p)
 
-        return yacc.yacc()
+        return yacc.yacc(tabmodule=TABMODULE, write_tables=write_tables, debug=False)
@@ -0,0 +1,41 @@
+
+# parsetab.py
+# This file is automatically generated. Do not edit.
+# pylint: disable=W,C,R
+_tabversion = '3.10'
+
+_lr_method = 'LALR'
+
+_lr_signature = 'leftIFFleftXORleftIMPLIESleftORleftANDrightNOTAND FALSE IFF IMPLIES LITERAL LPAR NOT OR RPAR TRUE XORexpr : LPAR expr RPARexpr : NOT expr           %prec NOTexpr : expr IMPLIES expr  %prec IMPLIES\n                    | expr IFF expr      %prec IFF\n                    | expr XOR expr      %prec XOR\n                    | expr OR expr       %prec OR\n                    | expr AND expr      %prec AND\n                    expr : literalliteral : FALSE\n                       | TRUE\n                       | LITERAL'
+    
+_lr_action_items = {'LPAR':([0,2,3,8,9,10,11,12,],[2,2,2,2,2,2,2,2,]),'NOT':([0,2,3,8,9,10,11,12,],[3,3,3,3,3,3,3,3,]),'FALSE':([0,2,3,8,9,10,11,12,],[5,5,5,5,5,5,5,5,]),'TRUE':([0,2,3,8,9,10,11,12,],[6,6,6,6,6,6,6,6,]),'LITERAL':([0,2,3,8,9,10,11,12,],[7,7,7,7,7,7,7,7,]),'$end':([1,4,5,6,7,14,15,16,17,18,19,20,],[0,-8,-9,-10,-11,-2,-3,-4,-5,-6,-7,-1,]),'IMPLIES':([1,4,5,6,7,13,14,15,16,17,18,19,20,],[8,-8,-9,-10,-11,8,-2,-3,8,8,-6,-7,-1,]),'IFF':([1,4,5,6,7,13,14,15,16,17,18,19,20,],[9,-8,-9,-10,-11,9,-2,-3,-4,-5,-6,-7,-1,]),'XOR':([1,4,5,6,7,13,14,15,16,17,18,19,20,],[10,-8,-9,-10,-11,10,-2,-3,10,-5,-6,-7,-1,]),'OR':([1,4,5,6,7,13,14,15,16,17,18,19,20,],[11,-8,-9,-10,-11,11,-2,11,11,11,-6,-7,-1,]),'AND':([1,4,5,6,7,13,14,15,16,17,18,19,20,],[12,-8,-9,-10,-11,12,-2,12,12,12,12,-7,-1,]),'RPAR':([4,5,6,7,13,14,15,16,17,18,19,20,],[-8,-9,-10,-11,20,-2,-3,-4,-5,-6,-7,-1,]),}
+
+_lr_action = {}
+for _k, _v in _lr_action_items.items():
+   for _x,_y in zip(_v[0],_v[1]):
+      if not _x in _lr_action:  _lr_action[_x] = {}
+      _lr_action[_x][_k] = _y
+del _lr_action_items
+
+_lr_goto_items = {'expr':([0,2,3,8,9,10,11,12,],[1,13,14,15,16,17,18,19,]),'literal':([0,2,3,8,9,10,11,12,],[4,4,4,4,4,4,4,4,]),}
+
+_lr_goto = {}
+for _k, _v in _lr_goto_items.items():
+   for _x, _y in zip(_v[0], _v[1]):
+       if not _x in _lr_goto: _lr_goto[_x] = {}
+       _lr_goto[_x][_k] = _y
+del _lr_goto_items
+_lr_productions = [
+  ("S' -> expr","S'",1,None,None,None),
+  ('expr -> LPAR expr RPAR','expr',3,'p_expr_paren','_parser.py',66),
+  ('expr -> NOT expr','expr',2,'p_expr_unary','_parser.py',70),
+  ('expr -> expr IMPLIES expr','expr',3,'p_expr_binop','_parser.py',74),
+  ('expr -> expr IFF expr','expr',3,'p_expr_binop','_parser.py',75),
+  ('expr -> expr XOR expr','expr',3,'p_expr_binop','_parser.py',76),
+  ('expr -> expr OR expr','expr',3,'p_expr_binop','_parser.py',77),
+  ('expr -> expr AND expr','expr',3,'p_expr_binop','_parser.py',78),
+  ('expr -> literal','expr',1,'p_expr_literal','_parser.py',83),
+  ('literal -> FALSE','literal',1,'p_literal','_parser.py',87),
+  ('literal -> TRUE','literal',1,'p_literal','_parser.py',88),
+  ('literal -> LITERAL','literal',1,'p_literal','_parser.py',89),
+]
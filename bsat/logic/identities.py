@@ -1,10 +1,40 @@
 """Defines Boolean identities which define equivalence of logic operators.
 """
 
-from . import ExpressionBuilder, Expression, UnaryOperation, BinaryOperation
+from typing import Callable, List
+
+from . import Expression, UnaryOperation, BinaryOperation, NaryOperation
+from ..utils import fold
 from .grammar import Operators
 
 
+def _rewrite(expr: Expression, rule: Callable[[Expression], Expression]) -> Expression:
+    """Rewrites all operations in a Boolean formula, from the bottom up.
+
+    Each operation is rebuilt from its rewritten operands and then passed to the rule, which may
+    therefore receive a simpler expression for an n-ary operation. Subformulas shared by several
+    operations are rewritten only once.
+
+    Args:
+        expr: The expression to rewrite.
+        rule: Function returning an equivalent expression for an operation.
+
+    Returns:
+        The rewritten expression.
+    """
+    def rewrite(node: Expression, operands: List[Expression]) -> Expression:
+        if isinstance(node, BinaryOperation):
+            return rule(BinaryOperation(node.operator, *operands))
+        elif isinstance(node, NaryOperation):
+            return rule(NaryOperation(node.operator, operands))
+        elif isinstance(node, UnaryOperation):
+            return rule(UnaryOperation(node.operator, *operands))
+
+        return node
+
+    return fold(expr, lambda node: node.operands, rewrite)
+
+
 def xor_equivalence(expr: Expression) -> Expression:
     """Removes all XORs from a Boolean formula.
 
@@ -17,23 +47,13 @@ def xor_equivalence(expr: Expression) -> Expression:
     Returns:
         An equivalent expression without XOR operations.
     """
-    if isinstance(expr, BinaryOperation):
-        t1 = xor_equivalence(expr.operand_1).parse_tree
-        t2 = xor_equivalence(expr.operand_2).parse_tree
-        op = expr.operator
-
-        if op == Operators.XOR:
-            tree_n = [Operators.NOT, [Operators.IFF, t1, t2]]
-        else:
-            tree_n = [op, t1, t2]
-
-    elif isinstance(expr, UnaryOperation):
-        tree_n = [expr.operator, xor_equivalence(expr.operand_1).parse_tree]
+    def rule(op: Expression) -> Expression:
+        if op.operator == Operators.XOR:
+            return UnaryOperation(Operators.NOT, BinaryOperation(Operators.IFF, op.operand_1, op.operand_2))
 
-    else:
-        tree_n = expr.parse_tree
+        return op
 
-    return ExpressionBuilder.from_parse_tree(tree_n)
+    return _rewrite(expr, rule)
 
 
 def iff_equivalence(expr: Expression) -> Expression:
@@ -49,23 +69,15 @@ def iff_equivalence(expr: Expression) -> Expression:
     Returns:
         An equivalent expression without IFF operations.
     """
-    if isinstance(expr, BinaryOperation):
-        t1 = iff_equivalence(expr.operand_1).parse_tree
-        t2 = iff_equivalence(expr.operand_2).parse_tree
-        op = expr.operator
+    def rule(op: Expression) -> Expression:
+        if op.operator == Operators.IFF:
+            return BinaryOperation(Operators.AND,
+                                   BinaryOperation(Operators.IMPLIES, op.operand_1, op.operand_2),
+                                   BinaryOperation(Operators.IMPLIES, op.operand_2, op.operand_1))
 
-        if op == Operators.IFF:
-            tree_n = [Operators.AND, [Operators.IMPLIES, t1, t2], [Operators.IMPLIES, t2, t1]]
-        else:
-            tree_n = [op, t1, t2]
+        return op
 
-    elif isinstance(expr, UnaryOperation):
-        tree_n = [expr.operator, iff_equivalence(expr.operand_1).parse_tree]
-
-    else:
-        tree_n = expr.parse_tree
-
-    return ExpressionBuilder.from_parse_tree(tree_n)
+    return _rewrite(expr, rule)
 
 
 def implication_equivalence(expr: Expression) -> Expression:
@@ -80,23 +92,13 @@ def implication_equivalence(expr: Expression) -> Expression:
     Returns:
         An equivalent expression without IMPLIES operations.
     """
-    if isinstance(expr, BinaryOperation):
-        t1 = implication_equivalence(expr.operand_1).parse_tree
-        t2 = implication_equivalence(expr.operand_2).parse_tree
-        op = expr.operator
-
-        if op == Operators.IMPLIES:
-            tree_n = [Operators.OR, [Operators.NOT, t1], t2]
-        else:
-            tree_n = [op, t1, t2]
-
-    elif isinstance(expr, UnaryOperation):
-        tree_n = [expr.operator, implication_equivalence(expr.operand_1).parse_tree]
+    def rule(op: Expression) -> Expression:
+        if op.operator == Operators.IMPLIES:
+            return BinaryOperation(Operators.OR, UnaryOperation(Operators.NOT, op.operand_1), op.operand_2)
 
-    else:
-        tree_n = expr.parse_tree
+        return op
 
-    return ExpressionBuilder.from_parse_tree(tree_n)
+    return _rewrite(expr, rule)
 
 
 def simplify_operators(expr: Expression) -> Expression:
@@ -1,8 +1,13 @@
 """Defines the laws of propositional logic.
 """
 
-from . import ExpressionBuilder, Expression, UnaryOperation, BinaryOperation
+from itertools import product
+from typing import List, Tuple
+
+from . import Expression, UnaryOperation, BinaryOperation, NaryOperation
+from ..utils import fold
 from .grammar import Operators
+from .identities import _rewrite
 
 
 def distribute_ands(expr: Expression) -> Expression:
@@ -11,51 +16,29 @@ def distribute_ands(expr: Expression) -> Expression:
     Recursively applies the following distributive law until it is no longer applicable:
     a OR (b AND c) <=> (a OR b) AND (a OR c).
 
+    The law is applied to all operands of an OR at once, and the resulting conjunction and
+    its clauses are n-ary operations.
+
     Args:
         expr: The Boolean expression to apply the distributive law on.
 
     Returns:
         An equivalent Boolean expression with all ORs distributed over ANDs.
     """
-    if isinstance(expr, BinaryOperation):
-        pq = distribute_ands(expr.operand_1)
-        qr = distribute_ands(expr.operand_2)
-        op = expr.operator
-
-        if op == Operators.OR and qr.operator == Operators.AND:
-            p = pq.parse_tree
-            q = qr.operand_1.parse_tree
-            r = qr.operand_2.parse_tree
-
-            expr_n = ExpressionBuilder.from_parse_tree([Operators.AND,
-                                                        [Operators.OR, p, q],
-                                                        [Operators.OR, p, r]])
-            tree_n = [Operators.AND,
-                      distribute_ands(expr_n.operand_1).parse_tree,
-                      distribute_ands(expr_n.operand_2).parse_tree]
-
-        elif op == Operators.OR and pq.operator == Operators.AND:
-            p = pq.operand_1.parse_tree
-            q = pq.operand_2.parse_tree
-            r = qr.parse_tree
+    def rule(op: Expression) -> Expression:
+        if op.operator != Operators.OR:
+            return op
 
-            expr_n = ExpressionBuilder.from_parse_tree([Operators.AND,
-                                                        [Operators.OR, p, r],
-                                                        [Operators.OR, q, r]])
-            tree_n = [Operators.AND,
-                      distribute_ands(expr_n.operand_1).parse_tree,
-                      distribute_ands(expr_n.operand_2).parse_tree]
+        # Both operands are already conjunctions of clauses, so each combination of one clause
+        # from every operand gives a clause. The clauses of the last operand vary slowest.
+        conjuncts = [NaryOperation.flatten(Operators.AND, [operand]) for operand in op.operands]
+        if all(len(clauses) == 1 for clauses in conjuncts):
+            return op
 
-        else:
-            tree_n = [op, pq.parse_tree, qr.parse_tree]
+        clauses = product(*reversed(conjuncts))
+        return NaryOperation(Operators.AND, [NaryOperation(Operators.OR, reversed(clause)) for clause in clauses])
 
-    elif isinstance(expr, UnaryOperation):
-        tree_n = [expr.operator, distribute_ands(expr.operand_1).parse_tree]
-
-    else:
-        tree_n = expr.parse_tree
-
-    return ExpressionBuilder.from_parse_tree(tree_n)
+    return _rewrite(expr, rule)
 
 
 def de_morgans_law(expr: Expression) -> Expression:
@@ -66,8 +49,8 @@ def de_morgans_law(expr: Expression) -> Expression:
         1) NOT(a OR b) <=> NOT(a) AND NOT(b)
         2) NOT(A AND B) <=> NOT(A)  OR NOT(B)
 
-    This is a recursive implementation, which also removes double negations which may arise from
-    application of De Morgan's law, or otherwise.
+    Negations are moved down the formula with an explicit stack, which also removes double negations
+    which may arise from application of De Morgan's law, or otherwise.
 
     Args:
         expr: The Boolean expression to apply De Morgan's law on.
@@ -75,35 +58,39 @@ def de_morgans_law(expr: Expression) -> Expression:
     Returns:
         An equivalent Boolean expression with negations only over literals.
     """
-    # De Morgan's is only applicable if current formula has the negation operator and the
-    # operand itself is a binary formula with a conjunction or disjunction operator.
-    if expr.operator == Operators.NOT and expr.operand_1.operator in [Operators.AND, Operators.OR]:
-        if expr.operand_1.operator == Operators.AND:
-            op = Operators.OR
-        else:
-            op = Operators.AND
-
-        op1_neg = ExpressionBuilder.from_parse_tree([Operators.NOT, expr.operand_1.operand_1.parse_tree])
-        t1 = de_morgans_law(op1_neg).parse_tree
-
-        op2_neg = ExpressionBuilder.from_parse_tree([Operators.NOT, expr.operand_1.operand_2.parse_tree])
-        t2 = de_morgans_law(op2_neg).parse_tree
-
-        tree_n = [op, t1, t2]
-
-    # In case current formula is a negation, and the child is also a negation, we simply
-    # eliminate the double negation.
-    elif expr.operator == Operators.NOT and expr.operand_1.operator == Operators.NOT:
-        tree_n = expr.operand_1.parse_tree[-1]
-
-    # In case current formula is itself binary, we check both operands for De Morgan's applicability.
-    elif isinstance(expr, BinaryOperation):
-        tree_n = [expr.operator,
-                  de_morgans_law(expr.operand_1).parse_tree,
-                  de_morgans_law(expr.operand_2).parse_tree]
-
-    # Otherwise return the current formula as-is.
-    else:
-        tree_n = expr.parse_tree
-
-    return ExpressionBuilder.from_parse_tree(tree_n)
+    def children(item: Tuple[Expression, bool]) -> List[Tuple[Expression, bool]]:
+        node, negated = item
+
+        # Double negations are eliminated by flipping the negation
+        if node.operator == Operators.NOT:
+            return [(node.operand_1, not negated)]
+
+        # De Morgan's law negates both operands of AND and OR. Negations cannot be moved into
+        # other operations, but their operands are checked for negations.
+        elif node.operator in [Operators.AND, Operators.OR]:
+            return [(op, negated) for op in node.operands]
+
+        return [(op, False) for op in node.operands]
+
+    def combine(item: Tuple[Expression, bool], operands: List[Expression]) -> Expression:
+        # Returns the formula equivalent to the node, or to its negation, with negations moved inwards
+        node, negated = item
+        if node.operator == Operators.NOT:
+            return operands[0]
+
+        elif node.operator in [Operators.AND, Operators.OR]:
+            op = node.operator
+            if negated:
+                op = Operators.OR if op == Operators.AND else Operators.AND
+
+            if isinstance(node, NaryOperation):
+                return NaryOperation(op, operands)
+
+            return BinaryOperation(op, *operands)
+
+        elif isinstance(node, BinaryOperation):
+            node = BinaryOperation(node.operator, *operands)
+
+        return UnaryOperation(Operators.NOT, node) if negated else node
+
+    return fold((expr, False), children, combine)
@@ -9,7 +9,15 @@ logic formulas in negation normal form (NNF) and conjunctive normal form (CNF).
 
     foo = 'some Boolean expression'
     cnf = CNF(foo)
+
+    cnf.write_dimacs('problem.cnf')       # writes the clauses in the DIMACS format
+    cnf = CNF.from_dimacs('problem.cnf')  # reads them back
+    cnf.save('problem.clauses')           # saves them in a compact binary format
+    cnf = CNF.load('problem.clauses')     # maps them back into memory at once
 """
 
 from ._norm import CNF
 from ._norm import NNF
+from ._norm import simplify_clauses, split_components
+from .dimacs import DimacsReader, read_dimacs, write_dimacs
+from .store import ClauseStore, read_store, write_store
@@ -4,57 +4,78 @@ This is the internal definition of the package, with all the public and private
 Only the public classes are exported for external use.
 """
 from abc import ABC, abstractmethod
-from typing import List
+from io import StringIO
+from os import PathLike
+from typing import IO, Any, Collection, Dict, Iterable, List, Optional, Sequence, Set, Tuple, Union
 
-from ..logic import Expression, ExpressionBuilder, Operators
+from ..logic import BinaryOperation, Expression, ExpressionBuilder, Literal, NaryOperation, Operators, UnaryOperation
+from ..logic.grammar import FALSE, TRUE
 from ..logic.grammar import PropositionParser
-from ..logic.identities import simplify_operators
-from ..logic.laws import de_morgans_law, distribute_ands
+from ..logic.laws import distribute_ands
+from ..utils import fold
+from .dimacs import DimacsReader, write_dimacs
+from .store import ClauseStore, read_store, write_store
 
 
 class _NF(ABC):
     """Abstract class representing a Boolean formula in a normal form (NF).
 
     Attributes:
+        _formula: The formula as it was given, before conversion.
         _expr: Internal representation of the formula in normal form.
     """
+    _formula: Expression
     _expr: Expression
 
-    def __init__(self, formula: str):
+    def __init__(self, formula: Union[str, Expression]):
         """Inits the NF formula.
 
         Args:
-            formula: The Boolean formula to represent in normal form.
+            formula: The Boolean formula to represent in normal form, either as a proposition
+                or as an already built expression.
         """
-        expr = ExpressionBuilder.from_proposition(formula)
+        if isinstance(formula, Expression):
+            expr = formula
+        else:
+            expr = ExpressionBuilder.from_proposition(formula)
+
+        self._formula = expr
         self._expr = self._build(expr)
 
     def __str__(self):
         """Returns a printable representation of the formula in normal form."""
         return str(self._expr)
 
+    @property
+    def formula(self) -> Expression:
+        """The formula as it was given, before conversion to normal form."""
+        return self._formula
+
     @property
     def max_solutions(self):
         """Maximum possible solutions for this formula.
 
-        Number of possible solutions depends on the number of literals in the formula, N
+        Number of possible solutions depends on the number of variables in the formula, N
         and is given by 2^N."""
-        return 2 ** len(self._expr.literals)
+        return 2 ** len(self.variables)
+
+    @property
+    def variables(self) -> List[str]:
+        """Sorted list of names of the variables in the formula."""
+        return self._expr.literals
 
     @property
     def parse_tree(self) -> List:
         """Parse tree of the NF formula as a preorder, nested list."""
-        return self._get_tree(self._expr.parse_tree)
-
-    def _get_tree(self, tree: List) -> List:
-        """Internal accessor to calculate the 'parse_tree' property."""
-        if isinstance(tree, list) and len(tree) >= 2:
-            operator = PropositionParser.operations()[tree[0]]
-            return [operator] + list(map(self._get_tree, tree[1:]))
-        elif isinstance(tree, list) and len(tree) == 1:
-            return self._get_tree(tree[0])
-        else:
-            return tree
+        operations = PropositionParser.operations()
+
+        def tree(node: Expression, operands: List) -> Any:
+            if isinstance(node, Literal):
+                return node.operand_1
+
+            return [operations[node.operator]] + operands
+
+        return fold(self._expr, lambda node: node.operands, tree)
 
     @abstractmethod
     def _build(self, expr: Expression) -> Expression:
@@ -76,7 +97,7 @@ class NNF(_NF):
     only applied to variables and the only other allowed Boolean operators are conjunction
     (AND) and disjunction (OR)."""
 
-    def __init__(self, formula: str):
+    def __init__(self, formula: Union[str, Expression]):
         """Inits the NNF formula.
 
         Args:
@@ -89,7 +110,7 @@ class NNF(_NF):
 
         Every formula can be brought into this form by replacing implications and equivalences
         by their definitions, using De Morgan's laws to push negation inwards, and eliminating
-        double negations.
+        double negations. All of these are done in a single pass over the formula.
 
         Args:
             expr: The formula to convert to NNF.
@@ -97,8 +118,7 @@ class NNF(_NF):
         Returns:
             An equivalent formula in negation normal form.
         """
-        expr = simplify_operators(expr)
-        return de_morgans_law(expr)
+        return _negation_normal_form(expr)
 
 
 class CNF(_NF):
@@ -106,112 +126,761 @@ class CNF(_NF):
 
     In Boolean logic, a formula is in conjunctive normal form (CNF) or clausal normal form if
     it is a conjunction of one or more clauses, where a clause is a disjunction of literals;
-    otherwise put, it is an AND of ORs."""
+    otherwise put, it is an AND of ORs.
+
+    Clauses are stored as tuples of non-zero integers, as in the DIMACS format. Variable i
+    (counting from 1) is the i-th name in 'variables'; a negative integer is its negation.
+    Constants are folded away, so a clause containing TRUE is dropped and FALSE literals are
+    removed from their clause (which may leave an empty, unsatisfiable clause).
+
+    The formula can be converted with one of the following encodings:
+        'distribute': Applies the distributive law to get an equivalent CNF. The CNF can grow
+            exponentially in the size of the formula.
+        'tseitin': Introduces an auxiliary variable for every subformula, defined to be
+            equivalent to it (Tseitin encoding). The CNF is linear in the size of the formula.
+        'pg': Like 'tseitin', but only encodes the direction of each definition needed by the
+            polarity of the subformula (Plaisted-Greenbaum encoding), giving fewer clauses.
 
-    def __init__(self, formula: str):
+    The last two encodings are equisatisfiable rather than equivalent. Auxiliary variables are
+    numbered after the original ones, from len(variables) + 1 up to 'num_variables', and
+    solutions are projected back onto the original variables.
+
+    By default the clauses are simplified after the encoding (see 'simplify_clauses'), which
+    keeps the formula equivalent while removing tautologies, repeated literals and clauses, and
+    subsumed clauses.
+
+    Attributes:
+        encoding: The encoding used to convert the formula.
+        simplify: Whether the clauses are simplified.
+    """
+    DISTRIBUTE = 'distribute'
+    TSEITIN = 'tseitin'
+    PG = 'pg'
+    ENCODINGS = (DISTRIBUTE, TSEITIN, PG)
+
+    def __init__(self, formula: Union[str, Expression], encoding: str = DISTRIBUTE, simplify: bool = True):
         """Inits the CNF formula.
 
         Args:
             formula: The Boolean formula to represent in CNF.
+            encoding: Optional; The encoding used to convert the formula, one of 'distribute',
+                'tseitin' or 'pg'.
+            simplify: Optional; Simplifies the clauses after the encoding if True.
+
+        Raises:
+            ValueError: If the encoding is not known.
         """
+        if encoding not in self.ENCODINGS:
+            raise ValueError(f"Unknown CNF encoding '{encoding}', expected one of {', '.join(self.ENCODINGS)}")
+
+        self.encoding = encoding
+        self.simplify = simplify
         _NF.__init__(self, formula)
 
     def _build(self, expr):
         """Converts the input formula to conjunctive normal form.
 
-        Every propositional formula can be converted into an equivalent formula that is in CNF
-        based on rules about logical equivalences: double negation elimination, De Morgan's laws,
-        and the distributive law.
+        With the 'distribute' encoding, every propositional formula can be converted into an
+        equivalent formula that is in CNF based on rules about logical equivalences: double
+        negation elimination, De Morgan's laws, and the distributive law. The formula is first
+        converted to NNF, and a single pass of the distributive law then yields the CNF.
+
+        Otherwise, the clauses are generated by the Tseitin encoder, and the returned formula is
+        built from them. The formula is also rebuilt from the clauses if simplifying them removed
+        anything.
 
         Args:
             expr: The formula to convert to CNF.
 
         Returns:
-            An equivalent formula in conjunctive normal form.
+            An equivalent (or equisatisfiable) formula in conjunctive normal form.
         """
-        for i in range(3):
-            expr = distribute_ands(NNF(str(expr))._expr)
+        self._variables = expr.literals
+        self._num_variables = len(self._variables)
+
+        if self.encoding == self.DISTRIBUTE:
+            expr = distribute_ands(_negation_normal_form(expr))
+            clauses = self._get_clauses(expr)
+        else:
+            encoder = _TseitinEncoder(self._variables, polarity=self.encoding == self.PG)
+            clauses = encoder.encode(expr)
+            self._num_variables = encoder.num_variables
+            expr = None
+
+        self._clauses = simplify_clauses(clauses) if self.simplify else clauses
+        if expr is None or self._clauses != clauses:
+            expr = self._get_expression(self._clauses)
 
         return expr
 
+    @classmethod
+    def from_clauses(cls, clauses: Iterable[Tuple[int, ...]], variables: List[str], num_variables: int = None,
+                     simplify: bool = False) -> 'CNF':
+        """Creates a CNF formula directly from its clauses.
+
+        The formula is the conjunction of the clauses, so it is taken to be equivalent to them.
+        It is only built when it is needed, e.g. for its parse tree, since the clauses are
+        enough to solve it.
+
+        Args:
+            clauses: The clauses, as tuples of signed variable numbers. A ClauseStore is kept as
+                it is, unless the clauses are simplified.
+            variables: Names of the variables numbered from 1.
+            num_variables: Optional; Number of variables in the clauses. Variables after the named
+                ones are auxiliary. Defaults to the number of names.
+            simplify: Optional; Simplifies the clauses if True.
+
+        Returns:
+            The CNF formula of the clauses.
+        """
+        cnf = cls.__new__(cls)
+        cnf.encoding = cls.DISTRIBUTE
+        cnf.simplify = simplify
+        cnf._variables = list(variables)
+        cnf._num_variables = len(cnf._variables) if num_variables is None else num_variables
+
+        if simplify:
+            cnf._clauses = simplify_clauses(clauses)
+        elif isinstance(clauses, ClauseStore):
+            cnf._clauses = clauses
+        else:
+            cnf._clauses = [tuple(clause) for clause in clauses]
+
+        cnf._formula = cnf._expr = None
+        cnf._proposition = None
+        return cnf
+
+    @classmethod
+    def from_dimacs(cls, file: Union[str, PathLike, IO], simplify: bool = False) -> 'CNF':
+        """Reads a CNF formula from a DIMACS CNF file.
+
+        Variable i of the file is named 'x<i>'. The clauses are read straight into a ClauseStore,
+        unless they are simplified.
+
+        Args:
+            file: Path of the file, or a text or binary file object to read from. Files ending
+                in '.gz', '.bz2' or '.xz' are decompressed.
+            simplify: Optional; Simplifies the clauses if True.
+
+        Returns:
+            The CNF formula of the clauses in the file.
+
+        Raises:
+            ValueError: If the file is not a well-formed DIMACS CNF file.
+        """
+        reader = DimacsReader(file)
+        clauses = ClauseStore(reader)
+        num_variables = max(reader.num_variables or 0, reader.max_variable)
+        variables = [f'x{var}' for var in range(1, num_variables + 1)]
+        return cls.from_clauses(clauses, variables, simplify=simplify)
+
+    def write_dimacs(self, file: Union[str, PathLike, IO], comments: Iterable[str] = ()):
+        """Writes the clauses of the formula to a DIMACS CNF file.
+
+        Args:
+            file: Path of the file, or a text file object to write to. Files ending in '.gz',
+                '.bz2' or '.xz' are compressed.
+            comments: Optional; Comment lines written before the problem line.
+        """
+        write_dimacs(file, self.clauses, self.num_variables, comments=comments)
+
+    @classmethod
+    def load(cls, file: Union[str, PathLike]) -> 'CNF':
+        """Loads a CNF formula saved with 'save'.
+
+        The file is mapped into memory rather than read, so the formula is loaded at once, and
+        its clauses are read from the file as they are used. The encoding is restored, and so is
+        the original formula if it was saved, which is only parsed once it is needed.
+
+        Args:
+            file: Path of the file.
+
+        Returns:
+            The CNF formula of the clauses in the file, with the same variables.
+
+        Raises:
+            ValueError: If the file is not a clause store file.
+        """
+        num_variables, variables, clauses, encoding, formula = read_store(file)
+        cnf = cls.from_clauses(clauses, variables, num_variables)
+        cnf.encoding = encoding
+        cnf._proposition = formula or None
+        return cnf
+
+    def components(self) -> List['CNF']:
+        """Splits the formula into formulas over disjoint sets of variables.
+
+        The formula is the conjunction of its components, and each of its models combines one
+        model of every component. Variables of a component are numbered in the order of their
+        numbers in the formula, so its named variables come first, in the same order.
+
+        Returns:
+            The components, created from their clauses, or the formula itself if it has a
+            single component.
+        """
+        groups = split_components(self.clauses)
+        if len(groups) <= 1:
+            return [self]
+
+        components = []
+        for group in groups:
+            variables = sorted({abs(lit) for clause in group for lit in clause})
+            numbers = {var: number for number, var in enumerate(variables, start=1)}
+            clauses = [tuple(numbers[lit] if lit > 0 else -numbers[-lit] for lit in clause) for clause in group]
+            names = [self.variables[var - 1] for var in variables if var <= len(self.variables)]
+            components.append(CNF.from_clauses(clauses, names, len(variables)))
+
+        return components
+
+    def save(self, file: Union[str, PathLike]):
+        """Saves the clauses and variables of the formula to a binary clause store file.
+
+        The encoding is saved along with the clauses. With auxiliary variables, the original
+        formula is saved too: the clauses alone do not tell which assignments of the original
+        variables are models, e.g. to count them.
+
+        Args:
+            file: Path of the file.
+        """
+        formula = str(self.formula) if self.num_variables > len(self.variables) else ''
+        write_store(file, self.clauses, self.num_variables, self.variables, self.encoding, formula)
+
     @property
-    def clauses(self):
-        """List of clauses in the CNF."""
+    def formula(self) -> Expression:
+        """See base class.
+
+        For formulas created from their clauses, this is the conjunction of the clauses, unless
+        they were loaded along with the formula they encode."""
+        if self._formula is None:
+            if self._proposition is not None:
+                self._formula = ExpressionBuilder.from_proposition(self._proposition)
+            else:
+                self._formula = self._expr = self._get_expression(self._clauses)
+
+        return self._formula
+
+    @property
+    def parse_tree(self) -> List:
+        """See base class."""
+        if self._expr is None:
+            self._expr = self._get_expression(self._clauses)
+
+        return super().parse_tree
+
+    @property
+    def variables(self) -> List[str]:
+        """See base class.
+
+        Auxiliary variables introduced by the encoding are not included."""
+        return self._variables
+
+    @property
+    def num_variables(self) -> int:
+        """Number of variables in the clauses, including auxiliary variables."""
+        return self._num_variables
+
+    @property
+    def clauses(self) -> Sequence[Tuple[int, ...]]:
+        """List of clauses in the CNF, each a tuple of signed variable numbers.
+
+        Formulas read from files keep their clauses in a ClauseStore instead of a list."""
+        return self._clauses
+
+    def _get_clauses(self, expr: Expression) -> List[Tuple[int, ...]]:
+        """Internal accessor to calculate the 'clauses' property.
+
+        Args:
+            expr: The formula in conjunctive normal form to find clauses in.
+
+        Returns:
+            List of all the clauses in the formula.
+        """
+        index = {name: i + 1 for i, name in enumerate(self.variables)}
+
         clauses = []
-        for c in self._get_clauses(self._expr.parse_tree).split('\n'):
-            c = c.strip()
-            if c != '':
-                clauses.append(c)
+        for conjunct in _operands(expr, Operators.AND):
+            clause = []
+            for literal in _operands(conjunct, Operators.OR):
+                positive = True
+                while literal.operator == Operators.NOT:
+                    positive = not positive
+                    literal = literal.operand_1
+
+                if not isinstance(literal, Literal):
+                    raise RuntimeError(f'Formula is not in conjunctive normal form: {expr}')
+
+                value = literal.operand_1
+                if isinstance(value, bool):
+                    if value == positive:
+                        break  # clause is always true
+                else:
+                    clause.append(index[value] if positive else -index[value])
+
+            else:
+                clauses.append(tuple(clause))
 
         return clauses
 
-    def _get_clauses(self, tree: List, eof: bool = False) -> str:
-        """Internal accessor to calculate the 'clauses' property.
+    def _get_expression(self, clauses: List[Tuple[int, ...]]) -> Expression:
+        """Builds the formula represented by a list of clauses.
 
         Args:
-            tree: Parse tree of the formula to find clauses in.
-            eof: Optional; Line break is added after the clause if True.
+            clauses: The clauses to build the formula from.
 
         Returns:
-            List of all the clauses in the formula, represented as a single string.
+            Conjunction of the clauses, or TRUE if there are no clauses.
         """
-        clause = []
-        if isinstance(tree, list):
-            if len(tree) == 3:
-                op, t1, t2 = tuple(tree)
-                clause.append(self._get_clauses(t1, op == Operators.AND))
-                clause.append(self._get_clauses(t2, op == Operators.AND))
+        def literal(lit):
+            expr = Literal(self.name(lit))
+            return expr if lit > 0 else UnaryOperation(Operators.NOT, expr)
 
-            elif len(tree) == 2:
-                op, val = tuple(tree)
-                clause.append(f'{op}{self._get_clauses(val)}')
+        return NaryOperation(Operators.AND, [NaryOperation(Operators.OR, map(literal, clause)) for clause in clauses])
 
-        else:
-            clause.append('{}  '.format(str(tree)))
+    def name(self, literal: int) -> str:
+        """Returns the name of the variable of a clause literal.
+
+        Auxiliary variables are named by their number among the auxiliary variables, prefixed
+        with an underscore so that they cannot clash with the original variables.
+
+        Args:
+            literal: A variable number, or its negation.
+        """
+        var = abs(literal)
+        if var <= len(self.variables):
+            return self.variables[var - 1]
 
-        clause = ''.join(clause).replace('\n\n', '\n').strip()
-        if eof and len(clause.strip()) != 0:
-            clause += '\n'
+        return f'_{var - len(self.variables)}'
 
-        return clause
+    def _format_literal(self, literal: int) -> str:
+        """Returns a printable representation of a clause literal."""
+        name = self.name(literal)
+        return name if literal > 0 else f'{Operators.NOT}{name}'
 
     @property
     def dimacs(self) -> str:
         """The DIMACS CNF representation of the CNF formula."""
-        clauses = self.clauses
+        text = StringIO()
+        self.write_dimacs(text, [f"the CNF formula '{self}'", 'in DIMACS format'])
+        return text.getvalue()
 
-        raw = ''
-        for clause in clauses:
-            raw += clause.replace(str(Operators.NOT), '-') + '  0\n'
+    def __str__(self):
+        """See base class."""
+        if len(self.clauses) == 0:
+            return TRUE
 
-        literals = self._expr.literals
-        for lt in literals:
-            raw = raw.replace(lt, f'{literals.index(lt) + 1}')
+        clauses = []
+        for clause in self.clauses:
+            if len(clause) == 0:
+                clauses.append(FALSE)
+            else:
+                literals = f' {Operators.OR} '.join(self._format_literal(literal) for literal in clause)
+                clauses.append(f'({literals})')
 
-        return "c the CNF formula '{}'\n" \
-               'c in DIMACS format' \
-               'c' \
-               'p cnf {} {}\n' \
-               '{}'.format(str(self),
-                           len(literals),
-                           len(clauses),
-                           raw)
+        return f' {Operators.AND} '.join(clauses)
 
-    def __str__(self):
-        """See base class."""
-        string = ''
-
-        clauses = self.clauses
-        for i, clause in enumerate(clauses):
-            string += '('
-            for j, item in enumerate(clause.split(' ')):
-                item = item.strip()
-                if item != '' and item != Operators.NOT:
-                    string += item
-                    string += f' {Operators.OR} '
-            string = string[:-3]
-            string += ')'
-            if i + 1 != len(clauses):
-                string += f' {Operators.AND} '
-
-        return string
+
+def simplify_clauses(clauses: Iterable[Tuple[int, ...]]) -> List[Tuple[int, ...]]:
+    """Simplifies a list of clauses into an equivalent, smaller one.
+
+    Repeated literals are removed from each clause, and tautologies (clauses containing a
+    literal and its negation) and repeated clauses are dropped. Clauses subsumed by another
+    clause, i.e. containing all of its literals, are dropped as well.
+
+    Subsumption is checked with occurrence lists, mapping each literal to the clauses kept so
+    far which contain it. A new clause is dropped if one of the kept clauses sharing a literal
+    with it is a subset of it (forward subsumption). Otherwise, it is kept, and drops the kept
+    clauses which are supersets of it, all of which occur in the shortest occurrence list of
+    its literals (backward subsumption).
+
+    Args:
+        clauses: The clauses to simplify, as tuples of signed variable numbers.
+
+    Returns:
+        The remaining clauses, in their original order and with their literals in order.
+    """
+    clauses = list(clauses)
+    kept: Dict[int, Set[int]] = dict()
+    occurrences: Dict[int, Set[int]] = dict()
+
+    for i, clause in enumerate(clauses):
+        literals = set(clause)
+        if len(literals) == 0:
+            return [()]  # the empty clause subsumes every clause
+
+        if any(-lit in literals for lit in literals):
+            continue  # tautology
+
+        # Forward subsumption: some kept clause is contained in the new one
+        candidates = set()
+        for lit in literals:
+            candidates.update(occurrences.get(lit, ()))
+        if any(kept[j] <= literals for j in candidates):
+            continue
+
+        # Backward subsumption: the new clause is contained in some kept clauses
+        shortest = min((occurrences.get(lit, set()) for lit in literals), key=len)
+        for j in [j for j in shortest if literals <= kept[j]]:
+            for lit in kept.pop(j):
+                occurrences[lit].discard(j)
+
+        kept[i] = literals
+        for lit in literals:
+            occurrences.setdefault(lit, set()).add(i)
+
+    return [tuple(dict.fromkeys(clauses[i])) for i in sorted(kept)]
+
+
+def split_components(clauses: Iterable[Collection[int]]) -> List[List[Collection[int]]]:
+    """Splits clauses into connected components, which share no variables with each other.
+
+    The variables of every clause are merged into one set of a union-find, with path
+    compression, and the clauses are then grouped by the set of their variables. Empty
+    clauses have no variables, and are grouped together.
+
+    Args:
+        clauses: The clauses to split, as collections of signed variable numbers.
+
+    Returns:
+        The components, as lists of clauses in their original order, ordered by their first
+        clause.
+    """
+    parents: Dict[int, int] = dict()
+
+    def find(var: int) -> int:
+        root = var
+        while parents.setdefault(root, root) != root:
+            root = parents[root]
+
+        while var != root:
+            parents[var], var = root, parents[var]
+
+        return root
+
+    clauses = list(clauses)
+    for clause in clauses:
+        first = None
+        for lit in clause:
+            root = find(abs(lit))
+            if first is None:
+                first = root
+            elif root != first:
+                parents[root] = first
+
+    components: Dict[int, List[Collection[int]]] = dict()
+    for clause in clauses:
+        components.setdefault(find(abs(next(iter(clause)))) if len(clause) > 0 else 0, []).append(clause)
+
+    return list(components.values())
+
+
+def _negation_normal_form(expr: Expression) -> Expression:
+    """Converts a formula to negation normal form in a single pass.
+
+    The formula is traversed once from the top with an explicit stack, tracking whether each
+    subformula occurs under an odd number of negations. XOR, IFF and IMPLIES are replaced by
+    their definitions as they are reached, and De Morgan's laws are applied to the negated
+    subformulas, so negations end up only over literals.
+
+    Subformulas which become the same AND or OR once negations are pushed inwards form a chain,
+    e.g. 'a -> (b -> c)' is the chain 'NOT(a) OR NOT(b) OR c', and 'NOT(a AND NOT(b OR c))' the
+    chain 'NOT(a) OR b OR c'. The operands of each chain are collected while it is traversed,
+    and the chain becomes a single n-ary operation built from them, which also removes repeated
+    operands and folds constants.
+
+    The result is equivalent to that of 'simplify_operators' followed by 'de_morgans_law',
+    without building the intermediate formulas.
+
+    Args:
+        expr: The formula to convert.
+
+    Returns:
+        An equivalent formula in negation normal form.
+    """
+    def children(item: Tuple[Expression, bool]) -> List[Tuple[Expression, bool]]:
+        node, negated = _strip_negations(*item)
+        operator = _chain_operator(node, negated)
+        if operator is None:
+            return []
+
+        # Links of the chain are expanded in place, and the other subformulas are its operands
+        operands = dict()
+        stack = _links(node, negated)
+        stack.reverse()
+        while len(stack) > 0:
+            link = _strip_negations(*stack.pop())
+            if link in operands:
+                continue
+            elif _chain_operator(*link) == operator:
+                operands[link] = None
+                stack.extend(reversed(_links(*link)))
+            else:
+                operands[link] = False
+
+        return [link for link, operand in operands.items() if operand is False]
+
+    def combine(item: Tuple[Expression, bool], operands: List[Expression]) -> Expression:
+        # Returns the NNF of the node, or of its negation, from the NNFs of the operands given by 'children'
+        node, negated = _strip_negations(*item)
+        operator = _chain_operator(node, negated)
+        if operator is not None:
+            return NaryOperation(operator, operands)
+        elif isinstance(node.operand_1, bool):
+            return Literal(node.operand_1 != negated)
+
+        return UnaryOperation(Operators.NOT, node) if negated else node
+
+    return fold((expr, False), children, combine)
+
+
+def _strip_negations(node: Expression, negated: bool) -> Tuple[Expression, bool]:
+    """Removes the negations at the top of a subformula, switching its polarity for each of them."""
+    while node.operator == Operators.NOT:
+        node, negated = node.operand_1, not negated
+
+    return node, negated
+
+
+def _chain_operator(node: Expression, negated: bool) -> Optional[Operators]:
+    """Returns the operator of a subformula once negations are pushed inwards, or None for literals.
+
+    The subformula must not be a negation. Negated operations switch AND and OR (De Morgan's law),
+    and IMPLIES and XOR are chains of OR, while IFF is a chain of AND.
+    """
+    op = node.operator
+    if op is None:
+        return None
+    elif op in [Operators.AND, Operators.OR]:
+        positive = op
+    elif op in [Operators.IMPLIES, Operators.XOR]:
+        positive = Operators.OR
+    elif op == Operators.IFF:
+        positive = Operators.AND
+    else:
+        raise ValueError(f'Unknown operator {op}')
+
+    if not negated:
+        return positive
+
+    return Operators.OR if positive == Operators.AND else Operators.AND
+
+
+def _links(node: Expression, negated: bool) -> List[Tuple[Expression, bool]]:
+    """Lists the operands of the chain of a subformula, with their polarities.
+
+    IFF and XOR are split into two implications, a IFF b = (a IMPLIES b) AND (b IMPLIES a),
+    and a XOR b = NOT(a IMPLIES b) OR NOT(b IMPLIES a).
+    """
+    op = node.operator
+    if op in [Operators.AND, Operators.OR]:
+        return [(operand, negated) for operand in node.operands]
+
+    a, b = node.operand_1, node.operand_2
+    if op == Operators.IMPLIES:
+        # a IMPLIES b = NOT(a) OR b
+        return [(a, not negated), (b, negated)]
+
+    negated = negated if op == Operators.IFF else not negated
+    return [(BinaryOperation(Operators.IMPLIES, a, b), negated), (BinaryOperation(Operators.IMPLIES, b, a), negated)]
+
+
+def _operands(expr: Expression, operator: Operators) -> List[Expression]:
+    """Lists the distinct operands of a chain of the same operator, from left to right.
+
+    Args:
+        expr: The formula to split.
+        operator: The operator to split the formula on.
+
+    Returns:
+        Operands of the chain, or the formula itself if it does not use the operator.
+    """
+    return list(dict.fromkeys(NaryOperation.flatten(operator, [expr])))
+
+
+class _TseitinEncoder:
+    """Converts formulas to equisatisfiable CNFs of linear size.
+
+    Every subformula (other than a literal) gets an auxiliary variable x, together with clauses
+    defining x to be equivalent to the subformula. Chains of the same AND or OR operator are
+    defined by a single variable. Constants are folded away while encoding.
+
+    With polarity-aware (Plaisted-Greenbaum) encoding, a subformula which only occurs positively
+    only needs the clauses for x -> subformula, and one which only occurs negatively only needs
+    the clauses for subformula -> x. Operands of IFF and XOR occur with both polarities.
+
+    Attributes:
+        num_variables: Number of variables used, including the auxiliary variables.
+    """
+    # Polarity of a subformula
+    POSITIVE = 1
+    NEGATIVE = -1
+    BOTH = 0
+
+    def __init__(self, variables: List[str], polarity: bool):
+        """Inits the encoder.
+
+        Args:
+            variables: Sorted names of the variables in the formulas to encode.
+            polarity: Encodes only the directions needed by the polarity of subformulas if True.
+        """
+        self._index = {name: i + 1 for i, name in enumerate(variables)}
+        self._polarity = polarity
+        self._gates: Dict[Expression, list] = dict()
+        self._literals: Dict[Tuple[Expression, int], Any] = dict()
+        self._clauses = []
+        self.num_variables = len(variables)
+
+    def encode(self, expr: Expression) -> List[Tuple[int, ...]]:
+        """Encodes a formula as a list of clauses.
+
+        Conjuncts of the formula are encoded separately, and disjunctions among them become
+        clauses directly over the literals of their operands.
+
+        Args:
+            expr: The formula to encode.
+
+        Returns:
+            The clauses of the equisatisfiable CNF.
+        """
+        for conjunct in _operands(expr, Operators.AND):
+            clause = []
+            for disjunct in _operands(conjunct, Operators.OR):
+                lit = self._literal(disjunct, self.POSITIVE)
+                if lit is True:
+                    break  # clause is always true
+                elif lit is not False:
+                    clause.append(lit)
+
+            else:
+                self._clauses.append(tuple(clause))
+
+        return self._clauses
+
+    def _literal(self, expr: Expression, polarity: int):
+        """Returns a literal equivalent to a subformula, encoding the subformula if needed.
+
+        Subformulas are encoded from the bottom up with an explicit stack, so the depth of the
+        formula is limited only by memory.
+
+        Args:
+            expr: The subformula to encode.
+            polarity: Polarity of the subformula in the whole formula.
+
+        Returns:
+            A clause literal, or a bool if the subformula is constant.
+        """
+        return fold((expr, polarity), self._subformulas, self._encode, self._literals)
+
+    def _subformulas(self, item: Tuple[Expression, int]) -> List[Tuple[Expression, int]]:
+        """Lists the operands of a subformula to encode before it, with their polarities."""
+        expr, polarity = item
+        op = expr.operator
+        if isinstance(expr, Literal):
+            return []
+        elif op == Operators.NOT:
+            return [(expr.operand_1, -polarity)]
+
+        if not self._polarity:
+            polarity = self.BOTH
+
+        if op == Operators.IMPLIES:
+            return [(expr.operand_1, -polarity), (expr.operand_2, polarity)]
+        elif op in [Operators.AND, Operators.OR]:
+            return [(operand, polarity) for operand in _operands(expr, op)]
+
+        return [(expr.operand_1, self.BOTH), (expr.operand_2, self.BOTH)]
+
+    def _encode(self, item: Tuple[Expression, int], operands: List):
+        """Encodes a subformula, given the literals of the operands listed by '_subformulas'.
+
+        Returns:
+            A clause literal, or a bool if the subformula is constant.
+        """
+        expr, polarity = item
+        if isinstance(expr, Literal):
+            value = expr.operand_1
+            return value if isinstance(value, bool) else self._index[value]
+
+        op = expr.operator
+        if op == Operators.NOT:
+            return self._negate(operands[0])
+
+        if not self._polarity:
+            polarity = self.BOTH
+
+        # Definition clauses are only added for the directions not yet encoded for this gate
+        gate = self._gates.get(expr)
+        if gate is not None:
+            x, encoded = gate
+            directions = [d for d in self._directions(polarity) if d not in encoded]
+        else:
+            x, encoded = None, set()
+            directions = self._directions(polarity)
+
+        if op in [Operators.AND, Operators.OR, Operators.IMPLIES]:
+            if op == Operators.IMPLIES:
+                operands = [self._negate(operands[0]), operands[1]]
+                op = Operators.OR
+
+            # Fold constants, e.g. (p AND TRUE) = p and (p AND FALSE) = FALSE
+            # Constants are compared by identity, since variable 1 would equal TRUE
+            absorbing = op == Operators.OR
+            if any(lit is absorbing for lit in operands):
+                return absorbing
+
+            operands = [lit for lit in operands if lit is not (not absorbing)]
+            if len(operands) == 0:
+                return not absorbing
+            elif len(operands) == 1:
+                return operands[0]
+
+            x = x or self._new_gate(expr, encoded)
+            if op == Operators.AND:
+                # x -> (a AND b): (~x OR a), (~x OR b); (a AND b) -> x: (x OR ~a OR ~b)
+                if self.POSITIVE in directions:
+                    self._clauses.extend((-x, lit) for lit in operands)
+                if self.NEGATIVE in directions:
+                    self._clauses.append((x,) + tuple(-lit for lit in operands))
+            else:
+                # x -> (a OR b): (~x OR a OR b); (a OR b) -> x: (x OR ~a), (x OR ~b)
+                if self.POSITIVE in directions:
+                    self._clauses.append((-x,) + tuple(operands))
+                if self.NEGATIVE in directions:
+                    self._clauses.extend((x, -lit) for lit in operands)
+
+        else:
+            a, b = operands
+            if op == Operators.XOR:
+                b = self._negate(b)  # (a XOR b) = (a IFF ~b)
+
+            # Fold constants, e.g. (a IFF TRUE) = a and (a IFF FALSE) = ~a
+            if isinstance(a, bool):
+                return b if a else self._negate(b)
+            elif isinstance(b, bool):
+                return a if b else self._negate(a)
+
+            x = x or self._new_gate(expr, encoded)
+            # x -> (a IFF b): (~x OR ~a OR b), (~x OR a OR ~b)
+            # (a IFF b) -> x: (x OR a OR b), (x OR ~a OR ~b)
+            if self.POSITIVE in directions:
+                self._clauses.extend([(-x, -a, b), (-x, a, -b)])
+            if self.NEGATIVE in directions:
+                self._clauses.extend([(x, a, b), (x, -a, -b)])
+
+        encoded.update(directions)
+        return x
+
+    def _new_gate(self, expr: Expression, encoded: set) -> int:
+        """Allocates the auxiliary variable for a subformula."""
+        self.num_variables += 1
+        self._gates[expr] = [self.num_variables, encoded]
+        return self.num_variables
+
+    @classmethod
+    def _directions(cls, polarity: int) -> List[int]:
+        """Lists the directions of a definition needed for a polarity."""
+        return [cls.POSITIVE, cls.NEGATIVE] if polarity == cls.BOTH else [polarity]
+
+    @staticmethod
+    def _negate(lit):
+        """Negates a clause literal or a constant."""
+        return not lit if isinstance(lit, bool) else -lit
@@ -0,0 +1,228 @@
+"""Reads and writes CNF formulas in the DIMACS format.
+
+A DIMACS CNF file starts with optional comment lines beginning with 'c', followed by the
+problem line 'p cnf <variables> <clauses>'. Each clause is then given as a list of non-zero
+integers terminated by 0, where i stands for variable i and -i for its negation. Clauses may
+span several lines, and several clauses may share a line. The SATLIB benchmark files end with
+a line containing '%', after which the file is ignored.
+
+Files are streamed, so they are never held in memory as text. Files ending in '.gz', '.bz2'
+or '.xz' are compressed and decompressed on the fly.
+
+    Typical usage example:
+
+    num_variables, clauses = read_dimacs('problem.cnf')
+    with open('copy.cnf', 'w') as f:
+        write_dimacs(f, clauses, num_variables)
+"""
+import bz2
+import gzip
+import lzma
+import os
+from typing import IO, Iterable, Iterator, List, Tuple, Union
+
+_OPENERS = {'.gz': gzip.open, '.bz2': bz2.open, '.xz': lzma.open}
+
+# Number of characters read at once, and of clauses formatted before each write
+_CHUNK_SIZE = 1 << 22
+_BATCH_SIZE = 4096
+
+
+def _open(file: Union[str, os.PathLike], mode: str) -> IO:
+    """Opens a file by its path, decompressing or compressing it based on its extension."""
+    opener = _OPENERS.get(os.path.splitext(os.fspath(file))[1], open)
+    return opener(file, mode)
+
+
+class DimacsReader:
+    """Reads the clauses of a DIMACS CNF file one at a time.
+
+    The problem line is read along with the clauses, so the declared counts are known once
+    the first clause has been read.
+
+    Attributes:
+        num_variables: Number of variables declared by the problem line, or None if it has not
+            been read.
+        num_clauses: Number of clauses declared by the problem line, or None if it has not
+            been read.
+        max_variable: Largest variable in the clauses read so far.
+        comments: Comment lines read so far, without the leading 'c'.
+    """
+
+    def __init__(self, file: Union[str, os.PathLike, IO]):
+        """Inits the reader.
+
+        Args:
+            file: Path of the file, or a text or binary file object to read from.
+        """
+        self._file = file
+        self.num_variables = None
+        self.num_clauses = None
+        self.max_variable = 0
+        self.comments: List[str] = []
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        """Iterates over the clauses of the file.
+
+        Raises:
+            ValueError: If the file is not a well-formed DIMACS CNF file.
+        """
+        if isinstance(self._file, (str, os.PathLike)):
+            with _open(self._file, 'rb') as f:
+                yield from self._read(f)
+        else:
+            yield from self._read(self._file)
+
+    def _read(self, f: IO) -> Iterator[Tuple[int, ...]]:
+        """Reads the clauses from a file object, in chunks of whole lines.
+
+        Chunks with only literals, which is almost all of them, are split and converted to
+        integers at once. Binary files are not decoded, as int() also parses bytes.
+        """
+        literals: List[int] = []
+        markers = None
+        number = 1
+        end = False
+        while not end:
+            chunk = f.read(_CHUNK_SIZE)
+            if len(chunk) == 0:
+                break
+
+            chunk += f.readline()
+            if markers is None:
+                markers = (b'c', b'p', b'%', b'\n') if isinstance(chunk, bytes) else ('c', 'p', '%', '\n')
+
+            ints = None
+            if not any(marker in chunk for marker in markers[:3]):
+                try:
+                    ints = list(map(int, chunk.split()))
+                except ValueError:
+                    pass  # reported with its line number below
+
+            if ints is None:
+                ints, end = self._read_lines(chunk.splitlines(), number, markers)
+
+            number += chunk.count(markers[3])
+            if len(ints) == 0:
+                continue
+
+            self.max_variable = max(self.max_variable, max(ints), -min(ints))
+            literals.extend(ints)
+            start = 0
+            try:
+                while True:
+                    stop = literals.index(0, start)
+                    yield tuple(literals[start:stop])
+                    start = stop + 1
+            except ValueError:
+                literals = literals[start:]
+
+        # The last clause may be left without its terminating 0
+        if len(literals) > 0:
+            yield tuple(literals)
+
+    def _read_lines(self, lines: List, number: int, markers: Tuple) -> Tuple[List[int], bool]:
+        """Reads the literals of lines which may also be comments or the problem line.
+
+        Args:
+            lines: The lines to read.
+            number: Line number of the first line.
+            markers: The first characters of comment lines, the problem line and the end line.
+
+        Returns:
+            The literals, and whether the end of the clauses was reached.
+        """
+        ints = []
+        for number, line in enumerate(lines, start=number):
+            tokens = line.split()
+            if len(tokens) == 0:
+                continue
+
+            first = tokens[0][:1]
+            if first in markers[:3]:
+                if isinstance(line, bytes):
+                    line = line.decode('ascii', errors='replace')
+
+                if first == markers[0]:
+                    self.comments.append(line.strip()[1:].strip())
+                elif first == markers[1]:
+                    self._read_problem_line(line.split(), number)
+                else:
+                    return ints, True
+
+                continue
+
+            try:
+                ints.extend(map(int, tokens))
+            except ValueError:
+                raise ValueError(f'Invalid literal on line {number}: {line.strip()!r}') from None
+
+        return ints, False
+
+    def _read_problem_line(self, tokens: List[str], number: int):
+        """Reads the declared counts of variables and clauses from the problem line."""
+        if self.num_variables is not None:
+            raise ValueError(f'Repeated problem line on line {number}')
+
+        try:
+            if len(tokens) != 4 or tokens[1] != 'cnf':
+                raise ValueError
+            self.num_variables, self.num_clauses = int(tokens[2]), int(tokens[3])
+        except ValueError:
+            raise ValueError(f"Invalid problem line on line {number}, expected 'p cnf <variables> <clauses>': "
+                             f"{' '.join(tokens)}") from None
+
+
+def read_dimacs(file: Union[str, os.PathLike, IO]) -> Tuple[int, List[Tuple[int, ...]]]:
+    """Reads all clauses of a DIMACS CNF file.
+
+    Args:
+        file: Path of the file, or a text or binary file object to read from.
+
+    Returns:
+        The number of variables, and the clauses as tuples of signed variable numbers. The
+        number of variables is the declared one, or the largest variable if it is larger.
+
+    Raises:
+        ValueError: If the file is not a well-formed DIMACS CNF file.
+    """
+    reader = DimacsReader(file)
+    clauses = list(reader)
+    return max(reader.num_variables or 0, reader.max_variable), clauses
+
+
+def write_dimacs(file: Union[str, os.PathLike, IO], clauses: Iterable[Tuple[int, ...]], num_variables: int,
+                 num_clauses: int = None, comments: Iterable[str] = ()):
+    """Writes clauses to a DIMACS CNF file.
+
+    Clauses are formatted and written in batches. They can be streamed from a generator if
+    their number is given, as the problem line comes first; otherwise they are collected.
+
+    Args:
+        file: Path of the file, or a text file object to write to.
+        clauses: The clauses, as tuples of signed variable numbers.
+        num_variables: Number of variables in the clauses.
+        num_clauses: Optional; Number of clauses. Defaults to the length of 'clauses'.
+        comments: Optional; Comment lines written before the problem line.
+    """
+    if isinstance(file, (str, os.PathLike)):
+        with _open(file, 'wt') as f:
+            write_dimacs(f, clauses, num_variables, num_clauses, comments)
+        return
+
+    if num_clauses is None:
+        clauses = clauses if hasattr(clauses, '__len__') else list(clauses)
+        num_clauses = len(clauses)
+
+    file.write(''.join(f'c {comment}\n' for comment in comments))
+    file.write(f'p cnf {num_variables} {num_clauses}\n')
+
+    batch = []
+    for clause in clauses:
+        batch.append(' '.join([*map(str, clause), '0']))
+        if len(batch) == _BATCH_SIZE:
+            file.write('\n'.join(batch) + '\n')
+            batch = []
+
+    if len(batch) > 0:
+        file.write('\n'.join(batch) + '\n')
@@ -0,0 +1,191 @@
+"""Stores CNF clauses compactly, in memory or in a binary file.
+
+Clauses are kept in two flat arrays: the literals of all clauses one after another, as 32-bit
+integers, and the offset of each clause in the literals (plus the total number of literals),
+as 64-bit integers. This takes a few bytes per literal, instead of a Python object per clause
+and per literal.
+
+The binary file holds a header followed by the two arrays, the names of the original variables,
+the encoding of the clauses, and the formula they encode (if it is saved). It is loaded with
+mmap, so the arrays are read from the file on demand instead of being copied, and loading takes
+the same time whatever the size of the file.
+
+    Typical usage example:
+
+    write_store('problem.clauses', clauses, num_variables)
+    num_variables, variables, clauses, encoding, formula = read_store('problem.clauses')
+"""
+import mmap
+import os
+import struct
+from array import array
+from typing import Iterable, Iterator, List, Sequence, Tuple, Union
+
+_MAGIC = b'BSATCLS\x00'
+
+# Byte order marker, version, number of variables, original variables, clauses, literals, and size of the names,
+# encoding and formula
+_HEADER = struct.Struct('=IIqqqqqqq')
+_BYTE_ORDER = 0x01020304
+_VERSION = 2
+
+
+class ClauseStore(Sequence[Tuple[int, ...]]):
+    """Sequence of clauses stored as a flat array of literals and an array of clause offsets.
+
+    Clauses are returned as tuples of signed variable numbers, which are only created when the
+    clauses are accessed. The arrays are either built in memory, or views of a mapped file.
+    """
+
+    def __init__(self, clauses: Iterable[Tuple[int, ...]] = ()):
+        """Inits the store with the given clauses, in memory.
+
+        Args:
+            clauses: Optional; The clauses to store, as sequences of signed variable numbers.
+
+        Raises:
+            OverflowError: If a literal does not fit in a 32-bit integer.
+        """
+        self._literals = array('i')
+        self._offsets = array('q', [0])
+        self._mmap = None
+        for clause in clauses:
+            self._literals.extend(clause)
+            self._offsets.append(len(self._literals))
+
+    @classmethod
+    def _from_buffers(cls, literals: memoryview, offsets: memoryview, mapped: mmap.mmap) -> 'ClauseStore':
+        """Creates a store from views of the arrays of literals and offsets in a mapped file."""
+        store = cls.__new__(cls)
+        store._literals = literals
+        store._offsets = offsets
+        store._mmap = mapped
+        return store
+
+    @property
+    def num_literals(self) -> int:
+        """Total number of literals in the clauses."""
+        return len(self._literals)
+
+    def __len__(self) -> int:
+        """Number of clauses in the store."""
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index):
+        """Returns a clause as a tuple of literals, or a list of clauses for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('clause index out of range')
+
+        return tuple(self._literals[self._offsets[index]:self._offsets[index + 1]])
+
+    def __iter__(self) -> Iterator[Tuple[int, ...]]:
+        """Iterates over the clauses."""
+        literals, offsets = self._literals, self._offsets
+        for i in range(len(offsets) - 1):
+            yield tuple(literals[offsets[i]:offsets[i + 1]])
+
+    def __eq__(self, other) -> bool:
+        """Checks if another sequence has the same clauses, in the same order."""
+        if not isinstance(other, Sequence) or len(self) != len(other):
+            return False
+
+        return all(clause == tuple(other_clause) for clause, other_clause in zip(self, other))
+
+    def close(self):
+        """Unmaps the file of the store, if any. The store cannot be used afterwards."""
+        if self._mmap is not None:
+            self._literals.release()
+            self._offsets.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+def write_store(file: Union[str, os.PathLike], clauses: Iterable[Tuple[int, ...]], num_variables: int,
+                variables: List[str] = (), encoding: str = 'distribute', formula: str = ''):
+    """Writes clauses to a binary clause store file.
+
+    Args:
+        file: Path of the file to write.
+        clauses: The clauses, as tuples of signed variable numbers.
+        num_variables: Number of variables in the clauses.
+        variables: Optional; Names of the original variables numbered from 1. The variables after
+            them are auxiliary.
+        encoding: Optional; The encoding of the formula into the clauses.
+        formula: Optional; The formula encoded by the clauses, or an empty string.
+    """
+    if not isinstance(clauses, ClauseStore):
+        clauses = ClauseStore(clauses)
+
+    names = '\n'.join(variables).encode('utf-8')
+    encoding = encoding.encode('utf-8')
+    formula = formula.encode('utf-8')
+    with open(file, 'wb') as f:
+        f.write(_MAGIC)
+        f.write(_HEADER.pack(_BYTE_ORDER, _VERSION, num_variables, len(variables), len(clauses), clauses.num_literals,
+                             len(names), len(encoding), len(formula)))
+        f.write(clauses._offsets)
+        f.write(clauses._literals)
+        f.write(names)
+        f.write(encoding)
+        f.write(formula)
+
+
+def read_store(file: Union[str, os.PathLike]) -> Tuple[int, List[str], ClauseStore, str, str]:
+    """Maps a binary clause store file into memory.
+
+    The clauses are read from the file as they are accessed, and the file stays mapped until
+    the store is closed.
+
+    Args:
+        file: Path of the file to read.
+
+    Returns:
+        The number of variables, the names of the original variables, the clauses, their
+        encoding, and the formula they encode (or an empty string).
+
+    Raises:
+        ValueError: If the file is not a clause store written on a machine with the same byte
+            order, by the same version.
+    """
+    with open(file, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    start = len(_MAGIC) + _HEADER.size
+    if len(mapped) < start or mapped[:len(_MAGIC)] != _MAGIC:
+        mapped.close()
+        raise ValueError(f'Not a clause store file: {file}')
+
+    order, version = struct.unpack_from('=II', mapped, len(_MAGIC))
+    if order != _BYTE_ORDER or version != _VERSION:
+        mapped.close()
+        raise ValueError(f'Clause store file {file} has a different byte order or version')
+
+    (_, _, num_variables, num_original, num_clauses, num_literals,
+     names_size, encoding_size, formula_size) = _HEADER.unpack_from(mapped, len(_MAGIC))
+
+    view = memoryview(mapped)
+    offsets = view[start:start + 8 * (num_clauses + 1)]
+    start += len(offsets)
+    literals = view[start:start + 4 * num_literals]
+    start += len(literals)
+    names = bytes(view[start:start + names_size]).decode('utf-8')
+    start += names_size
+    encoding = bytes(view[start:start + encoding_size]).decode('utf-8')
+    start += encoding_size
+    formula = bytes(view[start:start + formula_size]).decode('utf-8')
+    view.release()
+
+    variables = names.split('\n') if len(names) > 0 else []
+    if len(variables) != num_original:
+        literals.release()
+        offsets.release()
+        mapped.close()
+        raise ValueError(f'Clause store file {file} has {len(variables)} names for {num_original} variables')
+
+    store = ClauseStore._from_buffers(literals.cast('i'), offsets.cast('q'), mapped)
+    return num_variables, variables, store, encoding, formula
@@ -1,15 +1,44 @@
 """Provides a collection of SAT solvers.
 
 This package implements different SAT solving algorithms and exposes a common API for using these \
-solvers to find satisfiability of CNF-SAT problems. Available solvers include DPLLSolver.
+solvers to find satisfiability of CNF-SAT problems. Available solvers include CDCLSolver, which is the \
+default engine, DPLLSolver, which is kept as the reference implementation, PortfolioSolver, which runs \
+several solvers in parallel and keeps the first answer, and CubeAndConquerSolver, which splits the search \
+space between worker processes, possibly on several hosts. ModelCounter counts the models \
+of a formula without enumerating them, Preprocessor simplifies formulas before they are solved, \
+ResultCache keeps the results of solved formulas, and SolverSession solves related queries incrementally.
 
     Typical usage example:
 
-    solver = DPLLSolver()
+    solver = CDCLSolver()
     solution = solver.solve('some propositional logic formula')
-    solution.formula     # returns the CNF representation of the input formula
+    solution.problem     # returns the CNF representation of the input formula
     solution.assignments # returns assignments satisfying the formula (if any)
+
+    solver.solve('some propositional logic formula', max_solutions=1)  # stops at the first assignment
+    for assignment in solver.iter_solutions('some propositional logic formula'):
+        ...                  # assignments are searched for one at a time
+
+    solver.solve('some propositional logic formula', preprocess=True)   # simplifies the CNF before solving it
+    solver.solve('some propositional logic formula', decompose=True)    # solves independent parts separately
+
+    SATSolver.cache = ResultCache(path='results.db')  # reuses the results of formulas solved before
+
+    session = SolverSession()  # keeps its clauses and learned clauses between queries
+    session.add('some propositional logic formula')
+    session.push()             # formulas added until the matching pop are removed by it
+    session.solve(assumptions=['a', '~b'])
+
+    solver.is_valid('some propositional logic formula')                # looks for a single counterexample
+    solver.is_equivalent('some formula', 'another formula')
 """
 
 from ._solvers import Assignment, SATSolution, SATSolver
 from .dpll import DPLLSolver
+from .cdcl import CDCLSolver
+from .caching import ResultCache
+from .counting import ModelCounter
+from .incremental import SolverSession
+from .cubing import CubeAndConquerSolver
+from .portfolio import PortfolioSolver
+from .preprocessing import Preprocessor
@@ -6,11 +6,16 @@ for external use.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, List
+from copy import copy
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from ..logic.grammar import TRUE, FALSE
+from ..logic import UnaryOperation
+from ..logic.grammar import TRUE, FALSE, Operators
 from ..norm import CNF
 from ..utils import remove_whitespaces
+from .caching import ResultCache
+from .counting import ModelCounter
+from .preprocessing import Preprocessor
 
 
 class Assignment:
@@ -53,38 +58,126 @@ class Assignment:
 class SATSolution:
     """Solution of a CNF-SAT problem.
 
+    The assignments of a solution are evaluated lazily from the search of a solver, and cached as they are found.
+    Checking satisfiability only evaluates the first assignment, while iterating over the solution continues the
+    search on demand. Listing all assignments, or taking the length of the solution, completes the search.
+
     Attributes:
         problem: The CNF formula to check satisfiability.
+        max_solutions: Maximum number of assignments evaluated, or None if all of them are evaluated.
     """
 
-    def __init__(self, problem: CNF, assignments: List[Any]):
+    def __init__(self, problem: CNF, assignments: Iterable[Any], max_solutions: int = None):
         """Inits a solution for a CNF-SAT problem.
 
         Args:
             problem: The CNF formula to check satisfiability.
-            assignments: List of all assignments (if any) solving the formula.
+            assignments: Iterable over all assignments (if any) solving the formula. It is consumed lazily.
+            max_solutions: Optional; Maximum number of assignments to evaluate. All of them are evaluated if None.
         """
         self.problem = problem
+        self.max_solutions = max_solutions
         self._assignments = []
-        for assignment in assignments:
-            self._assignments.append(Assignment(assignment))
+        self._pending = iter(assignments)
+        self._projected = set()
+        self._variables = set(problem.variables)
+        self._num_models = None
+        self._is_valid = None
+
+    def _next(self) -> bool:
+        """Evaluates the next assignment, if any.
+
+        Assignments are projected onto the variables of the original formula, dropping any auxiliary variables
+        introduced by the CNF encoding, and the assignments repeated by the projection are skipped.
+
+        Returns:
+            True if a new assignment was evaluated, False if there are no more assignments.
+        """
+        while self._pending is not None:
+            if self.max_solutions is not None and len(self._assignments) >= self.max_solutions:
+                break
+
+            assignment = next(self._pending, None)
+            if assignment is None:
+                break
+
+            if isinstance(assignment, dict):
+                assignment = {var: value for var, value in assignment.items() if var in self._variables} or True
+
+            assignment = Assignment(assignment)
+            if str(assignment) not in self._projected:
+                self._projected.add(str(assignment))
+                self._assignments.append(assignment)
+                return True
+
+        self._pending = None
+        return False
+
+    def _evaluate(self, count: int = None) -> int:
+        """Evaluates assignments until a number of them is known, or all of them if count is None.
+
+        Returns:
+            The number of assignments evaluated.
+        """
+        while (count is None or len(self._assignments) < count) and self._next():
+            pass
+
+        return len(self._assignments)
 
     @property
     def is_false(self) -> bool:
         """Checks if the problem is unsatisfiable."""
-        return len(self) == 0 or (len(self) == 1 and self._assignments[0] == FALSE)
+        return self._evaluate(1) == 0 or (self._assignments[0] == FALSE and self._evaluate(2) == 1)
 
     @property
     def is_true(self) -> bool:
-        """Checks if the problem is always satisfiable."""
-        return (len(self) > 0 and len(self) == self.problem.max_solutions) or \
-               (len(self) == 1 and self._assignments[0] == TRUE)
+        """Checks if the problem is always satisfiable.
+
+        Unless the first assignment already shows that the formula is satisfied without assigning any variable,
+        the formula is valid if all its clauses are tautologies. With auxiliary variables, which the clauses may not
+        satisfy under every assignment, its negation is solved for a single counterexample instead.
+        """
+        if self._evaluate(1) == 0:
+            return False
+        elif self._assignments[0] == TRUE and self._evaluate(2) == 1:
+            return True
+
+        if self._is_valid is None:
+            problem = self.problem
+            if problem.num_variables == len(problem.variables):
+                self._is_valid = all(len({abs(lit) for lit in clause}) < len(set(clause)) for clause in problem.clauses)
+            else:
+                # Imported here, as the CDCL solver is defined on top of this module
+                from .cdcl import CDCLSolver
+                negation = CNF(UnaryOperation(Operators.NOT, problem.formula), CNF.PG)
+                self._is_valid = CDCLSolver()._solve(negation, 1).is_false
+
+        return self._is_valid
+
+    def count_models(self) -> int:
+        """Counts the assignments of all variables of the formula which satisfy it.
+
+        Unlike the number of assignments of the solution, which may leave variables unassigned, this is the number
+        of complete models. It is found by a model counter, independently of the assignments of the solution.
+        """
+        if self._num_models is None:
+            self._num_models = ModelCounter().count(self.problem)
+
+        return self._num_models
 
     @property
     def assignments(self) -> list:
         """List of assignments satisfying the formula (or empty list)."""
+        self._evaluate()
         return self._assignments
 
+    def __iter__(self) -> Iterator[Assignment]:
+        """Iterates over the assignments satisfying the formula, evaluating them as needed."""
+        idx = 0
+        while idx < len(self._assignments) or self._next():
+            yield self._assignments[idx]
+            idx += 1
+
     def __eq__(self, other) -> bool:
         """Checks equality of two solutions.
 
@@ -97,7 +190,7 @@ class SATSolution:
 
     def __len__(self) -> int:
         """Number of assignments satisfying the formula."""
-        return len(self._assignments)
+        return self._evaluate()
 
     def __str__(self) -> str:
         """Returns a printable representation of the solution."""
@@ -106,33 +199,564 @@ class SATSolution:
         elif self.is_false:
             return 'UNSAT'
         else:
-            return ''.join([f'\t{idx + 1}) {it}' for idx, it in enumerate(self._assignments)])
+            return ''.join([f'\t{idx + 1}) {it}' for idx, it in enumerate(self.assignments)])
 
 
 class SATSolver(ABC):
     """Defines an interface for algorithms to solve CNF-SAT problems.
+
+    Attributes:
+        cache: Cache of the models found for formulas, which 'solve' looks up before solving them, or None. Set it
+            on the class to share one cache between all solvers.
     """
+    cache: Optional[ResultCache] = None
 
-    def solve(self, proposition: str) -> SATSolution:
+    def solve(self, proposition: Union[str, CNF], max_solutions: int = None,
+              preprocess: Union[bool, Preprocessor] = False, decompose: bool = False) -> SATSolution:
         """Determines satisfiability a Boolean expression.
 
         Args:
-             proposition: The Boolean expression to solve.
+             proposition: The Boolean expression to solve, or a CNF formula, e.g. read from a DIMACS file.
+             max_solutions: Optional; Maximum number of assignments to find. All of them are found if None.
+             preprocess: Optional; Simplifies the CNF before solving it if True, or with the given preprocessor.
+             decompose: Optional; Solves the parts of the CNF which share no variables separately if True.
 
         Returns:
             The input expression formulated as a CNF-SAT problem, including its solutions (if any).
+
+        Raises:
+            ValueError: If the maximum number of assignments is not positive.
+        """
+        if max_solutions is not None and max_solutions < 1:
+            raise ValueError(f'Maximum number of solutions must be positive: {max_solutions}')
+
+        problem = proposition if isinstance(proposition, CNF) else CNF(remove_whitespaces(proposition))
+        if self.cache is None:
+            return self._solve_uncached(problem, max_solutions, preprocess, decompose)
+
+        key = self.cache.key(problem, self, preprocess, decompose)
+        models = self.cache.get(key, max_solutions)
+        if models is not None:
+            assignments = ({problem.name(lit): lit > 0 for lit in model} or True for model in models)
+            return SATSolution(problem, assignments, max_solutions)
+
+        solution = self._solve_uncached(problem, max_solutions, preprocess, decompose)
+        return SATSolution(problem, self._record(key, solution, max_solutions), max_solutions)
+
+    def _solve_uncached(self, problem: CNF, max_solutions: int = None,
+                        preprocess: Union[bool, Preprocessor] = False, decompose: bool = False) -> SATSolution:
+        """Determines satisfiability of a CNF Boolean formula, preprocessing and decomposing it if requested."""
+        if preprocess:
+            preprocessor = preprocess if isinstance(preprocess, Preprocessor) else Preprocessor()
+            return self._solve_preprocessed(problem, preprocessor, max_solutions, decompose)
+        elif decompose:
+            return self._solve_decomposed(problem, max_solutions)
+
+        return self._solve(problem, max_solutions)
+
+    def _record(self, key: str, solution: SATSolution, max_solutions: int = None) -> Iterator[Any]:
+        """Passes on the assignments of a solution as they are evaluated, and caches them.
+
+        Every write replaces the whole entry of the formula, so the assignments are only cached once, when the
+        search ends or the solution is discarded before. Solutions which are only partly evaluated are cached too.
+
+        Args:
+            key: The cache key of the formula.
+            solution: The solution whose assignments to cache.
+            max_solutions: Optional; Maximum number of assignments evaluated by the solution.
+
+        Yields:
+            The truth values of each assignment.
+        """
+        cache = self.cache
+        index = {name: var + 1 for var, name in enumerate(solution.problem.variables)}
+        models = []
+        complete = False
+        try:
+            for assignment in solution:
+                truth = assignment._truth
+                models.append(tuple(index[var] if value else -index[var] for var, value in truth.items())
+                              if isinstance(truth, dict) else ())
+                yield truth
+
+            complete = max_solutions is None or len(models) < max_solutions
+
+        finally:
+            if complete or len(models) > 0:
+                cache.put(key, models, complete=complete)
+
+    def _solve_preprocessed(self, problem: CNF, preprocessor: Preprocessor, max_solutions: int = None,
+                            decompose: bool = False) -> SATSolution:
+        """Determines satisfiability of a CNF Boolean formula after preprocessing it.
+
+        The reduced formula is solved instead, and each of its models is extended to the variables removed by the
+        preprocessor. A copy of the preprocessor is used, as it keeps the reconstruction stack of the formula.
+
+        Args:
+            problem: The CNF-SAT problem to solve.
+            preprocessor: The preprocessor simplifying the formula.
+            max_solutions: Optional; Maximum number of assignments to find. All of them are found if None.
+            decompose: Optional; Solves the parts of the reduced formula which share no variables separately if True.
+
+        Returns:
+            Solution of the formula, including the assignments satisfying it (if any), evaluated lazily.
+        """
+        preprocessor = copy(preprocessor)
+        reduced = preprocessor.preprocess(problem)
+        reduced = self._solve_decomposed(reduced) if decompose else self._solve(reduced)
+        models = (assignment._truth if isinstance(assignment._truth, dict) else dict() for assignment in reduced)
+        assignments = (model or True for reduced_model in models for model in preprocessor.extend(reduced_model))
+        return SATSolution(problem, assignments, max_solutions)
+
+    def _solve_decomposed(self, problem: CNF, max_solutions: int = None) -> SATSolution:
+        """Determines satisfiability of a CNF Boolean formula by solving its connected components separately.
+
+        Components share no variables, so each of them is searched on its own instead of over the product of their
+        search spaces, and the models of the formula combine one model of every component. The models are combined
+        lazily as a cartesian product: the search of each component only runs as far as the combinations requested
+        need, and keeps the models it found, so only the models of the components are held in memory and never all
+        their combinations.
+
+        Args:
+            problem: The CNF-SAT problem to solve.
+            max_solutions: Optional; Maximum number of assignments to find. All of them are found if None.
+
+        Returns:
+            Solution of the formula, including the assignments satisfying it (if any), evaluated lazily.
+        """
+        components = problem.components()
+        if len(components) == 1:
+            return self._solve(problem, max_solutions)
+
+        solutions = [self._solve(component, 1 if max_solutions == 1 else None) for component in components]
+        return SATSolution(problem, _product(solutions), max_solutions)
+
+    def iter_solutions(self, proposition: Union[str, CNF], max_solutions: int = None,
+                       preprocess: Union[bool, Preprocessor] = False,
+                       decompose: bool = False) -> Iterator[Assignment]:
+        """Finds the assignments satisfying a Boolean expression one at a time.
+
+        The search for each assignment only runs when it is requested, and resumes from where the search for the
+        previous one stopped.
+
+        Args:
+             proposition: The Boolean expression to solve, or a CNF formula.
+             max_solutions: Optional; Maximum number of assignments to find. All of them are found if None.
+             preprocess: Optional; Simplifies the CNF before solving it if True, or with the given preprocessor.
+             decompose: Optional; Solves the parts of the CNF which share no variables separately if True.
+
+        Returns:
+            A generator of the assignments satisfying the expression.
+        """
+        return iter(self.solve(proposition, max_solutions, preprocess, decompose))
+
+    def is_valid(self, proposition: str) -> bool:
+        """Checks if a Boolean expression is valid, i.e. true under every assignment (a tautology).
+
+        Rather than counting the models of the expression, its negation is solved for a single assignment, which
+        is a counterexample if there is one. The negation is converted with the Plaisted-Greenbaum encoding, so
+        that it does not grow exponentially.
+
+        Args:
+            proposition: The Boolean expression to check.
+
+        Returns:
+            True if the expression is valid, False otherwise.
         """
-        problem = CNF(remove_whitespaces(proposition))
-        return self._solve(problem)
+        problem = CNF(remove_whitespaces(f'{Operators.NOT}({proposition})'), CNF.PG)
+        return self._solve(problem, 1).is_false
+
+    def is_equivalent(self, proposition_1: str, proposition_2: str) -> bool:
+        """Checks if two Boolean expressions are equivalent, i.e. have the same truth value under every assignment.
+
+        Args:
+            proposition_1: The first Boolean expression.
+            proposition_2: The second Boolean expression.
+
+        Returns:
+            True if the expressions are equivalent, False otherwise.
+        """
+        return self.is_valid(f'({proposition_1}) {Operators.IFF} ({proposition_2})')
 
     @abstractmethod
-    def _solve(self, problem: CNF) -> SATSolution:
+    def _solve(self, problem: CNF, max_solutions: int = None) -> SATSolution:
         """Determines satisfiability of a CNF Boolean formula.
 
         Args:
             problem: The CNF-SAT problem to solve.
+            max_solutions: Optional; Maximum number of assignments to find. All of them are found if None.
 
         Returns:
-            Solution of the formula, including the assignments satisfying it (if any).
+            Solution of the formula, including the assignments satisfying it (if any), evaluated lazily.
         """
         pass
+
+
+def _product(solutions: List[SATSolution]) -> Iterator[Any]:
+    """Combines the assignments of solutions over disjoint variables, as a lazy cartesian product.
+
+    The combinations are generated like the digits of a counter, the last solution changing fastest. Solutions are
+    iterated again from their first assignment when they wrap around, which only evaluates assignments the first time.
+
+    Args:
+        solutions: The solutions to combine.
+
+    Yields:
+        The truth values of each combination of assignments, or True if it assigns no variable.
+    """
+    # No combination exists if some solution has no assignment, which is checked before iterating the others
+    if any(solution.is_false for solution in solutions):
+        return
+
+    iterators = [iter(solution) for solution in solutions]
+    current = [next(iterator) for iterator in iterators]
+    while True:
+        truth = dict()
+        for assignment in current:
+            if isinstance(assignment._truth, dict):
+                truth.update(assignment._truth)
+
+        yield truth or True
+
+        idx = len(solutions) - 1
+        while idx >= 0:
+            assignment = next(iterators[idx], None)
+            if assignment is not None:
+                current[idx] = assignment
+                break
+
+            iterators[idx] = iter(solutions[idx])
+            current[idx] = next(iterators[idx])
+            idx -= 1
+
+        if idx < 0:
+            return
+
+
+class _ClauseDatabase:
+    """Clauses of a CNF over integer literals, together with a partial assignment.
+
+    Variables are numbered from 1 to 'num_variables', and literals are signed variable numbers.
+    Literals are assigned in order on a trail, and unit propagation follows each assignment.
+    Every decision opens a new decision level, and each assigned variable records its level
+    and the clause which implied it (its reason), if any.
+
+    Propagation uses two watched literals per clause: the first two literals of every clause
+    are watched, and a clause is only visited when one of its watched literals becomes false.
+    The clause then either finds another literal to watch, becomes unit (its other watched
+    literal is implied, and moved to the front of the clause), or is falsified. Watches stay
+    valid when literals are unassigned, so backtracking only has to pop the trail.
+
+    Attributes:
+        num_variables: Number of variables in the clauses.
+        clauses: The clauses, as lists of distinct literals. Literals in a clause are reordered
+            while it is watched. Tautological clauses are always satisfied, and are left out.
+        learned: Clauses derived from the other clauses, which may be removed again.
+        values: Truth value of each literal (indexed by the literal itself, so negative literals
+            index from the end of the list), or None if it is unassigned.
+        levels: Decision level at which each variable was assigned.
+        reasons: Clause which implied each variable, or None for decisions.
+        phases: Truth value each variable had when it was last unassigned.
+        trail: Assigned literals, in the order they were assigned.
+        heuristic: Branching heuristic notified of assignments and added clauses, if any.
+    """
+
+    def __init__(self, clauses: Iterable[Tuple[int, ...]], num_variables: int):
+        """Inits the clause database with no variables assigned.
+
+        Args:
+            clauses: The clauses of the CNF.
+            num_variables: Number of variables in the clauses.
+        """
+        self.num_variables = num_variables
+        self.clauses = [list(dict.fromkeys(clause)) for clause in clauses]
+        self.clauses = [clause for clause in self.clauses if len({abs(lit) for lit in clause}) == len(clause)]
+        self.learned: List[List[int]] = []
+        self.values: List[Any] = [None] * (2 * num_variables + 1)
+        self.levels: List[int] = [0] * (num_variables + 1)
+        self.reasons: List[Any] = [None] * (num_variables + 1)
+        self.phases: List[bool] = [False] * (num_variables + 1)
+        self.trail: List[int] = []
+        self.heuristic = None
+
+        # Trail size at the start of each decision level after the first
+        self._limits: List[int] = []
+
+        # Index in the trail of the next literal to propagate
+        self._head = 0
+
+        # Clauses watching each literal, indexed like 'values'
+        self._watches: List[List[List[int]]] = [[] for _ in range(2 * num_variables + 1)]
+        self._watch_all()
+
+    def use_heuristic(self, heuristic):
+        """Sets up a branching heuristic and notifies it of all further changes to the database.
+
+        Args:
+            heuristic: The branching heuristic, or None.
+        """
+        self.heuristic = heuristic
+        if heuristic is not None:
+            heuristic.setup(self)
+
+    def add_variables(self, count: int):
+        """Adds unassigned variables, numbered after the current ones.
+
+        Args:
+            count: Number of variables to add.
+        """
+        old, num_variables = self.num_variables, self.num_variables + count
+        values = [None] * (2 * num_variables + 1)
+        watches = [[] for _ in range(2 * num_variables + 1)]
+        for var in range(1, old + 1):
+            values[var], values[-var] = self.values[var], self.values[-var]
+            watches[var], watches[-var] = self._watches[var], self._watches[-var]
+
+        self.num_variables = num_variables
+        self.values = values
+        self._watches = watches
+        self.levels.extend([0] * count)
+        self.reasons.extend([None] * count)
+        self.phases.extend([False] * count)
+        if self.heuristic is not None:
+            self.heuristic.extended(self, old)
+
+    def _watch_all(self):
+        """Watches the first two literals of all clauses."""
+        for watching in self._watches:
+            watching.clear()
+
+        for clause in self.clauses + self.learned:
+            if len(clause) >= 2:
+                self._watches[clause[0]].append(clause)
+                self._watches[clause[1]].append(clause)
+
+    @property
+    def level(self) -> int:
+        """The current decision level."""
+        return len(self._limits)
+
+    def assign(self, lit: int, reason: List[int] = None):
+        """Makes a literal true, without propagating it.
+
+        Args:
+            lit: The literal to assign.
+            reason: Optional; The clause which implies the literal, with the literal first.
+        """
+        var = abs(lit)
+        self.values[lit] = True
+        self.values[-lit] = False
+        self.levels[var] = len(self._limits)
+        self.reasons[var] = reason
+        self.trail.append(lit)
+        if self.heuristic is not None:
+            self.heuristic.assigned(lit)
+
+    def decide(self, lit: int):
+        """Opens a new decision level and makes a literal true, without propagating it.
+
+        Args:
+            lit: The literal to decide.
+        """
+        self._limits.append(len(self.trail))
+        self.assign(lit)
+
+    def assign_units(self) -> bool:
+        """Assigns the literals of all unit clauses, and checks for empty clauses.
+
+        Returns:
+            False if the clauses are trivially unsatisfiable, True otherwise.
+        """
+        for clause in self.clauses:
+            if len(clause) == 0 or (len(clause) == 1 and self.values[clause[0]] is False):
+                return False
+            elif len(clause) == 1 and self.values[clause[0]] is None:
+                self.assign(clause[0], clause)
+
+        return True
+
+    def add_clause(self, clause: List[int], learned: bool = False):
+        """Adds a clause under the current assignment.
+
+        Literals of the clause are reordered so that it watches its unassigned or true literals,
+        or otherwise the false literals assigned last. If the clause is unit, its remaining
+        literal is assigned (but not propagated).
+
+        Args:
+            clause: The clause to add, as a list of distinct literals.
+            learned: Optional; Adds the clause to the learned clauses if True.
+
+        Returns:
+            The clause if it is falsified by the assignment, None otherwise.
+        """
+        values, levels = self.values, self.levels
+        clause.sort(key=lambda lit: (values[lit] is False, -levels[abs(lit)]))
+        if learned:
+            self.learned.append(clause)
+        else:
+            self.clauses.append(clause)
+            if self.heuristic is not None:
+                self.heuristic.added(clause)
+
+        if len(clause) >= 2:
+            self._watches[clause[0]].append(clause)
+            self._watches[clause[1]].append(clause)
+
+        if len(clause) == 0 or values[clause[0]] is False:
+            return clause
+        elif values[clause[0]] is None and (len(clause) == 1 or values[clause[1]] is False):
+            self.assign(clause[0], clause)
+
+        return None
+
+    def propagate(self):
+        """Propagates the assigned literals until no clause is unit.
+
+        Returns:
+            A clause falsified by the assignment, or None if there is no conflict.
+        """
+        values = self.values
+        while self._head < len(self.trail):
+            false_lit = -self.trail[self._head]
+            self._head += 1
+
+            watching = self._watches[false_lit]
+            i = 0
+            while i < len(watching):
+                clause = watching[i]
+
+                # Keep the false literal second, so that the first one is the other watch
+                if clause[0] == false_lit:
+                    clause[0], clause[1] = clause[1], false_lit
+
+                other = clause[0]
+                if values[other] is True:
+                    i += 1
+                    continue
+
+                # Look for another literal to watch instead of the false one
+                for k in range(2, len(clause)):
+                    if values[clause[k]] is not False:
+                        clause[1], clause[k] = clause[k], false_lit
+                        self._watches[clause[1]].append(clause)
+                        watching[i] = watching[-1]
+                        watching.pop()
+                        break
+
+                else:
+                    if values[other] is False:
+                        self._head = len(self.trail)
+                        return clause
+
+                    self.assign(other, clause)
+                    i += 1
+
+        return None
+
+    def backtrack(self, level: int):
+        """Unassigns all literals assigned after a decision level.
+
+        Args:
+            level: The decision level to backtrack to.
+        """
+        if level >= len(self._limits):
+            return
+
+        size = self._limits[level]
+        while len(self.trail) > size:
+            lit = self.trail.pop()
+            self.values[lit] = None
+            self.values[-lit] = None
+            self.reasons[abs(lit)] = None
+            self.phases[abs(lit)] = lit > 0
+            if self.heuristic is not None:
+                self.heuristic.unassigned(lit)
+
+        del self._limits[level:]
+        self._head = min(self._head, size)
+
+    def remove_learned(self, clauses: List[List[int]]):
+        """Removes learned clauses.
+
+        Args:
+            clauses: The learned clauses to remove. Clauses which are the reason of an
+                assignment must not be removed.
+        """
+        removed = set(map(id, clauses))
+        self.learned = [clause for clause in self.learned if id(clause) not in removed]
+        self._watch_all()
+
+    def is_locked(self, clause: List[int]) -> bool:
+        """Checks if a clause is the reason for an assignment."""
+        return len(clause) > 0 and self.reasons[abs(clause[0])] is clause
+
+    def eliminate_pure_literals(self):
+        """Assigns all pure literals, which occur in unsatisfied clauses with only one polarity.
+
+        A pure literal can be made true without making the clauses unsatisfiable, but doing so
+        discards the models in which it is false. Assigning it satisfies the clauses it occurs
+        in, which can make further literals pure, so this is repeated until no pure literals
+        remain.
+
+        Returns:
+            The assigned pure literals.
+        """
+        values = self.values
+        occurrences = [[] for _ in range(2 * self.num_variables + 1)]
+        counts = [0] * (2 * self.num_variables + 1)
+        for idx, clause in enumerate(self.clauses):
+            if not any(values[lit] for lit in clause):
+                for lit in clause:
+                    if values[lit] is None:
+                        occurrences[lit].append(idx)
+                        counts[lit] += 1
+
+        satisfied = set()
+        pure = [lit for var in range(1, self.num_variables + 1) for lit in [var, -var]
+                if values[lit] is None and counts[lit] > 0 and counts[-lit] == 0]
+        assigned = []
+        while len(pure) > 0:
+            lit = pure.pop()
+            if values[lit] is not None or counts[lit] == 0 or counts[-lit] > 0:
+                continue
+
+            self.assign(lit)
+            assigned.append(lit)
+            for idx in occurrences[lit]:
+                if idx not in satisfied:
+                    satisfied.add(idx)
+                    for other in self.clauses[idx]:
+                        if values[other] is None:
+                            counts[other] -= 1
+                            if counts[other] == 0 and counts[-other] > 0:
+                                pure.append(-other)
+
+        return assigned
+
+    def is_satisfied(self, clause: List[int]) -> bool:
+        """Checks if a clause has a true literal."""
+        values = self.values
+        return any(values[lit] for lit in clause)
+
+    def next_unsatisfied(self, start: int = 0) -> int:
+        """Finds the first clause which is not satisfied by the assignment.
+
+        Args:
+            start: Optional; Index of the clause to start searching from.
+
+        Returns:
+            Index of the clause, or the number of clauses if all are satisfied.
+        """
+        idx = start
+        while idx < len(self.clauses) and self.is_satisfied(self.clauses[idx]):
+            idx += 1
+
+        return idx
+
+    def bindings(self, names) -> Dict[str, bool]:
+        """Returns the assignment as truth values of named variables.
+
+        Args:
+            names: Function returning the name of a variable.
+        """
+        return {names(lit): lit > 0 for lit in self.trail}
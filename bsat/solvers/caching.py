@@ -0,0 +1,196 @@
+"""Implements a cache of the results of solved CNF formulas.
+"""
+import hashlib
+import sqlite3
+from array import array
+from collections import OrderedDict
+from os import PathLike
+from threading import Lock
+from typing import Any, List, Optional, Tuple, Union
+
+from ..norm import CNF
+
+_Models = List[Tuple[int, ...]]
+
+
+def _describe(value: Any) -> str:
+    """Describes a value by its class and public attributes, e.g. a solver and its heuristic."""
+    if value is None or isinstance(value, (bool, int, float, str, bytes)):
+        return repr(value)
+    elif isinstance(value, (list, tuple)):
+        return '[' + ', '.join(_describe(item) for item in value) + ']'
+
+    attributes = sorted((name, attribute) for name, attribute in getattr(value, '__dict__', {}).items()
+                        if not name.startswith('_'))
+    return f'{type(value).__qualname__}(' + ', '.join(f'{name}={_describe(attr)}' for name, attr in attributes) + ')'
+
+
+class ResultCache:
+    """Bounded LRU cache of the models found for CNF formulas.
+
+    Formulas are keyed on a hash of their sorted clauses and of the solver configuration: the literals of each
+    clause and the clauses themselves are sorted, and repeated ones removed, so formulas which only differ in the
+    order of their clauses and literals share an entry. Variables keep the numbering of the formula, and are not
+    renamed canonically. Solvers of different classes or configurations do not share entries, since they may find
+    different models, e.g. partial assignments. Models are cached as signed variable numbers, and named after the
+    variables of each formula looked up.
+
+    An entry holds the models found so far for a formula, and whether they are all its models. It answers a
+    search for at most n models if it is complete, or has at least n models.
+
+    Entries are stored as packed 32-bit integers, and the least recently used ones are evicted once their total
+    size exceeds the limit. If a database file is given, entries are also written to it, and entries missing from
+    memory are looked up in it, so that results persist across processes and sessions. The database is not
+    bounded.
+
+    Attributes:
+        max_bytes: Maximum total size in bytes of the entries kept in memory.
+        hits: Number of lookups answered by the cache.
+        misses: Number of lookups not answered by the cache.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 2 ** 20, path: Union[str, PathLike] = None):
+        """Inits the cache.
+
+        Args:
+            max_bytes: Optional; Maximum total size in bytes of the entries kept in memory.
+            path: Optional; Path of an SQLite database file persisting the entries, or None.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._size = 0
+        self._lock = Lock()
+
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+            self._db.execute('CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, models BLOB)')
+            self._db.commit()
+
+    @property
+    def size(self) -> int:
+        """Total size in bytes of the entries kept in memory."""
+        return self._size
+
+    def __len__(self) -> int:
+        """Number of entries kept in memory."""
+        return len(self._entries)
+
+    @staticmethod
+    def key(problem: CNF, solver: Any = None, preprocess: Any = False, decompose: bool = False) -> str:
+        """Returns the key of a CNF formula, a hash of its sorted clauses, number of variables and configuration.
+
+        Args:
+            problem: The CNF formula.
+            solver: Optional; The solver searching the formula, described by its class and public attributes.
+            preprocess: Optional; Whether, or with which preprocessor, the formula is simplified before the search.
+            decompose: Optional; Whether independent components of the formula are searched separately.
+        """
+        clauses = sorted({tuple(sorted(set(clause), key=lambda lit: (abs(lit), lit))) for clause in problem.clauses})
+        packed = array('i', [problem.num_variables, len(problem.variables)])
+        for clause in clauses:
+            packed.extend(clause)
+            packed.append(0)
+
+        digest = hashlib.blake2b(packed.tobytes(), digest_size=20)
+        digest.update(_describe([solver, preprocess, decompose]).encode())
+        return digest.hexdigest()
+
+    def get(self, key: str, max_solutions: int = None) -> Optional[_Models]:
+        """Looks up the models of a formula.
+
+        Args:
+            key: The key of the formula.
+            max_solutions: Optional; Maximum number of models needed. All of them are needed if None.
+
+        Returns:
+            The cached models, or None if they are not cached or do not answer the search.
+        """
+        with self._lock:
+            blob = self._entries.get(key)
+            if blob is not None:
+                self._entries.move_to_end(key)
+            elif self._db is not None:
+                row = self._db.execute('SELECT models FROM results WHERE key = ?', (key,)).fetchone()
+                if row is not None:
+                    blob = row[0]
+                    self._store(key, blob)
+
+            if blob is not None:
+                models, complete = self._decode(blob)
+                if complete or (max_solutions is not None and len(models) >= max_solutions):
+                    self.hits += 1
+                    return models if max_solutions is None else models[:max_solutions]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, models: _Models, complete: bool):
+        """Caches the models of a formula.
+
+        Args:
+            key: The key of the formula.
+            models: The models found, as tuples of signed variable numbers.
+            complete: Whether these are all the models of the formula.
+        """
+        blob = self._encode(models, complete)
+        with self._lock:
+            self._store(key, blob)
+            if self._db is not None:
+                self._db.execute('INSERT OR REPLACE INTO results VALUES (?, ?)', (key, blob))
+                self._db.commit()
+
+    def clear(self):
+        """Removes all entries from memory, and resets the counters. The database is left as it is."""
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+            self.hits = self.misses = 0
+
+    def close(self):
+        """Closes the database, if any."""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def _store(self, key: str, blob: bytes):
+        """Keeps an entry in memory, evicting the least recently used entries as needed."""
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._size -= len(key) + len(old)
+
+        if len(key) + len(blob) > self.max_bytes:
+            return
+
+        self._entries[key] = blob
+        self._size += len(key) + len(blob)
+        while self._size > self.max_bytes:
+            evicted, evicted_blob = self._entries.popitem(last=False)
+            self._size -= len(evicted) + len(evicted_blob)
+
+    @staticmethod
+    def _encode(models: _Models, complete: bool) -> bytes:
+        """Packs models into bytes: a completeness flag, then the literals of each model terminated by 0."""
+        packed = array('i', [int(complete)])
+        for model in models:
+            packed.extend(model)
+            packed.append(0)
+
+        return packed.tobytes()
+
+    @staticmethod
+    def _decode(blob: bytes) -> Tuple[_Models, bool]:
+        """Unpacks models and their completeness flag from bytes."""
+        packed = array('i')
+        packed.frombytes(blob)
+
+        models = []
+        start = 1
+        while start < len(packed):
+            stop = packed.index(0, start)
+            models.append(tuple(packed[start:stop]))
+            start = stop + 1
+
+        return models, bool(packed[0])
@@ -0,0 +1,309 @@
+"""Implements a solver for SAT problems based on the CDCL algorithm.
+"""
+from copy import copy
+from typing import Dict, List
+
+from ..norm import CNF
+from ._solvers import SATSolver, SATSolution, _ClauseDatabase
+from .heuristics import BranchingHeuristic, VSIDS
+
+
+def _luby(i: int) -> int:
+    """Returns the i-th term (counting from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+
+    while i != (1 << k) - 1:
+        i -= (1 << (k - 1)) - 1
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+
+    return 1 << (k - 1)
+
+
+class CDCLSolver(SATSolver):
+    """Implements a CNF-SAT solver using the CDCL algorithm.
+
+    Conflict-driven clause learning (CDCL) extends DPLL by analysing every conflict found by unit propagation. The
+    conflict is traced back through the reasons of the assignments up to the first unique implication point (UIP),
+    and the clause learned from it is added to the formula. The search then jumps back non-chronologically to the
+    decision level at which the learned clause becomes unit.
+
+    Decisions are chosen by a branching heuristic, by default VSIDS, which is notified of all variables resolved in
+    conflict analysis. The search restarts after a number of conflicts
+    following the Luby sequence, and periodically deletes half of the learned clauses, ranked by their literal block
+    distance (LBD), i.e. the number of decision levels among their literals.
+
+    All models of a formula are found by blocking each model with a new clause once it has been found. Models are
+    first reduced to the literals needed to satisfy the clauses, so that each of them covers all assignments of
+    its unassigned variables. This is not possible if the CNF has auxiliary variables, whose models are blocked on
+    the original variables only.
+
+    Each search sets up its own copy of the heuristic, so the solver can be used for several searches at once.
+
+    Searches for a single model can share their short learned clauses with other searches of the same formula
+    through an exchange, as done by the PortfolioSolver. Learned units and binary clauses are sent as they are
+    learned, and the clauses sent by the other searches are added at every restart.
+
+    Attributes:
+        heuristic: The branching heuristic choosing the decisions.
+        restart_interval: Number of conflicts per unit of the Luby sequence between restarts.
+        max_learned: Initial number of learned clauses kept before deleting some of them.
+        exchange: Exchange of learned clauses with other searches, or None.
+    """
+    _GLUE = 2
+
+    def __init__(self, heuristic: BranchingHeuristic = None, restart_interval: int = 100, max_learned: int = 2000):
+        """Inits the solver.
+
+        Args:
+            heuristic: Optional; The branching heuristic choosing the decisions. Uses VSIDS if None.
+            restart_interval: Optional; Number of conflicts per unit of the Luby sequence between restarts.
+            max_learned: Optional; Initial number of learned clauses kept before deleting some of them.
+        """
+        self.heuristic = heuristic if heuristic is not None else VSIDS()
+        self.restart_interval = restart_interval
+        self.max_learned = max_learned
+        self.exchange = None
+
+    def _solve(self, problem: CNF, max_solutions: int = None) -> SATSolution:
+        """See base class."""
+        db = _ClauseDatabase(problem.clauses, problem.num_variables)
+        assignments = self._find_solutions(db, problem.name, len(problem.variables))
+        solution = SATSolution(problem, assignments, max_solutions)
+        return solution
+
+    def _find_solutions(self, db: _ClauseDatabase, names, num_original: int):
+        """Finds all models of the clauses.
+
+        Each model is blocked as soon as it has been yielded, and the search for the next one is only run when it is
+        requested. Learned clauses and heuristic scores are kept between models.
+
+        Args:
+            db: The clause database to search.
+            names: Function returning the name of a variable.
+            num_original: Number of variables of the original formula. The other variables are auxiliary.
+
+        Yields:
+            Satisfying assignments as truth values of named variables, or True if the clauses are satisfied
+            without assigning any variable.
+        """
+        db.use_heuristic(copy(self.heuristic))
+        if not db.assign_units():
+            return
+
+        # LBD of the learned clauses, by their identity
+        lbd = dict()
+
+        while self._search(db, lbd):
+            if num_original == db.num_variables:
+                model = self._reduce_model(db)
+            else:
+                model = [var if db.values[var] else -var for var in range(1, num_original + 1)
+                         if db.values[var] is not None]
+
+            yield {names(lit): lit > 0 for lit in model} or True
+
+            # Block the model, so that the next one differs from it
+            db.backtrack(0)
+            if db.add_clause([-lit for lit in model]) is not None:
+                return
+
+    def _search(self, db: _ClauseDatabase, lbd: Dict[int, int], assumptions: List[int] = ()) -> bool:
+        """Searches for a model of the clauses.
+
+        Assumptions are decided in order before any other decision, and are decided again after backjumps and
+        restarts undo them. The search fails as soon as an assumption is false, leaving the assignment in place.
+
+        Args:
+            db: The clause database to search.
+            lbd: The LBD of the learned clauses, by their identity.
+            assumptions: Optional; Literals which the model must make true.
+
+        Returns:
+            True if the assignment satisfies the clauses, False if the clauses are unsatisfiable (under the
+            assumptions).
+        """
+        restarts = 1
+        conflicts = 0
+        max_learned = self.max_learned + len(db.learned)
+
+        while True:
+            conflict = db.propagate()
+            if conflict is not None:
+                if db.level == 0:
+                    return False
+
+                learned, level, glue = self._analyze(db, conflict)
+                db.backtrack(level)
+                db.add_clause(learned, learned=True)
+                lbd[id(learned)] = glue
+                if self.exchange is not None and len(learned) <= 2:
+                    self.exchange.send(learned)
+
+                conflicts += 1
+                if conflicts >= self.restart_interval * _luby(restarts):
+                    db.backtrack(0)
+                    restarts += 1
+                    conflicts = 0
+                    if self.exchange is not None and not self._receive(db, lbd):
+                        return False
+
+                if len(db.learned) >= max_learned:
+                    self._reduce_learned(db, lbd)
+                    max_learned += max_learned // 10
+
+            else:
+                lit = None
+                for assumption in assumptions:
+                    if db.values[assumption] is False:
+                        return False
+                    elif db.values[assumption] is None:
+                        lit = assumption
+                        break
+
+                if lit is None:
+                    lit = db.heuristic.pick(db)
+                    if lit is None:
+                        return True
+
+                db.decide(lit)
+
+    def _receive(self, db: _ClauseDatabase, lbd: Dict[int, int]) -> bool:
+        """Adds the clauses sent by other searches through the exchange as learned clauses, at decision level 0.
+
+        Returns:
+            False if a clause is falsified by the assignment, i.e. the clauses are unsatisfiable, True otherwise.
+        """
+        for clause in self.exchange.receive():
+            clause = list(dict.fromkeys(clause))
+            if db.add_clause(clause, learned=True) is not None:
+                return False
+
+            lbd[id(clause)] = len(clause)
+
+        return True
+
+    def _analyze(self, db: _ClauseDatabase, conflict: List[int]):
+        """Derives a clause from a conflict by resolving it with reasons up to the first UIP.
+
+        Starting from the falsified clause, literals assigned at the current decision level are resolved away with
+        their reasons, in reverse trail order, until only one of them is left. This is the first unique
+        implication point: the negation of its literal is implied by the learned clause after backjumping.
+
+        Args:
+            db: The clause database with the conflict.
+            conflict: The clause falsified by the assignment.
+
+        Returns:
+            The learned clause with the asserting literal first and a literal of the backjump level second, the
+            level to backjump to, and the LBD of the clause.
+        """
+        seen = [False] * (db.num_variables + 1)
+        resolved = []
+        learned = [0]
+        pending = 0
+        idx = len(db.trail) - 1
+        clause, lit = conflict, None
+
+        while True:
+            for q in clause:
+                var = abs(q)
+                if q != lit and not seen[var] and db.levels[var] > 0:
+                    seen[var] = True
+                    resolved.append(var)
+                    if db.levels[var] == db.level:
+                        pending += 1
+                    else:
+                        learned.append(q)
+
+            # Resolve on the literal of the current level which was assigned last
+            while not seen[abs(db.trail[idx])]:
+                idx -= 1
+
+            lit = db.trail[idx]
+            idx -= 1
+            seen[abs(lit)] = False
+            pending -= 1
+            if pending == 0:
+                break
+
+            clause = db.reasons[abs(lit)]
+
+        learned[0] = -lit
+        db.heuristic.conflict(resolved)
+
+        # Drop literals implied by the other literals of the clause through their reasons
+        learned = learned[:1] + [q for q in learned[1:] if not self._is_redundant(db, q, seen)]
+
+        level = 0
+        if len(learned) > 1:
+            top = max(range(1, len(learned)), key=lambda i: db.levels[abs(learned[i])])
+            learned[1], learned[top] = learned[top], learned[1]
+            level = db.levels[abs(learned[1])]
+
+        lbd = len({db.levels[abs(q)] for q in learned})
+        return learned, level, lbd
+
+    @staticmethod
+    def _failed_assumptions(db: _ClauseDatabase, lit: int) -> List[int]:
+        """Finds the assumptions which make a false assumption false.
+
+        The assignments are traced back through their reasons from the assumption, in reverse trail order. The
+        decisions reached are the assumptions implying its negation, as assumptions are decided first.
+
+        Args:
+            db: The clause database, with the assumption false.
+            lit: The false assumption.
+
+        Returns:
+            The false assumption, followed by the assumptions implying its negation (if any).
+        """
+        seen = {abs(lit)}
+        failed = [lit]
+        for q in reversed(db.trail):
+            var = abs(q)
+            if var in seen and db.levels[var] > 0:
+                reason = db.reasons[var]
+                if reason is None:
+                    failed.append(q)
+                else:
+                    seen.update(abs(r) for r in reason[1:])
+
+        return failed
+
+    @staticmethod
+    def _is_redundant(db: _ClauseDatabase, lit: int, seen: List[bool]) -> bool:
+        """Checks if a literal of a learned clause is implied by its other literals through its reason."""
+        reason = db.reasons[abs(lit)]
+        if reason is None:
+            return False
+
+        return all(seen[abs(q)] or db.levels[abs(q)] == 0 for q in reason[1:])
+
+    def _reduce_learned(self, db: _ClauseDatabase, lbd: Dict[int, int]):
+        """Deletes the half of the learned clauses with the highest LBD.
+
+        Clauses with an LBD of at most 2 ('glue' clauses), and clauses which are the reason of an assignment are
+        always kept.
+        """
+        candidates = [clause for clause in db.learned
+                      if lbd[id(clause)] > self._GLUE and not db.is_locked(clause)]
+        candidates.sort(key=lambda clause: (lbd[id(clause)], len(clause)), reverse=True)
+        removed = candidates[:len(db.learned) // 2]
+        for clause in removed:
+            del lbd[id(clause)]
+
+        db.remove_learned(removed)
+
+    @staticmethod
+    def _reduce_model(db: _ClauseDatabase) -> List[int]:
+        """Reduces a model to the literals needed to satisfy every clause, in order of their variables."""
+        needed = set()
+        for clause in db.clauses:
+            if not any(lit in needed for lit in clause):
+                needed.add(next(lit for lit in clause if db.values[lit]))
+
+        return sorted(needed, key=abs)
@@ -0,0 +1,160 @@
+"""Implements exact model counting (#SAT) for CNF formulas.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+from ..norm import CNF, split_components
+from ..utils import fold
+
+_Clauses = FrozenSet[FrozenSet[int]]
+
+
+class ModelCounter:
+    """Counts the models of CNF formulas without enumerating them.
+
+    The counter is a DPLL-style search which branches on a variable and adds up the counts of both branches. Each
+    branch is simplified by unit propagation, and the variables which no longer occur in any clause are free: they
+    multiply the count of the branch by two each, instead of being assigned one by one.
+
+    The remaining clauses are split into connected components, i.e. groups of clauses which share no variables with
+    the other groups. Components are counted separately and their counts multiplied. The count of every component is
+    cached, since the same component is often reached again under different assignments of the other variables.
+
+    Models are counted over the variables of the original formula. With the 'distribute' and 'tseitin' encodings,
+    each model of the original formula extends to exactly one model of the clauses. This is not the case with the
+    'pg' encoding, so such formulas are counted on their Tseitin encoding instead.
+    """
+
+    def __init__(self):
+        """Inits the counter."""
+        self._cache: Dict[_Clauses, int] = dict()
+
+    def count(self, problem: CNF) -> int:
+        """Counts the models of a CNF formula.
+
+        Args:
+            problem: The CNF formula whose models to count.
+
+        Returns:
+            Number of assignments of the variables of the formula which satisfy it.
+        """
+        if problem.encoding == CNF.PG:
+            problem = CNF(problem.formula, CNF.TSEITIN)
+
+        clauses = frozenset(frozenset(clause) for clause in problem.clauses
+                            if len({abs(lit) for lit in clause}) == len(set(clause)))
+        free = problem.num_variables - len(self._variables(clauses))
+        count = self._count(clauses) << free
+
+        # The cache is only valid for one formula, as components are keyed by their clauses
+        self._cache.clear()
+        return count
+
+    def _count(self, clauses: _Clauses) -> int:
+        """Counts the assignments of the variables in the clauses which satisfy all of them.
+
+        The search is folded over the graph of clause sets without recursion, so that its depth is not limited by
+        the recursion limit. The children of a clause set are its components, whose counts are multiplied, or the
+        clauses left by both branches, whose counts are added up after weighting them by their free variables.
+        """
+        # Free variables of each branch of the clause sets which are branched on, None for those which are split
+        shifts: Dict[_Clauses, Optional[List[int]]] = dict()
+
+        def children(node: _Clauses) -> List[_Clauses]:
+            if len(node) == 0 or frozenset() in node:
+                return []
+
+            components = self._components(node)
+            if len(components) > 1:
+                shifts[node] = None
+                return components
+
+            var = self._pick_branching_variable(node)
+            num_variables = len(self._variables(node))
+            branches, shifts[node] = [], []
+            for lit in [var, -var]:
+                propagated = self._propagate(node, lit)
+                if propagated is not None:
+                    reduced, assigned = propagated
+                    branches.append(reduced)
+                    shifts[node].append(num_variables - assigned - len(self._variables(reduced)))
+
+            return branches
+
+        def combine(node: _Clauses, counts: List[int]) -> int:
+            if len(node) == 0:
+                return 1
+            elif frozenset() in node:
+                return 0
+
+            free = shifts.pop(node)
+            if free is None:
+                count = 1
+                for component_count in counts:
+                    count *= component_count
+
+                return count
+
+            return sum(count << shift for count, shift in zip(counts, free))
+
+        return fold(clauses, children, combine, self._cache)
+
+    @staticmethod
+    def _propagate(clauses: _Clauses, lit: int) -> Optional[Tuple[_Clauses, int]]:
+        """Assigns a literal and all literals it implies by unit propagation.
+
+        Returns:
+            The clauses simplified by the assignment, and the number of variables assigned, or None if the
+            assignment falsifies a clause.
+        """
+        assigned = {lit}
+        pending = [lit]
+        remaining = clauses
+        while len(pending) > 0:
+            lit = pending.pop()
+            reduced = []
+            for clause in remaining:
+                if lit in clause:
+                    continue
+
+                if -lit in clause:
+                    clause = clause - {-lit}
+                    if len(clause) == 0:
+                        return None
+
+                    if len(clause) == 1:
+                        unit = next(iter(clause))
+                        if -unit in assigned:
+                            return None
+
+                        if unit not in assigned:
+                            assigned.add(unit)
+                            pending.append(unit)
+
+                reduced.append(clause)
+
+            remaining = reduced
+
+        return frozenset(remaining), len(assigned)
+
+    @staticmethod
+    def _pick_branching_variable(clauses: _Clauses) -> int:
+        """Picks the variable of a unit clause, or else the variable occurring in most clauses."""
+        occurrences = dict()
+        for clause in clauses:
+            if len(clause) == 1:
+                return abs(next(iter(clause)))
+
+            for lit in clause:
+                occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+
+        return max(occurrences, key=lambda var: (occurrences[var], -var))
+
+    @staticmethod
+    def _variables(clauses: Iterable[FrozenSet[int]]) -> Set[int]:
+        """Returns the set of variables occurring in the clauses."""
+        return {abs(lit) for clause in clauses for lit in clause}
+
+    @staticmethod
+    def _components(clauses: _Clauses) -> List[_Clauses]:
+        """Splits clauses into groups which do not share any variables."""
+        return [frozenset(component) for component in split_components(clauses)]
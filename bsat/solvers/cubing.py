@@ -0,0 +1,385 @@
+"""Implements a cube-and-conquer solver, which splits the search space of a problem between worker processes.
+
+The search space is split into cubes, i.e. partial assignments of a few variables, chosen by a lookahead search.
+The cubes are handed out by a coordinator to workers, which solve the problem under each cube with another solver.
+Workers connect to the coordinator over TCP, so they may run on other hosts as well as on the local one.
+
+Messages are exchanged through 'multiprocessing.connection', which pickles them. Connections are authenticated
+with a shared key, and since unpickling data from an untrusted peer can run arbitrary code, the key must be kept
+secret, and the coordinator should only listen on trusted networks.
+
+    Typical usage example:
+
+    # On the coordinator host, with BSAT_AUTHKEY set to the same secret on every host
+    solver = CubeAndConquerSolver(processes=8, address=('0.0.0.0', 6000), authkey=b'secret')
+    solver.solve(CNF.from_dimacs('hard.cnf'), max_solutions=1)
+
+    # On each other host
+    run_worker(('coordinator', 6000), authkey=b'secret')
+"""
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from multiprocessing.connection import Client, Connection, Listener, wait
+from queue import Empty, Queue
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from ..norm import CNF
+from ._solvers import SATSolver, SATSolution, _ClauseDatabase
+from .cdcl import CDCLSolver
+
+_Address = Tuple[str, int]
+
+
+class CubeAndConquerSolver(SATSolver):
+    """Implements a CNF-SAT solver splitting the search space into cubes solved in parallel.
+
+    Cubes are the leaves of a search tree built by lookahead, up to a given number of decisions. At every node, each
+    candidate variable is tried both ways, and the variable whose two branches assign the most variables by unit
+    propagation (in product) is decided. A literal whose branch leads to a conflict is failed, and its negation is
+    added to the cube instead. Branches refuted this way are not cubes, and branches whose clauses are all satisfied
+    are models already. The cubes partition the remaining search space.
+
+    The cubes are then solved by workers, which connect to the coordinator run by the solver. Local worker
+    processes are started by the solver itself, and workers on other hosts run 'run_worker' with the address of the
+    coordinator. Each worker receives the problem once, then solves one cube at a time, and the models found are
+    yielded as cubes finish, in no particular order. The search stops as soon as the requested number of models is
+    found: local workers are terminated, and remote workers stop after their current cube. Cubes of workers which
+    disconnect are handed out again.
+
+    Models include the literals of their cube, so the models of different cubes are disjoint. Their variables are
+    listed in order, so that models which only differ in auxiliary variables are equal once projected.
+
+    Attributes:
+        solver: The solver conquering each cube.
+        processes: Number of local worker processes.
+        depth: Number of decisions in each cube, or None to choose it from the number of local processes.
+        max_candidates: Maximum number of variables tried at each node of the lookahead.
+        address: Host and port on which the coordinator accepts workers, or None to only accept local workers.
+        authkey: Key authenticating workers, or None to use a random key, which only local workers know.
+        worker_timeout: Number of seconds to wait with no worker connected before giving up.
+    """
+    _POLL_INTERVAL = 0.1
+    _STOP_TIMEOUT = 1
+
+    def __init__(self, solver: SATSolver = None, processes: int = None, depth: int = None, max_candidates: int = 32,
+                 address: _Address = None, authkey: bytes = None, worker_timeout: float = 60):
+        """Inits the solver.
+
+        Args:
+            solver: Optional; The solver conquering each cube. Uses a CDCLSolver if None.
+            processes: Optional; Number of local worker processes. Uses the number of CPUs if None.
+            depth: Optional; Number of decisions in each cube. Chosen so that there are about 8 times as many cubes
+                as local processes if None.
+            max_candidates: Optional; Maximum number of variables tried at each node of the lookahead.
+            address: Optional; Host and port on which the coordinator accepts workers. Only local workers are
+                accepted, on a free port, if None.
+            authkey: Optional; Key authenticating workers. Required for workers on other hosts; a random key is
+                used if None.
+            worker_timeout: Optional; Number of seconds to wait with no worker connected before giving up, e.g.
+                when all local workers stopped and no worker from another host connects.
+
+        Raises:
+            ValueError: If there would be no worker, or workers on other hosts have no key.
+        """
+        if processes is None:
+            processes = os.cpu_count() or 1
+        if processes < 1 and address is None:
+            raise ValueError('Cube-and-conquer needs local processes, or an address for other workers')
+        if address is not None and authkey is None:
+            raise ValueError('Workers on other hosts need an authentication key')
+
+        self.solver = solver if solver is not None else CDCLSolver()
+        self.processes = processes
+        self.depth = depth
+        self.max_candidates = max_candidates
+        self.address = address
+        self.authkey = authkey
+        self.worker_timeout = worker_timeout
+
+    def _solve(self, problem: CNF, max_solutions: int = None) -> SATSolution:
+        """See base class."""
+        return SATSolution(problem, self._conquer(problem, max_solutions), max_solutions)
+
+    def cubes(self, problem: CNF) -> List[Dict[str, bool]]:
+        """Splits the search space of a CNF formula into cubes.
+
+        Args:
+            problem: The CNF formula to split.
+
+        Returns:
+            The cubes, as truth values of named variables. Branches whose clauses are all satisfied are included as
+            cubes as well.
+        """
+        cubes, models = self._make_cubes(problem)
+        return [{problem.name(lit): lit > 0 for lit in cube} for cube in cubes] + models
+
+    def _make_cubes(self, problem: CNF) -> Tuple[List[List[int]], List[Any]]:
+        """Builds the cubes of a CNF formula by lookahead.
+
+        Returns:
+            The cubes as lists of literals, and the truth values of the branches whose clauses are all satisfied.
+        """
+        db = _ClauseDatabase(problem.clauses, problem.num_variables)
+        if not db.assign_units() or db.propagate() is not None:
+            return [], []
+
+        depth = self.depth if self.depth is not None else max(1, self.processes).bit_length() + 2
+
+        order = _variable_order(problem)
+
+        # Nodes as their literals and number of decisions, replayed from the root as they are visited
+        nodes = [([], 0)]
+        cubes, models = [], []
+        while len(nodes) > 0:
+            cube, decisions = nodes.pop()
+            if not self._replay(db, cube):
+                continue
+
+            if db.next_unsatisfied() == len(db.clauses):
+                models.append(_in_order(db.bindings(problem.name), order) or True)
+                continue
+
+            if decisions == depth:
+                cubes.append(cube)
+                continue
+
+            lit, failed = self._lookahead(db)
+            if failed:
+                if lit is not None:
+                    nodes.append((cube + [lit], decisions))
+            else:
+                nodes.append((cube + [-lit], decisions + 1))
+                nodes.append((cube + [lit], decisions + 1))
+
+        return cubes, models
+
+    @staticmethod
+    def _replay(db: _ClauseDatabase, cube: List[int]) -> bool:
+        """Assigns the literals of a cube from decision level 0, each followed by unit propagation.
+
+        Returns:
+            False if the cube is refuted, True otherwise.
+        """
+        db.backtrack(0)
+        for lit in cube:
+            if db.values[lit] is False:
+                return False
+            elif db.values[lit] is None:
+                db.decide(lit)
+                if db.propagate() is not None:
+                    return False
+
+        return True
+
+    def _lookahead(self, db: _ClauseDatabase) -> Tuple[Optional[int], bool]:
+        """Chooses the literal to branch on, trying both values of the candidate variables.
+
+        Candidates are the variables occurring most often in the unsatisfied clauses. Each value of a candidate is
+        scored by the number of variables it assigns by unit propagation.
+
+        Returns:
+            The literal of the best variable, and False; or a literal implied by a failed literal and True; or None
+            and True if both values of a variable are failed literals, i.e. the node is refuted.
+        """
+        occurrences: Dict[int, int] = dict()
+        for clause in db.clauses:
+            if not db.is_satisfied(clause):
+                for lit in clause:
+                    if db.values[lit] is None:
+                        occurrences[abs(lit)] = occurrences.get(abs(lit), 0) + 1
+
+        candidates = sorted(occurrences, key=lambda var: (-occurrences[var], var))[:self.max_candidates]
+        best, best_score = None, -1
+        for var in candidates:
+            counts = []
+            for lit in [var, -var]:
+                size = len(db.trail)
+                db.decide(lit)
+                conflict = db.propagate()
+                counts.append(None if conflict is not None else len(db.trail) - size)
+                db.backtrack(db.level - 1)
+
+            if counts[0] is None and counts[1] is None:
+                return None, True
+            elif counts[0] is None or counts[1] is None:
+                return (-var if counts[0] is None else var), True
+
+            score = counts[0] * counts[1]
+            if score > best_score:
+                best = var if counts[0] >= counts[1] else -var
+                best_score = score
+
+        return best, False
+
+    def _conquer(self, problem: CNF, max_solutions: int = None) -> Iterator[Any]:
+        """Solves the cubes of a CNF formula with the workers, and yields the models found as cubes finish.
+
+        Args:
+            problem: The CNF formula to solve.
+            max_solutions: Optional; Maximum number of models to find. All of them are found if None.
+
+        Yields:
+            The truth values of each model, or True if a model assigns no variable.
+        """
+        cubes, models = self._make_cubes(problem)
+        for truth in models[:max_solutions]:
+            yield truth
+
+        found = len(models)
+        if len(cubes) == 0 or (max_solutions is not None and found >= max_solutions):
+            return
+
+        authkey = self.authkey if self.authkey is not None else os.urandom(32)
+        listener = Listener(self.address if self.address is not None else ('localhost', 0), authkey=authkey)
+        accepted: Queue = Queue()
+        stopping = threading.Event()
+        acceptor = threading.Thread(target=_accept, args=(listener, accepted, stopping), daemon=True)
+        acceptor.start()
+
+        processes = [multiprocessing.Process(target=run_worker, args=(listener.address, authkey), daemon=True)
+                     for _ in range(self.processes)]
+        for process in processes:
+            process.start()
+
+        problem_message = ('problem', self.solver, [tuple(clause) for clause in problem.clauses], problem.variables,
+                           problem.num_variables, max_solutions)
+        pending = list(reversed(range(len(cubes))))
+        idle: List[Connection] = []
+        busy: Dict[Connection, int] = dict()
+        connected = time.monotonic()
+        try:
+            while len(pending) > 0 or len(busy) > 0:
+                while not accepted.empty():
+                    conn = accepted.get()
+                    if _send(conn, problem_message):
+                        idle.append(conn)
+
+                while len(pending) > 0 and len(idle) > 0:
+                    conn = idle.pop()
+                    if _send(conn, ('cube', pending[-1], cubes[pending[-1]])):
+                        busy[conn] = pending.pop()
+
+                for conn in wait(list(busy), timeout=self._POLL_INTERVAL) if len(busy) > 0 else ():
+                    idx = busy.pop(conn)
+                    try:
+                        _, _, truths = conn.recv()
+                    except (EOFError, OSError):
+                        # The worker disconnected, and its cube is handed out again
+                        pending.append(idx)
+                        conn.close()
+                        continue
+
+                    idle.append(conn)
+                    for truth in truths:
+                        yield truth
+                        found += 1
+                        if max_solutions is not None and found >= max_solutions:
+                            return
+
+                if len(busy) > 0 or len(idle) > 0 or not accepted.empty():
+                    connected = time.monotonic()
+                    continue
+
+                if not any(process.is_alive() for process in processes) and self.address is None:
+                    raise RuntimeError('All cube-and-conquer workers stopped')
+                elif time.monotonic() - connected > self.worker_timeout:
+                    raise RuntimeError(f'No cube-and-conquer worker connected for {self.worker_timeout} seconds')
+
+                time.sleep(self._POLL_INTERVAL)
+
+        finally:
+            for conn in idle + list(busy):
+                _send(conn, ('stop',))
+                conn.close()
+
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+            # Wakes up the thread accepting workers, which is left behind if it does not stop in time
+            stopping.set()
+            try:
+                socket.create_connection(listener.address, timeout=self._STOP_TIMEOUT).close()
+            except OSError:
+                pass
+            acceptor.join(self._STOP_TIMEOUT)
+            listener.close()
+
+
+def _accept(listener: Listener, accepted: Queue, stopping: threading.Event):
+    """Accepts the connections of workers until stopped."""
+    while not stopping.is_set():
+        try:
+            conn = listener.accept()
+        except (EOFError, OSError, multiprocessing.AuthenticationError):
+            continue
+
+        if stopping.is_set():
+            conn.close()
+        else:
+            accepted.put(conn)
+
+
+def _variable_order(problem: CNF) -> Dict[str, int]:
+    """Returns the number of each variable of a CNF formula, including the auxiliary ones, by name."""
+    return {problem.name(var): var for var in range(1, problem.num_variables + 1)}
+
+
+def _in_order(truth: Dict[str, bool], order: Dict[str, int]) -> Dict[str, bool]:
+    """Lists the truth values of a model by variable number, whichever cube the model was found in."""
+    return dict(sorted(truth.items(), key=lambda item: order[item[0]]))
+
+
+def _send(conn: Connection, message: Tuple) -> bool:
+    """Sends a message to a worker, and returns False if the worker disconnected."""
+    try:
+        conn.send(message)
+        return True
+    except OSError:
+        conn.close()
+        return False
+
+
+def run_worker(address: _Address, authkey: bytes, timeout: float = 60):
+    """Runs a cube-and-conquer worker, which solves the cubes handed out by a coordinator until it is stopped.
+
+    Args:
+        address: Host and port of the coordinator.
+        authkey: Key authenticating the worker.
+        timeout: Optional; Number of seconds to keep trying to connect to the coordinator.
+
+    Raises:
+        ConnectionError: If the coordinator cannot be reached before the timeout.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            conn = Client(address, authkey=authkey)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.5)
+
+    with conn:
+        try:
+            _, solver, clauses, variables, num_variables, max_solutions = conn.recv()
+            order = _variable_order(CNF.from_clauses([], variables, num_variables))
+            while True:
+                message = conn.recv()
+                if message[0] == 'stop':
+                    return
+
+                _, idx, cube = message
+                problem = CNF.from_clauses(clauses + [(lit,) for lit in cube], variables, num_variables)
+                bindings = {problem.name(lit): lit > 0 for lit in cube}
+                truths = [_in_order({**bindings, **assignment._truth}, order) if isinstance(assignment._truth, dict)
+                          else _in_order(bindings, order) for assignment in solver._solve(problem, max_solutions)]
+                conn.send(('models', idx, [truth or True for truth in truths]))
+
+        except (EOFError, OSError):
+            return
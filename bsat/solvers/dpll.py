@@ -1,7 +1,10 @@
 """Implements a solver for SAT problems based the DPLL algorithm.
 """
+from copy import copy
+
 from ..norm import CNF
-from ._solvers import SATSolver, SATSolution
+from ._solvers import SATSolver, SATSolution, _ClauseDatabase
+from .heuristics import BranchingHeuristic
 
 
 class DPLLSolver(SATSolver):
@@ -10,63 +13,111 @@ class DPLLSolver(SATSolver):
     The Davis–Putnam–Logemann–Loveland (DPLL) algorithm is a complete, backtracking-based search algorithm for deciding
     the satisfiability of propositional logic formulae in conjunctive normal form. This algorithm is implemented here
     to solve the CNF-SAT problems.
+
+    The search works on the integer clauses of the CNF, held in a clause database with an assignment trail. Each
+    decision is followed by unit propagation over two watched literals per clause, so it only visits the clauses
+    watching a literal that became false, and backtracking only unassigns literals from the trail.
+
+    By default, the search branches on the first unassigned variable of the first unsatisfied clause, trying True
+    before False. A branching heuristic can be plugged in to choose the decisions instead.
+
+    Each search sets up its own copy of the heuristic, so the solver can be used for several searches at once.
+
+    Attributes:
+        heuristic: The branching heuristic choosing the decisions, or None.
     """
 
-    def _solve(self, problem: CNF) -> SATSolution:
+    def __init__(self, heuristic: BranchingHeuristic = None):
+        """Inits the solver.
+
+        Args:
+            heuristic: Optional; The branching heuristic choosing the decisions.
+        """
+        self.heuristic = heuristic
+
+    def _solve(self, problem: CNF, max_solutions: int = None) -> SATSolution:
         """See base class."""
-        parse_tree = problem.parse_tree
-        assignments = list(self._find_solutions(parse_tree, dict()))
-        solution = SATSolution(problem, assignments)
+        db = _ClauseDatabase(problem.clauses, problem.num_variables)
+        assignments = self._find_solutions(db, problem.name, max_solutions)
+        solution = SATSolution(problem, assignments, max_solutions)
         return solution
 
-    def _find_solutions(self, F, bindings):
-        F = self.__minimize(F, bindings)
+    def _find_solutions(self, db: _ClauseDatabase, names, limit: int = None):
+        """Finds partial assignments which satisfy the clauses.
 
-        if F is True:
-            yield bindings or F
-            return
-        elif F is False:
+        Unit clauses are assigned first, and every assignment is followed by unit propagation. The search then
+        branches on the literal chosen by the heuristic, trying it before its negation. An assignment is yielded as
+        soon as it satisfies all clauses, so the variables it leaves unassigned can take any value.
+
+        The search is resumed from the last decision each time the next assignment is requested, so the partial
+        assignments found are disjoint and no part of the search space is visited twice.
+
+        If only one assignment is needed, pure literals are eliminated before searching. This keeps the clauses
+        satisfiable, but discards the models in which the pure literals are false.
+
+        Args:
+            db: The clause database to search.
+            names: Function returning the name of a variable.
+            limit: Optional; Maximum number of assignments needed. All assignments can be found if None.
+
+        Yields:
+            Satisfying assignments as truth values of named variables, or True if the clauses are satisfied
+            without assigning any variable.
+        """
+        db.use_heuristic(copy(self.heuristic))
+        if not db.assign_units() or db.propagate() is not None:
             return
 
-        L = self.__next_unbound(F)
-
-        bindings1 = bindings.copy()
-        bindings1[L] = True
-        for sat in self._find_solutions(F, bindings1):
-            yield sat
-
-        bindings2 = bindings.copy()
-        bindings2[L] = False
-        for sat in self._find_solutions(F, bindings2):
-            yield sat
-
-    def __minimize(self, F, bindings, infer=True):
-        if isinstance(F, list):
-            fn = F[0]
-            args = [self.__minimize(a, bindings, infer) for a in F[1:]]
-            r = fn(*args)
-            if r is not None and infer:
-                return r
-            else:
-                return [fn] + args
-        elif isinstance(F, str) and F in bindings:
-            return bindings[F]
-        else:
-            return F
-
-    def __yield_unbounds(self, F):
-        all_unbounds = []
-        if isinstance(F, list):
-            for arg in F[1:]:
-                for unbound in self.__yield_unbounds(arg):
-                    if unbound not in all_unbounds:
-                        all_unbounds.append(unbound)
-                        yield unbound
-        elif isinstance(F, str):
-            all_unbounds.append(F)
-            yield F
-
-    def __next_unbound(self, F):
-        for unbound in self.__yield_unbounds(F):
-            return unbound
-        raise StopIteration
+        if limit == 1:
+            db.eliminate_pure_literals()
+            db.propagate()
+
+        # Decisions as (first unsatisfied clause, literal, both values tried), one per decision level
+        decisions = []
+        cursor = 0
+        consistent = True
+
+        while True:
+            if consistent:
+                cursor = db.next_unsatisfied(cursor)
+                if cursor == len(db.clauses):
+                    yield db.bindings(names) or True
+                    consistent = False
+
+                else:
+                    lit = db.heuristic.pick(db) if db.heuristic is not None else None
+                    if lit is None:
+                        lit = next(abs(lit) for lit in db.clauses[cursor] if db.values[lit] is None)
+
+                    decisions.append((cursor, lit, False))
+                    db.decide(lit)
+                    consistent = self._propagate(db)
+                    continue
+
+            # Backtrack to the most recent decision whose other value has not been tried yet
+            while len(decisions) > 0 and decisions[-1][2]:
+                decisions.pop()
+
+            if len(decisions) == 0:
+                return
+
+            cursor, lit, _ = decisions.pop()
+            db.backtrack(len(decisions))
+            decisions.append((cursor, -lit, True))
+            db.decide(-lit)
+            consistent = self._propagate(db)
+
+    def _propagate(self, db: _ClauseDatabase) -> bool:
+        """Propagates the assignment, and notifies the heuristic of the variables of a conflict.
+
+        Returns:
+            False if the assignment falsifies a clause, True otherwise.
+        """
+        conflict = db.propagate()
+        if conflict is None:
+            return True
+
+        if db.heuristic is not None:
+            db.heuristic.conflict([abs(lit) for lit in conflict])
+
+        return False
@@ -0,0 +1,543 @@
+"""Implements branching heuristics, which choose the decisions of a SAT solver.
+
+A heuristic is plugged into a solver when it is created, and is set up on the clause database of each problem the
+solver searches. The database then notifies the heuristic of every assigned and unassigned literal and every added
+clause, so that the heuristic can keep its scores up to date incrementally instead of rescanning the formula on
+every decision.
+
+    Typical usage example:
+
+    solver = CDCLSolver(heuristic=VSIDS(decay=0.9))
+    solver = DPLLSolver(heuristic=JeroslowWang())
+"""
+import random
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional
+
+
+class BranchingHeuristic(ABC):
+    """Defines an interface for heuristics choosing the next decision of a SAT solver."""
+
+    def setup(self, db):
+        """Resets the heuristic for a new clause database, with its current assignment.
+
+        Args:
+            db: The clause database the solver searches.
+        """
+        pass
+
+    def assigned(self, lit: int):
+        """Notifies the heuristic that a literal was made true.
+
+        Args:
+            lit: The assigned literal.
+        """
+        pass
+
+    def unassigned(self, lit: int):
+        """Notifies the heuristic that a literal is no longer assigned.
+
+        Args:
+            lit: The literal which was true before.
+        """
+        pass
+
+    def added(self, clause: List[int]):
+        """Notifies the heuristic that a clause was added to the formula.
+
+        Learned clauses are implied by the formula, and are not added through this notification.
+
+        Args:
+            clause: The added clause.
+        """
+        pass
+
+    def extended(self, db, num_variables: int):
+        """Notifies the heuristic that variables were added to the clause database.
+
+        The heuristic is set up again for the database by default.
+
+        Args:
+            db: The clause database the solver searches.
+            num_variables: Number of variables before the new ones were added.
+        """
+        self.setup(db)
+
+    def conflict(self, variables: Iterable[int]):
+        """Notifies the heuristic of the variables involved in a conflict.
+
+        Args:
+            variables: The variables of the falsified clause, or all the variables resolved in conflict analysis.
+        """
+        pass
+
+    @abstractmethod
+    def pick(self, db) -> Optional[int]:
+        """Chooses the next decision.
+
+        Args:
+            db: The clause database the solver searches.
+
+        Returns:
+            The literal to make true, or None if there is no unassigned variable left to decide (or, for heuristics
+            scoring clauses, if all clauses are satisfied).
+        """
+        pass
+
+
+class _Heap:
+    """Binary max-heap of integer keys ordered by their scores, which supports updating the score of any key.
+
+    Keys are variables or literals, and both the scores and the positions of the keys in the heap are lists indexed
+    by the key itself (so negative literals index from the end of the lists). Ties are broken in favour of the key
+    of the lower variable.
+    """
+
+    def __init__(self, scores: List, size: int):
+        """Inits an empty heap.
+
+        Args:
+            scores: Score of each key. The heap must be updated whenever a score changes.
+            size: Length of the score list.
+        """
+        self._scores = scores
+        self._heap: List[int] = []
+        self._positions = [-1] * size
+
+    def __len__(self) -> int:
+        """Number of keys in the heap."""
+        return len(self._heap)
+
+    def __contains__(self, key: int) -> bool:
+        """Checks if a key is in the heap."""
+        return self._positions[key] >= 0
+
+    def _before(self, a: int, b: int) -> bool:
+        """Checks if a key comes before another one in the heap."""
+        score_a, score_b = self._scores[a], self._scores[b]
+        return score_a > score_b or (score_a == score_b and (abs(a), -a) < (abs(b), -b))
+
+    def top(self) -> int:
+        """Returns the key with the highest score."""
+        return self._heap[0]
+
+    def push(self, key: int):
+        """Adds a key to the heap, if it is not in the heap already."""
+        if self._positions[key] < 0:
+            self._heap.append(key)
+            self._positions[key] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+
+    def pop(self) -> int:
+        """Removes and returns the key with the highest score."""
+        key = self._heap[0]
+        self.remove(key)
+        return key
+
+    def remove(self, key: int):
+        """Removes a key from the heap, if it is in the heap."""
+        pos = self._positions[key]
+        if pos < 0:
+            return
+
+        last = self._heap.pop()
+        self._positions[key] = -1
+        if pos < len(self._heap):
+            self._heap[pos] = last
+            self._positions[last] = pos
+            self.update(last)
+
+    def update(self, key: int):
+        """Restores the order of the heap after the score of a key changed."""
+        pos = self._positions[key]
+        if pos >= 0:
+            self._sift_down(self._sift_up(pos))
+
+    def _sift_up(self, pos: int) -> int:
+        """Moves a key up the heap until its parent comes before it, and returns its new position."""
+        heap, positions = self._heap, self._positions
+        key = heap[pos]
+        while pos > 0:
+            parent = (pos - 1) >> 1
+            if not self._before(key, heap[parent]):
+                break
+
+            heap[pos] = heap[parent]
+            positions[heap[pos]] = pos
+            pos = parent
+
+        heap[pos] = key
+        positions[key] = pos
+        return pos
+
+    def _sift_down(self, pos: int):
+        """Moves a key down the heap until it comes before its children."""
+        heap, positions = self._heap, self._positions
+        key = heap[pos]
+        while True:
+            child = 2 * pos + 1
+            if child >= len(heap):
+                break
+
+            if child + 1 < len(heap) and self._before(heap[child + 1], heap[child]):
+                child += 1
+
+            if not self._before(heap[child], key):
+                break
+
+            heap[pos] = heap[child]
+            positions[heap[pos]] = pos
+            pos = child
+
+        heap[pos] = key
+        positions[key] = pos
+
+
+class VSIDS(BranchingHeuristic):
+    """Variable State Independent Decaying Sum heuristic.
+
+    Every variable has an activity, which is increased ('bumped') whenever the variable is involved in a conflict.
+    The activities of all variables decay after every conflict, by increasing the amount later bumps add instead.
+    Decisions pick the unassigned variable with the highest activity from a binary heap, and give it the value it
+    had when it was last assigned (phase saving).
+
+    Variables start with no activity, so the first decisions follow the order of the variables, unless a seed is
+    given: the variables then start with small random activities, which only order the decisions until the first
+    conflicts. Solvers with different seeds search in different orders.
+
+    Attributes:
+        decay: Factor by which activities decay after each conflict.
+        seed: Seed of the random initial activities, or None.
+    """
+    _RESCALE = 1e100
+
+    def __init__(self, decay: float = 0.95, seed: int = None):
+        """Inits the heuristic.
+
+        Args:
+            decay: Optional; Factor by which activities decay after each conflict.
+            seed: Optional; Seed of the random initial activities. Variables start with no activity if None.
+        """
+        self.decay = decay
+        self.seed = seed
+
+    def setup(self, db):
+        """See base class."""
+        self._activity = [0.0] * (db.num_variables + 1)
+        if self.seed is not None:
+            rng = random.Random(self.seed)
+            self._activity = [rng.random() * 1e-5 for _ in range(db.num_variables + 1)]
+        self._increment = 1.0
+        self._heap = _Heap(self._activity, db.num_variables + 1)
+        for var in range(1, db.num_variables + 1):
+            self._heap.push(var)
+
+    def extended(self, db, num_variables: int):
+        """See base class.
+
+        Activities of the existing variables are kept, and the new variables start with no activity."""
+        self._activity.extend([0.0] * (db.num_variables - num_variables))
+        self._heap = _Heap(self._activity, db.num_variables + 1)
+        for var in range(1, db.num_variables + 1):
+            if db.values[var] is None:
+                self._heap.push(var)
+
+    def unassigned(self, lit: int):
+        """See base class."""
+        self._heap.push(abs(lit))
+
+    def conflict(self, variables: Iterable[int]):
+        """See base class."""
+        for var in variables:
+            self._activity[var] += self._increment
+            if self._activity[var] > self._RESCALE:
+                for v in range(len(self._activity)):
+                    self._activity[v] /= self._RESCALE
+                self._increment /= self._RESCALE
+
+            self._heap.update(var)
+
+        self._increment /= self.decay
+
+    def pick(self, db) -> Optional[int]:
+        """See base class."""
+        while len(self._heap) > 0:
+            var = self._heap.top()
+            if db.values[var] is None:
+                return var if db.phases[var] else -var
+
+            self._heap.pop()
+
+        return None
+
+
+class _ClauseHeuristic(BranchingHeuristic, ABC):
+    """Base class of heuristics scoring literals by the clauses they satisfy.
+
+    Keeps occurrence lists and the number of true literals of every clause of the formula (but not of learned
+    clauses), so that clauses becoming satisfied or unsatisfied are known on every assignment. Tautological
+    clauses are always satisfied, and are ignored.
+    """
+
+    def setup(self, db):
+        """See base class."""
+        self._values = db.values
+        self._clauses: List[List[int]] = []
+        self._true: List[int] = []
+        self._occurrences: List[List[int]] = [[] for _ in range(2 * db.num_variables + 1)]
+        for clause in db.clauses:
+            self.added(clause)
+
+    @staticmethod
+    def _is_tautology(clause: List[int]) -> bool:
+        """Checks if a clause contains both literals of a variable."""
+        return len({abs(lit) for lit in clause}) < len(set(clause))
+
+    def added(self, clause: List[int]):
+        """See base class."""
+        if self._is_tautology(clause):
+            return
+
+        idx = len(self._clauses)
+        self._clauses.append(clause)
+        self._true.append(sum(1 for lit in clause if self._values[lit]))
+        for lit in clause:
+            self._occurrences[lit].append(idx)
+
+        if self._true[idx] == 0:
+            self._clause_unsatisfied(idx)
+
+    def assigned(self, lit: int):
+        """See base class."""
+        for idx in self._occurrences[lit]:
+            self._true[idx] += 1
+            if self._true[idx] == 1:
+                self._clause_satisfied(idx, lit)
+
+    def unassigned(self, lit: int):
+        """See base class."""
+        for idx in self._occurrences[lit]:
+            self._true[idx] -= 1
+            if self._true[idx] == 0:
+                self._clause_unsatisfied(idx)
+
+    @abstractmethod
+    def _clause_satisfied(self, idx: int, lit: int):
+        """Removes the contribution of a clause which became satisfied by a literal."""
+        pass
+
+    @abstractmethod
+    def _clause_unsatisfied(self, idx: int):
+        """Adds the contribution of a clause which is not satisfied (any more)."""
+        pass
+
+
+class _LiteralScoreHeuristic(_ClauseHeuristic, ABC):
+    """Base class of heuristics picking the unassigned literal with the highest sum of clause weights.
+
+    A literal scores the weights of the unsatisfied clauses it occurs in. Scores are kept in a binary heap of the
+    unassigned literals, updated whenever a clause becomes satisfied or unsatisfied.
+    """
+
+    def setup(self, db):
+        """See base class."""
+        self._scores = [0] * (2 * db.num_variables + 1)
+        self._heap = _Heap(self._scores, 2 * db.num_variables + 1)
+        _ClauseHeuristic.setup(self, db)
+        for var in range(1, db.num_variables + 1):
+            if db.values[var] is None:
+                self._heap.push(var)
+                self._heap.push(-var)
+
+    @abstractmethod
+    def _weight(self, clause: List[int]) -> int:
+        """Returns the weight of a clause."""
+        pass
+
+    def _clause_satisfied(self, idx: int, lit: int):
+        """See base class."""
+        clause = self._clauses[idx]
+        weight = self._weight(clause)
+        for q in clause:
+            self._scores[q] -= weight
+            self._heap.update(q)
+
+    def _clause_unsatisfied(self, idx: int):
+        """See base class."""
+        clause = self._clauses[idx]
+        weight = self._weight(clause)
+        for q in clause:
+            self._scores[q] += weight
+            self._heap.update(q)
+
+    def assigned(self, lit: int):
+        """See base class."""
+        self._heap.remove(lit)
+        self._heap.remove(-lit)
+        _ClauseHeuristic.assigned(self, lit)
+
+    def unassigned(self, lit: int):
+        """See base class."""
+        _ClauseHeuristic.unassigned(self, lit)
+        self._heap.push(lit)
+        self._heap.push(-lit)
+
+    def pick(self, db) -> Optional[int]:
+        """See base class."""
+        if len(self._heap) == 0 or self._scores[self._heap.top()] <= 0:
+            return None
+
+        return self._heap.top()
+
+
+class DLIS(_LiteralScoreHeuristic):
+    """Dynamic Largest Individual Sum heuristic.
+
+    Decisions pick the unassigned literal which occurs in the most unsatisfied clauses, and make it true.
+    """
+
+    def _weight(self, clause: List[int]) -> int:
+        """See base class."""
+        return 1
+
+
+class JeroslowWang(_LiteralScoreHeuristic):
+    """Jeroslow-Wang heuristic.
+
+    Decisions pick the unassigned literal with the highest sum of 2^-|C| over the unsatisfied clauses C it occurs
+    in, which favours literals of short clauses, and make it true. Weights are scaled to exact integers, and
+    clauses longer than 'max_length' literals are weighted like clauses of that length.
+
+    Attributes:
+        max_length: Length of clauses from which on all clauses have the same weight.
+    """
+
+    def __init__(self, max_length: int = 32):
+        """Inits the heuristic.
+
+        Args:
+            max_length: Optional; Length of clauses from which on all clauses have the same weight.
+        """
+        self.max_length = max_length
+
+    def _weight(self, clause: List[int]) -> int:
+        """See base class."""
+        return 1 << max(0, self.max_length - len(clause))
+
+
+class MOMs(_ClauseHeuristic):
+    """Maximum Occurrences in clauses of Minimum Size heuristic.
+
+    Only the shortest unsatisfied clauses are considered, counting only their unassigned literals. Decisions pick
+    the variable x maximizing (f(x) + f(~x)) * 2^k + f(x) * f(~x), where f(l) is the number of these clauses the
+    literal l occurs in, and make its more frequent literal true.
+
+    For every size, the number of unsatisfied clauses of that size and the number of their occurrences of each
+    unassigned literal are kept up to date as clauses become satisfied or lose literals, so a decision only looks
+    at the literals of the shortest clauses.
+
+    Attributes:
+        k: Weight given to the total number of occurrences of a variable over balanced occurrences.
+    """
+
+    def __init__(self, k: int = 4):
+        """Inits the heuristic.
+
+        Args:
+            k: Optional; Weight given to the total number of occurrences of a variable over balanced occurrences.
+        """
+        self.k = k
+
+    def setup(self, db):
+        """See base class."""
+        # Number of false literals of each clause, and for each size (number of unassigned literals), the number
+        # of unsatisfied clauses of that size and the occurrences of literals in them
+        self._false: List[int] = []
+        self._false_occurrences: List[List[int]] = [[] for _ in range(2 * db.num_variables + 1)]
+        self._sizes: Dict[int, int] = dict()
+        self._counts: Dict[int, Dict[int, int]] = dict()
+        _ClauseHeuristic.setup(self, db)
+
+    def added(self, clause: List[int]):
+        """See base class."""
+        if self._is_tautology(clause):
+            return
+
+        # The negation of a literal falsifies the clause's occurrence of it
+        self._false.append(sum(1 for lit in clause if self._values[lit] is False))
+        for lit in clause:
+            self._false_occurrences[-lit].append(len(self._false) - 1)
+
+        _ClauseHeuristic.added(self, clause)
+
+    def _count(self, idx: int, delta: int, include: int = 0, exclude: int = 0):
+        """Adds (or removes) an unsatisfied clause and the occurrences of its unassigned literals.
+
+        Args:
+            idx: Index of the clause.
+            delta: 1 to add the clause, -1 to remove it.
+            include: Optional; A literal of the clause to count even though it is assigned.
+            exclude: Optional; A literal of the clause not to count even though it is unassigned.
+        """
+        clause = self._clauses[idx]
+        size = len(clause) - self._false[idx]
+        self._sizes[size] = self._sizes.get(size, 0) + delta
+        if self._sizes[size] == 0:
+            del self._sizes[size]
+
+        counts = self._counts.setdefault(size, dict())
+        for lit in clause:
+            if (self._values[lit] is None and lit != exclude) or lit == include:
+                counts[lit] = counts.get(lit, 0) + delta
+                if counts[lit] == 0:
+                    del counts[lit]
+
+    def _clause_satisfied(self, idx: int, lit: int):
+        """See base class."""
+        self._count(idx, -1, include=lit)
+
+    def _clause_unsatisfied(self, idx: int):
+        """See base class."""
+        self._count(idx, 1)
+
+    def assigned(self, lit: int):
+        """See base class."""
+        _ClauseHeuristic.assigned(self, lit)
+
+        # Unsatisfied clauses with the negated literal lose one unassigned literal
+        for idx in self._false_occurrences[lit]:
+            if self._true[idx] == 0:
+                self._count(idx, -1, include=-lit)
+                self._false[idx] += 1
+                self._count(idx, 1)
+            else:
+                self._false[idx] += 1
+
+    def unassigned(self, lit: int):
+        """See base class."""
+        for idx in self._false_occurrences[lit]:
+            if self._true[idx] == 0:
+                self._count(idx, -1, exclude=-lit)
+                self._false[idx] -= 1
+                self._count(idx, 1)
+            else:
+                self._false[idx] -= 1
+
+        _ClauseHeuristic.unassigned(self, lit)
+
+    def pick(self, db) -> Optional[int]:
+        """See base class."""
+        sizes = [size for size in self._sizes if size > 0]
+        if len(sizes) == 0:
+            return None
+
+        counts = self._counts[min(sizes)]
+        best, best_score = None, None
+        for lit in counts:
+            var = abs(lit)
+            pos, neg = counts.get(var, 0), counts.get(-var, 0)
+            score = ((pos + neg) << self.k) + pos * neg
+            if best_score is None or score > best_score or (score == best_score and var < abs(best)):
+                best, best_score = var if pos >= neg else -var, score
+
+        return best
@@ -0,0 +1,220 @@
+"""Implements an incremental SAT solver, which answers many related queries over a growing set of clauses.
+"""
+from copy import copy
+from typing import Dict, Iterable, List, Optional, Union
+
+from ..logic.grammar import Operators
+from ..norm import CNF
+from ..utils import remove_whitespaces
+from ._solvers import _ClauseDatabase
+from .cdcl import CDCLSolver
+
+
+class SolverSession:
+    """Incremental CNF-SAT solver session, built on the CDCL algorithm.
+
+    Formulas are added to the session over time, and the conjunction of all formulas added so far is solved
+    repeatedly, optionally under assumptions: literals which must be true for that query only. The clause database,
+    the learned clauses and the heuristic scores are kept from one query to the next, so that later queries reuse
+    what earlier ones learned instead of solving from nothing.
+
+    Formulas can also be added in nested scopes, which are opened with 'push' and closed with 'pop'. Closing a
+    scope removes the formulas added in it. Every scope has a selector variable, which is added to the clauses of
+    the scope negated and assumed true by every query while the scope is open. Learned clauses which depend on the
+    clauses of a scope include the negated selector too, so they are removed along with the scope, and all other
+    learned clauses are kept.
+
+    Variables are named as in the formulas, and shared between the formulas added. Auxiliary variables introduced
+    by the CNF encoding of a formula are local to it.
+
+    Attributes:
+        solver: The CDCL solver searching the clauses.
+        encoding: The encoding of the formulas added to the session into CNF.
+    """
+
+    def __init__(self, solver: CDCLSolver = None, encoding: str = CNF.TSEITIN):
+        """Inits an empty session.
+
+        Args:
+            solver: Optional; The CDCL solver searching the clauses. Uses a CDCLSolver with default settings if None.
+            encoding: Optional; The encoding of the formulas added to the session into CNF.
+        """
+        self.solver = solver if solver is not None else CDCLSolver()
+        self.encoding = encoding
+
+        self._db = _ClauseDatabase([], 0)
+        self._db.use_heuristic(copy(self.solver.heuristic))
+        self._lbd: Dict[int, int] = dict()
+
+        # Session variable of each named variable, and name of each session variable (None if it is unnamed)
+        self._numbers: Dict[str, int] = dict()
+        self._names: List[Optional[str]] = [None]
+
+        # Selector variable of each open scope
+        self._selectors: List[int] = []
+
+        # Whether the clauses outside of all scopes are unsatisfiable
+        self._unsat = False
+
+        self._model: Optional[Dict[str, bool]] = None
+        self._core: List[str] = []
+
+    @property
+    def variables(self) -> List[str]:
+        """Names of the variables of the session, in the order they were added."""
+        return [name for name in self._names if name is not None]
+
+    @property
+    def num_scopes(self) -> int:
+        """Number of open scopes."""
+        return len(self._selectors)
+
+    def add(self, proposition: Union[str, CNF]):
+        """Adds a formula to the session, in the innermost open scope if any.
+
+        Args:
+            proposition: The Boolean expression to add, or a CNF formula.
+        """
+        problem = proposition if isinstance(proposition, CNF) else CNF(remove_whitespaces(proposition), self.encoding)
+        numbers = [0] + [self._number(name) for name in problem.variables]
+        num_auxiliary = problem.num_variables - len(problem.variables)
+        if num_auxiliary > 0:
+            numbers.extend(self._new_variables(num_auxiliary))
+
+        for clause in problem.clauses:
+            self._add_clause([numbers[lit] if lit > 0 else -numbers[-lit] for lit in clause])
+
+    def add_clause(self, literals: Iterable[str]):
+        """Adds a clause to the session, in the innermost open scope if any.
+
+        Args:
+            literals: The literals of the clause, as variable names optionally negated with '~'.
+        """
+        self._add_clause([self._literal(literal) for literal in literals])
+
+    def push(self):
+        """Opens a new scope, nested in the open scopes."""
+        self._selectors.append(self._new_variables(1)[0])
+
+    def pop(self):
+        """Closes the innermost open scope, removing the formulas added in it.
+
+        Raises:
+            IndexError: If there is no open scope.
+        """
+        if len(self._selectors) == 0:
+            raise IndexError('pop from a session with no open scope')
+
+        db = self._db
+        db.backtrack(0)
+        selector = self._selectors.pop()
+
+        # Clauses of the scope, and learned clauses depending on them, are satisfied once the selector is false
+        db.clauses = [clause for clause in db.clauses if -selector not in clause]
+        removed = [clause for clause in db.learned if -selector in clause]
+        for clause in removed:
+            self._lbd.pop(id(clause), None)
+        db.remove_learned(removed)
+
+        db.add_clause([-selector])
+        if db.propagate() is not None:
+            self._unsat = True
+
+    def solve(self, assumptions: Iterable[str] = ()) -> bool:
+        """Checks if the formulas of the session are satisfiable, with the assumptions true.
+
+        After a satisfiable query, the model found is available as 'model'. After an unsatisfiable query, the
+        assumptions which made it unsatisfiable are available as 'core'.
+
+        Args:
+            assumptions: Optional; Literals which must be true for this query only, as variable names optionally
+                negated with '~'.
+
+        Returns:
+            True if the formulas are satisfiable under the assumptions, False otherwise.
+        """
+        assumptions = list(assumptions)
+        literals = [self._literal(assumption) for assumption in assumptions]
+        self._model = None
+        self._core = []
+        if self._unsat:
+            return False
+
+        db = self._db
+        db.backtrack(0)
+        if self.solver._search(db, self._lbd, self._selectors + literals):
+            self._model = {name: bool(db.values[var]) for var, name in enumerate(self._names)
+                           if name is not None and db.values[var] is not None}
+            return True
+
+        # A conflict before any decision does not depend on the assumptions, even if some of them are false
+        failed = next((lit for lit in self._selectors + literals if db.values[lit] is False), None)
+        if failed is None or (db.level == 0 and any(all(db.values[lit] is False for lit in clause)
+                                                    for clause in db.clauses + db.learned)):
+            self._unsat = True
+            return False
+
+        core = set(CDCLSolver._failed_assumptions(db, failed))
+        self._core = [assumption for assumption, lit in zip(assumptions, literals) if lit in core]
+        return False
+
+    @property
+    def model(self) -> Optional[Dict[str, bool]]:
+        """Truth values of the variables in the model found by the last query, or None if it was unsatisfiable.
+
+        Variables missing from the model may take any value, as with heuristics which stop deciding once all
+        clauses are satisfied."""
+        return self._model
+
+    @property
+    def core(self) -> List[str]:
+        """Assumptions of the last query which are enough to make it unsatisfiable.
+
+        The core is empty if the query was satisfiable, or if the formulas are unsatisfiable without assumptions.
+        """
+        return self._core
+
+    def _new_variables(self, count: int) -> List[int]:
+        """Adds unnamed variables to the session, and returns their numbers."""
+        first = len(self._names)
+        self._names.extend([None] * count)
+        self._db.backtrack(0)
+        self._db.add_variables(count)
+        return list(range(first, first + count))
+
+    def _number(self, name: str) -> int:
+        """Returns the number of a named variable, adding it to the session if needed."""
+        if name not in self._numbers:
+            var = self._new_variables(1)[0]
+            self._names[var] = name
+            self._numbers[name] = var
+
+        return self._numbers[name]
+
+    def _literal(self, literal: str) -> int:
+        """Returns the session literal of a variable name, optionally negated with '~'.
+
+        The name must be one of the session variables, such as the 'x<i>' variables of a DIMACS formula, or else a
+        variable name of the grammar, i.e. letters only.
+        """
+        literal = remove_whitespaces(literal)
+        name = literal.lstrip(str(Operators.NOT))
+        if name not in self._numbers and not (name.isascii() and name.isalpha()):
+            raise ValueError(f'Not a literal: {literal}')
+
+        var = self._number(name)
+        return var if (len(literal) - len(name)) % 2 == 0 else -var
+
+    def _add_clause(self, clause: List[int]):
+        """Adds a clause of session literals, guarded by the selector of the innermost open scope if any."""
+        clause = list(dict.fromkeys(clause))
+        if len({abs(lit) for lit in clause}) < len(clause):
+            return
+
+        if len(self._selectors) > 0:
+            clause.append(-self._selectors[-1])
+
+        db = self._db
+        db.backtrack(0)
+        if db.add_clause(clause) is not None or db.propagate() is not None:
+            self._unsat = True
@@ -0,0 +1,156 @@
+"""Implements a portfolio solver, which runs several SAT solvers on the same problem in parallel.
+"""
+import multiprocessing
+import os
+import queue
+from copy import copy
+from typing import Iterator, List, Tuple
+
+from ..norm import CNF
+from ._solvers import SATSolver, SATSolution
+from .cdcl import CDCLSolver
+from .dpll import DPLLSolver
+from .heuristics import VSIDS, JeroslowWang
+
+
+class _ClauseExchange:
+    """Shared memory buffer through which searches of the same formula exchange short learned clauses.
+
+    Clauses are appended to a shared array of integers as their length and the process which sent them, followed
+    by their literals. Each search keeps the position up to which it has read the buffer, and skips the clauses it
+    sent itself. Clauses which no longer fit are dropped.
+    """
+
+    def __init__(self, capacity: int):
+        """Inits an empty exchange.
+
+        Args:
+            capacity: Number of integers the buffer holds.
+        """
+        self._buffer = multiprocessing.Array('i', capacity)
+        self._size = multiprocessing.Value('i', 0)
+        self._position = 0
+
+    def send(self, clause: List[int]):
+        """Makes a clause available to the other searches."""
+        with self._size.get_lock():
+            size = self._size.value
+            if size + len(clause) + 2 <= len(self._buffer):
+                self._buffer[size:size + len(clause) + 2] = [len(clause), os.getpid()] + clause
+                self._size.value = size + len(clause) + 2
+
+    def receive(self) -> Iterator[List[int]]:
+        """Yields the clauses sent by the other searches since the last call."""
+        with self._size.get_lock():
+            size = self._size.value
+            data = self._buffer[self._position:size]
+
+        self._position = size
+        pid = os.getpid()
+        start = 0
+        while start < len(data):
+            length, sender = data[start], data[start + 1]
+            if sender != pid:
+                yield data[start + 2:start + 2 + length]
+            start += length + 2
+
+
+def _run(solver: SATSolver, clauses: List[Tuple[int, ...]], variables: List[str], num_variables: int,
+         max_solutions: int, results: multiprocessing.Queue):
+    """Solves a problem in a worker process, and reports the assignments found, or the error raised."""
+    try:
+        problem = CNF.from_clauses(clauses, variables, num_variables)
+        results.put([assignment._truth for assignment in solver._solve(problem, max_solutions)])
+    except Exception as err:
+        results.put(err)
+
+
+class PortfolioSolver(SATSolver):
+    """Implements a CNF-SAT solver running a portfolio of solvers in parallel.
+
+    Each solver of the portfolio searches the same problem in its own process. The answer of the first solver to
+    finish is returned, and the other processes are terminated. Solvers can differ in their algorithm, branching
+    heuristic, restart policy or random seed, since which configuration is fastest varies widely between hard
+    problems.
+
+    The assignments of the first solver are all found before they are returned, so unlike other solvers, the
+    solution is not evaluated lazily.
+
+    When a single assignment is searched for, the CDCL solvers of the portfolio can also share their learned units
+    and binary clauses through shared memory. Clauses learned while enumerating several assignments depend on the
+    assignments blocked so far, which differ between solvers, so they are never shared.
+
+    Attributes:
+        solvers: The solvers of the portfolio, each run in its own process.
+        share_clauses: Whether the CDCL solvers share their short learned clauses.
+        exchange_size: Number of integers in the shared buffer of learned clauses.
+    """
+    _POLL_INTERVAL = 0.5
+
+    def __init__(self, solvers: List[SATSolver] = None, share_clauses: bool = False, exchange_size: int = 1 << 16):
+        """Inits the solver.
+
+        Args:
+            solvers: Optional; The solvers of the portfolio. Uses CDCL solvers with different heuristics, restart
+                intervals and seeds, and a DPLL solver, if None.
+            share_clauses: Optional; Shares short learned clauses between the CDCL solvers if True.
+            exchange_size: Optional; Number of integers in the shared buffer of learned clauses.
+        """
+        if solvers is None:
+            solvers = [CDCLSolver(),
+                       CDCLSolver(VSIDS(decay=0.8, seed=1), restart_interval=50),
+                       CDCLSolver(VSIDS(seed=2), restart_interval=400),
+                       CDCLSolver(JeroslowWang()),
+                       DPLLSolver()]
+
+        if len(solvers) == 0:
+            raise ValueError('A portfolio needs at least one solver')
+
+        self.solvers = solvers
+        self.share_clauses = share_clauses
+        self.exchange_size = exchange_size
+
+    def _solve(self, problem: CNF, max_solutions: int = None) -> SATSolution:
+        """See base class."""
+        solvers = [copy(solver) for solver in self.solvers]
+        if self.share_clauses and max_solutions == 1:
+            exchange = _ClauseExchange(self.exchange_size)
+            for solver in solvers:
+                if isinstance(solver, CDCLSolver):
+                    solver.exchange = exchange
+
+        clauses = [tuple(clause) for clause in problem.clauses]
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_run, daemon=True,
+                                             args=(solver, clauses, problem.variables, problem.num_variables,
+                                                   max_solutions, results))
+                     for solver in solvers]
+        for process in processes:
+            process.start()
+
+        try:
+            errors = []
+            while len(errors) < len(processes):
+                try:
+                    truths = results.get(timeout=self._POLL_INTERVAL)
+                except queue.Empty:
+                    # A process which ended without reporting was killed, e.g. by running out of memory
+                    if not any(process.is_alive() for process in processes) and results.empty():
+                        break
+                    continue
+
+                if not isinstance(truths, Exception):
+                    return SATSolution(problem, truths, max_solutions)
+
+                errors.append(truths)
+
+            reason = repr(errors[0]) if len(errors) > 0 else 'no answer'
+            raise RuntimeError(f'All solvers of the portfolio failed: {reason}')
+
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+            for process in processes:
+                process.join()
@@ -0,0 +1,465 @@
+"""Implements preprocessing of CNF formulas before they are solved.
+"""
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from ..norm import CNF
+
+
+class Preprocessor:
+    """Simplifies CNF formulas before they are solved, in the style of SatELite.
+
+    The following techniques are applied in turn, until none of them changes the clauses any more:
+        Unit propagation: Unit clauses are assigned, removing the clauses they satisfy and their negation from the
+            other clauses.
+        Equivalent literal substitution: Literals which imply each other through binary clauses, i.e. which are in
+            the same strongly connected component of the binary implication graph, are replaced by one of them.
+        Subsumption: Clauses containing all literals of another clause are removed. With self-subsuming
+            resolution, a literal is also removed from a clause if resolving the clause on it with another clause
+            gives a subset of the clause.
+        Failed literal probing: A literal whose propagation falsifies a clause is assigned its negation, and
+            literals implied by both literals of a variable are assigned.
+        Bounded variable elimination: A variable is replaced by all resolvents of the clauses containing it, as
+            long as there are no more resolvents than such clauses.
+
+    Removing variables keeps the clauses equisatisfiable, but not equivalent. The clauses needed to assign each
+    removed variable are kept on a reconstruction stack, and a model of the reduced clauses is extended to the
+    removed variables by going through the stack in reverse. All extensions of a model are generated, so that all
+    models of the formula can still be enumerated.
+
+    Attributes:
+        elimination: Whether bounded variable elimination is applied.
+        subsumption: Whether subsumption and self-subsuming resolution are applied.
+        probing: Whether failed literal probing is applied.
+        equivalences: Whether equivalent literals are substituted.
+        max_occurrences: Maximum number of clauses containing a variable for it to be eliminated.
+        max_resolvent_length: Maximum length of the resolvents added by variable elimination.
+        max_probes: Maximum number of variables probed each time probing is applied.
+        stack: The reconstruction stack of the last formula preprocessed, as pairs of a removed variable and the
+            clauses which determine its value.
+    """
+
+    def __init__(self, elimination: bool = True, subsumption: bool = True, probing: bool = True,
+                 equivalences: bool = True, max_occurrences: int = 16, max_resolvent_length: int = 16,
+                 max_probes: int = 1000):
+        """Inits the preprocessor.
+
+        Args:
+            elimination: Optional; Applies bounded variable elimination if True.
+            subsumption: Optional; Applies subsumption and self-subsuming resolution if True.
+            probing: Optional; Applies failed literal probing if True.
+            equivalences: Optional; Substitutes equivalent literals if True.
+            max_occurrences: Optional; Maximum number of clauses containing a variable for it to be eliminated.
+            max_resolvent_length: Optional; Maximum length of the resolvents added by variable elimination.
+            max_probes: Optional; Maximum number of variables probed each time probing is applied.
+        """
+        self.elimination = elimination
+        self.subsumption = subsumption
+        self.probing = probing
+        self.equivalences = equivalences
+        self.max_occurrences = max_occurrences
+        self.max_resolvent_length = max_resolvent_length
+        self.max_probes = max_probes
+        self.stack: List[Tuple[int, List[Tuple[int, ...]]]] = []
+
+    def preprocess(self, problem: CNF) -> CNF:
+        """Simplifies the clauses of a CNF formula.
+
+        Args:
+            problem: The CNF formula to simplify.
+
+        Returns:
+            A CNF formula over the same variables, all of which count as original variables. It is satisfiable if
+            and only if the given formula is satisfiable, and its models are extended by 'extend'.
+        """
+        num_variables = problem.num_variables
+        self.stack = []
+        self._names = [''] + [problem.name(var) for var in range(1, num_variables + 1)]
+        self._index = {name: var for var, name in enumerate(self._names)}
+        self._clauses: List[Optional[Set[int]]] = []
+        self._occurrences: Dict[int, Set[int]] = {lit: set() for var in range(1, num_variables + 1)
+                                                  for lit in [var, -var]}
+        self._removed: Set[int] = set()
+        self._units: List[int] = []
+        self._touched: Set[int] = set()
+        self._unsat = False
+
+        for clause in problem.clauses:
+            self._add_clause(clause)
+
+        steps = [self._propagate]
+        if self.equivalences:
+            steps.append(self._substitute_equivalences)
+        if self.subsumption:
+            steps.append(self._subsume)
+        if self.probing:
+            steps.append(self._probe)
+        if self.elimination:
+            steps.append(self._eliminate)
+
+        changed = True
+        while changed and not self._unsat:
+            changed = False
+            for step in steps:
+                changed = step() or changed
+                if self._unsat:
+                    break
+
+        if self._unsat:
+            clauses = [()]
+        else:
+            clauses = [tuple(sorted(clause, key=abs)) for clause in self._clauses if clause is not None]
+
+        return CNF.from_clauses(clauses, self._names[1:])
+
+    def extend(self, model: Dict[str, bool]) -> Iterator[Dict[str, bool]]:
+        """Extends a model of the preprocessed formula to models of the whole formula.
+
+        Args:
+            model: Truth values of the named variables of the preprocessed formula. Variables without a value may
+                take any value.
+
+        Yields:
+            Truth values of the variables of the whole formula, including the removed variables and those needed to
+            determine them.
+        """
+        values = {self._index[name]: value for name, value in model.items()}
+        values = {var: value for var, value in values.items() if var not in self._removed}
+
+        # Partial models still to extend, by the number of stack entries left to go through
+        pending = [(len(self.stack), values)]
+        while len(pending) > 0:
+            depth, values = pending.pop()
+            while depth > 0:
+                var, clauses = self.stack[depth - 1]
+
+                # Unassigned variables of the clauses can take any value, so both are tried
+                free = next((abs(lit) for clause in clauses for lit in clause
+                             if abs(lit) != var and abs(lit) not in values), None)
+                if free is not None:
+                    pending.append((depth, {**values, free: False}))
+                    values[free] = True
+                    continue
+
+                options = []
+                for value in [True, False]:
+                    values[var] = value
+                    if all(any(values[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses):
+                        options.append(value)
+
+                if len(options) == 2:
+                    pending.append((depth - 1, {**values, var: False}))
+
+                values[var] = options[0]
+                depth -= 1
+
+            yield {self._names[var]: value for var, value in sorted(values.items())}
+
+    def _add_clause(self, clause):
+        """Adds a clause, unless it is a tautology, and queues it for subsumption."""
+        literals = set(clause)
+        if len(literals) == 0:
+            self._unsat = True
+            return
+
+        if any(-lit in literals for lit in literals):
+            return
+
+        i = len(self._clauses)
+        self._clauses.append(literals)
+        for lit in literals:
+            self._occurrences[lit].add(i)
+
+        if len(literals) == 1:
+            self._units.append(next(iter(literals)))
+
+        self._touched.add(i)
+
+    def _remove_clause(self, i: int):
+        """Removes a clause."""
+        for lit in self._clauses[i]:
+            self._occurrences[lit].discard(i)
+
+        self._clauses[i] = None
+        self._touched.discard(i)
+
+    def _strengthen(self, i: int, lit: int):
+        """Removes a literal from a clause, and queues the clause for subsumption."""
+        clause = self._clauses[i]
+        clause.discard(lit)
+        self._occurrences[lit].discard(i)
+        if len(clause) == 0:
+            self._unsat = True
+        elif len(clause) == 1:
+            self._units.append(next(iter(clause)))
+
+        self._touched.add(i)
+
+    def _propagate(self) -> bool:
+        """Assigns the unit literals found, and all literals they imply.
+
+        Returns:
+            True if any literal was assigned.
+        """
+        changed = False
+        while len(self._units) > 0 and not self._unsat:
+            lit = self._units.pop()
+            if abs(lit) in self._removed:
+                # The unit clause was satisfied, falsified or replaced when the variable was removed
+                continue
+
+            self._removed.add(abs(lit))
+            self.stack.append((abs(lit), [(lit,)]))
+            for i in list(self._occurrences[lit]):
+                self._remove_clause(i)
+            for i in list(self._occurrences[-lit]):
+                self._strengthen(i, -lit)
+
+            changed = True
+
+        return changed
+
+    def _substitute_equivalences(self) -> bool:
+        """Replaces the literals of each cycle of the binary implication graph by a single literal.
+
+        Returns:
+            True if any variable was replaced.
+        """
+        graph: Dict[int, List[int]] = dict()
+        for clause in self._clauses:
+            if clause is not None and len(clause) == 2:
+                a, b = clause
+                graph.setdefault(-a, []).append(b)
+                graph.setdefault(-b, []).append(a)
+
+        substitutes = dict()
+        for component in _strongly_connected_components(graph):
+            if any(-lit in component for lit in component):
+                self._unsat = True  # a literal implies its negation and vice versa
+                return False
+
+            representative = min(component, key=abs)
+            for lit in component:
+                if abs(lit) != abs(representative):
+                    substitutes[abs(lit)] = representative if lit > 0 else -representative
+
+        for var, lit in substitutes.items():
+            self._removed.add(var)
+            self.stack.append((var, [(-var, lit), (var, -lit)]))
+
+            replaced = [self._clauses[i] for i in self._occurrences[var] | self._occurrences[-var]]
+            for i in list(self._occurrences[var] | self._occurrences[-var]):
+                self._remove_clause(i)
+
+            for clause in replaced:
+                self._add_clause(lit if q == var else -lit if q == -var else q for q in clause)
+
+        self._propagate()
+        return len(substitutes) > 0
+
+    def _subsume(self) -> bool:
+        """Removes subsumed clauses and strengthens clauses by self-subsuming resolution.
+
+        Clauses are checked against the other clauses from the shortest to the longest, starting with those which
+        were added or changed since the last check.
+
+        Returns:
+            True if any clause was removed or strengthened.
+        """
+        changed = False
+        while len(self._touched) > 0 and not self._unsat:
+            queue = sorted(self._touched, key=lambda i: len(self._clauses[i]))
+            self._touched = set()
+            for i in queue:
+                if self._clauses[i] is not None and not self._unsat:
+                    changed = self._subsume_with(i) or changed
+
+            self._propagate()
+
+        return changed
+
+    def _subsume_with(self, i: int) -> bool:
+        """Removes the clauses subsumed by a clause, and strengthens the clauses it self-subsumes."""
+        clause = self._clauses[i]
+        changed = False
+
+        # Clauses containing the clause also contain its literal occurring in fewest clauses
+        lit = min(clause, key=lambda q: len(self._occurrences[q]))
+        for j in [j for j in self._occurrences[lit] if j != i and clause <= self._clauses[j]]:
+            self._remove_clause(j)
+            changed = True
+
+        # Resolving on a literal with a clause containing the rest of the clause removes the negation of the literal
+        for lit in list(clause):
+            rest = clause - {lit}
+            for j in [j for j in self._occurrences[-lit] if rest <= self._clauses[j]]:
+                self._strengthen(j, -lit)
+                changed = True
+
+        return changed
+
+    def _probe(self) -> bool:
+        """Assigns the negation of failed literals, and the literals implied by both literals of a variable.
+
+        Variables occurring in the most clauses are probed first.
+
+        Returns:
+            True if any literal was assigned.
+        """
+        variables = [var for var in range(1, len(self._names))
+                     if len(self._occurrences[var]) > 0 and len(self._occurrences[-var]) > 0]
+        variables.sort(key=lambda var: len(self._occurrences[var]) + len(self._occurrences[-var]), reverse=True)
+
+        changed = False
+        for var in variables[:self.max_probes]:
+            if var in self._removed:
+                continue
+
+            positive, negative = self._implied(var), self._implied(-var)
+            if positive is None and negative is None:
+                self._unsat = True
+                break
+            elif positive is None:
+                self._units.append(-var)
+            elif negative is None:
+                self._units.append(var)
+            else:
+                self._units.extend(positive & negative)
+
+            changed = self._propagate() or changed
+
+        return changed
+
+    def _implied(self, lit: int) -> Optional[Set[int]]:
+        """Lists the literals implied by a literal through unit propagation, or None if it falsifies a clause."""
+        assigned = {lit}
+        pending = [lit]
+        while len(pending) > 0:
+            for i in self._occurrences[-pending.pop()]:
+                unassigned = []
+                for q in self._clauses[i]:
+                    if q in assigned:
+                        break
+                    elif -q not in assigned:
+                        unassigned.append(q)
+
+                else:
+                    if len(unassigned) == 0:
+                        return None
+                    elif len(unassigned) == 1:
+                        assigned.add(unassigned[0])
+                        pending.append(unassigned[0])
+
+        return assigned
+
+    def _eliminate(self) -> bool:
+        """Eliminates variables whose clauses do not have more resolvents than clauses.
+
+        Variables are tried in order of the number of resolvents of their clauses, so that the cheapest ones are
+        eliminated first.
+
+        Returns:
+            True if any variable was eliminated.
+        """
+        variables = [var for var in range(1, len(self._names))
+                     if 0 < len(self._occurrences[var]) + len(self._occurrences[-var]) <= self.max_occurrences]
+        variables.sort(key=lambda var: len(self._occurrences[var]) * len(self._occurrences[-var]))
+
+        changed = False
+        for var in variables:
+            occurrences = self._occurrences[var] | self._occurrences[-var]
+            if var in self._removed or len(occurrences) > self.max_occurrences or self._unsat:
+                continue
+
+            resolvents = self._resolvents(var)
+            if resolvents is None:
+                continue
+
+            self._removed.add(var)
+            self.stack.append((var, [tuple(sorted(self._clauses[i], key=abs)) for i in occurrences]))
+            for i in occurrences:
+                self._remove_clause(i)
+            for resolvent in resolvents:
+                self._add_clause(resolvent)
+
+            self._propagate()
+            changed = True
+
+        return changed
+
+    def _resolvents(self, var: int) -> Optional[List[Set[int]]]:
+        """Lists the non-tautological resolvents of the clauses on a variable.
+
+        Returns:
+            The resolvents, or None if there are more of them than clauses containing the variable, or some of them
+            are too long.
+        """
+        limit = len(self._occurrences[var]) + len(self._occurrences[-var])
+        resolvents = []
+        for i in self._occurrences[var]:
+            for j in self._occurrences[-var]:
+                resolvent = (self._clauses[i] | self._clauses[j]) - {var, -var}
+                if any(-lit in resolvent for lit in resolvent):
+                    continue
+
+                if len(resolvents) == limit or len(resolvent) > self.max_resolvent_length:
+                    return None
+
+                resolvents.append(resolvent)
+
+        return resolvents
+
+
+def _strongly_connected_components(graph: Dict[int, List[int]]) -> List[Set[int]]:
+    """Finds the strongly connected components of a graph with Tarjan's algorithm, using an explicit stack.
+
+    Args:
+        graph: The successors of each node. Nodes without successors may be left out.
+
+    Returns:
+        The components with more than one node, as sets of nodes.
+    """
+    index: Dict[int, int] = dict()
+    low: Dict[int, int] = dict()
+    stack: List[int] = []
+    on_stack: Set[int] = set()
+    components = []
+
+    for root in list(graph):
+        if root in index:
+            continue
+
+        index[root] = low[root] = len(index)
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(graph.get(root, ())))]
+        while len(work) > 0:
+            node, successors = work[-1]
+            for succ in successors:
+                if succ not in index:
+                    index[succ] = low[succ] = len(index)
+                    stack.append(succ)
+                    on_stack.add(succ)
+                    work.append((succ, iter(graph.get(succ, ()))))
+                    break
+                elif succ in on_stack:
+                    low[node] = min(low[node], index[succ])
+
+            else:
+                work.pop()
+                if len(work) > 0:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+
+                if low[node] == index[node]:
+                    component = set()
+                    while True:
+                        lit = stack.pop()
+                        on_stack.discard(lit)
+                        component.add(lit)
+                        if lit == node:
+                            break
+
+                    if len(component) > 1:
+                        components.append(component)
+
+    return components
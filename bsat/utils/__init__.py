@@ -1,5 +1,7 @@
 """Defines helper functions to perform common tasks."""
 
+from typing import Any, Callable, Dict, Hashable, List
+
 
 def remove_whitespaces(string: str) -> str:
     """Removes all whitespaces from a string.
@@ -11,3 +13,45 @@ def remove_whitespaces(string: str) -> str:
         A new string with no whitespaces.
     """
     return ''.join(string.split())
+
+
+def fold(root: Hashable, children: Callable[[Any], List], combine: Callable[[Any, List], Any],
+         values: Dict = None) -> Any:
+    """Computes a value for the root of a graph from the values of its descendants, without recursion.
+
+    Nodes are visited in depth-first post-order using an explicit stack, so the depth of the graph
+    is limited only by memory. The value of each node is computed once, so nodes shared in a
+    directed acyclic graph (DAG) are not visited again. Children are visited in order.
+
+    Args:
+        root: The node to compute the value of.
+        children: Function listing the children of a node.
+        combine: Function computing the value of a node, given the node and the values of its
+            children.
+        values: Optional; Values already computed for some nodes. Filled in with the values of
+            the visited nodes.
+
+    Returns:
+        The value of the root.
+    """
+    if values is None:
+        values = dict()
+
+    stack = [(root, None)]
+    while len(stack) > 0:
+        node, pending = stack[-1]
+        if pending is None:
+            if node in values:
+                stack.pop()
+                continue
+
+            pending = children(node)
+            stack[-1] = (node, pending)
+            stack.extend((child, None) for child in reversed(pending) if child not in values)
+
+        else:
+            stack.pop()
+            if node not in values:
+                values[node] = combine(node, [values[child] for child in pending])
+
+    return values[root]
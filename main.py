@@ -1,51 +1,168 @@
 import argparse
+import os
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+from typing import Iterable, Iterator, List
 
-from bsat.solvers import SATSolver, DPLLSolver
+from bsat.logic.grammar import PropositionParser
+from bsat.norm import CNF
+from bsat.solvers import SATSolver, CDCLSolver, CubeAndConquerSolver, DPLLSolver, PortfolioSolver, ResultCache
+from bsat.solvers.cubing import run_worker
 
 # Parse command-line arguments
 parser = argparse.ArgumentParser(description='Solves SATisfiability problems in propositional logic.')
 parser.add_argument('-w', type=str, help='a PL formula to be solved')
 parser.add_argument('-f', type=str, help='file with a list of PL formulas')
+parser.add_argument('-d', type=str, help='a CNF formula in DIMACS format (.cnf, optionally .gz, .bz2 or .xz)')
+parser.add_argument('-s', type=str, choices=['cdcl', 'dpll', 'portfolio', 'cube'], default='cdcl',
+                    help='the SAT solver to use (default: cdcl)')
+parser.add_argument('-n', type=int, help='maximum number of solutions to find (default: all)')
+parser.add_argument('-p', action='store_true', help='simplify the CNF with a preprocessor before solving it')
+parser.add_argument('-k', action='store_true', help='solve the independent parts of the CNF separately')
+parser.add_argument('-j', type=int, default=1,
+                    help='number of processes solving the formulas of a file in parallel (default: 1)')
+parser.add_argument('-c', type=str, help='SQLite file caching the results of solved formulas across runs')
+parser.add_argument('-a', type=str, help='host:port on which the cube solver accepts workers from other hosts')
+parser.add_argument('-r', type=str, help='host:port of a cube solver to work for, instead of solving formulas')
 
-args = parser.parse_args()
+args = None
 
+# Number of formulas sent to a worker process at once, and number of batches read ahead per process
+BATCH_SIZE = 64
+BATCHES_PER_PROCESS = 2
 
-def solve(proposition: str, solver: SATSolver):
+# Solver of each worker process solving formulas in parallel
+_worker_solver = None
+
+
+def create_solver(name: str) -> SATSolver:
+    # Results are looked up in and saved to the cache file, if any, shared by all solvers of the process
+    if args.c is not None:
+        SATSolver.cache = ResultCache(path=args.c)
+
+    # Problems are solved with the CDCLSolver by default, or with the DPLLSolver or a portfolio of solvers
+    if name == 'portfolio':
+        return PortfolioSolver(share_clauses=True)
+    elif name == 'cube':
+        # Workers on other hosts are accepted on the given address, and authenticated with a shared secret key
+        if args.a is not None:
+            return CubeAndConquerSolver(address=parse_address(args.a), authkey=get_authkey())
+        return CubeAndConquerSolver()
+
+    return DPLLSolver() if name == 'dpll' else CDCLSolver()
+
+
+def parse_address(address: str) -> tuple:
+    host, _, port = address.rpartition(':')
+    return host, int(port)
+
+
+def get_authkey() -> bytes:
+    # The key is read from the environment, so that it does not show in the list of processes
+    if 'BSAT_AUTHKEY' not in os.environ:
+        parser.error('set BSAT_AUTHKEY to the secret key shared by the cube solver and its workers')
+
+    return os.environ['BSAT_AUTHKEY'].encode()
+
+
+def solve(proposition: str, solver: SATSolver) -> str:
     try:
         # Determine satisfiability
-        problem = solver.solve(proposition)
-        cnf, solution = problem.formula, problem.solution
+        solution = solver.solve(proposition, args.n, preprocess=args.p, decompose=args.k)
+        cnf = solution.problem
 
-        # Print satisfiability results
-        print(f'{proposition} <=> {cnf}\n{solution}')
+        # Report satisfiability results
+        return f'{proposition} <=> {cnf}\n{solution}'
 
     except SyntaxError as err:
-        print(f'Expression not well-formed: {err}')
+        return f'Expression not well-formed: {err}'
 
-    except RuntimeError as err:
-        print(err)
+    except (RuntimeError, ValueError) as err:
+        return str(err)
+
+
+def init_worker(arguments: argparse.Namespace):
+    global args, _worker_solver
+    args = arguments
+
+    # Each worker builds its own solver and parser once, before solving any formula
+    _worker_solver = create_solver(args.s)
+    PropositionParser()
+
+
+def solve_batch_in_worker(propositions: List[str]) -> List[str]:
+    return [solve(proposition, _worker_solver) for proposition in propositions]
 
 
 def solve_file(file: str, solver: SATSolver):
     print(f'Solving Boolean expressions in file: {file}...')
     with open(file, "r") as f:
-        for proposition in f.readlines():
-            solve(proposition, solver)
+        # Lines are streamed from the file rather than read all at once
+        if args.j <= 1:
+            for proposition in f:
+                print(solve(proposition, solver))
+            return
+
+        for result in solve_in_pool(f):
+            print(result)
+
+
+def solve_in_pool(propositions: Iterable[str]) -> Iterator[str]:
+    # Formulas are solved by a pool of processes in batches, and their results yielded in input order. Only a few
+    # batches per process are read ahead, so that memory does not grow with the number of formulas
+    propositions = iter(propositions)
+    with Pool(args.j, initializer=init_worker, initargs=(args,)) as pool:
+        pending = deque()
+        for batch in iter(lambda: list(islice(propositions, BATCH_SIZE)), []):
+            pending.append(pool.apply_async(solve_batch_in_worker, (batch,)))
+            if len(pending) >= BATCHES_PER_PROCESS * args.j:
+                yield from pending.popleft().get()
+
+        while len(pending) > 0:
+            yield from pending.popleft().get()
+
+
+def solve_dimacs(file: str, solver: SATSolver):
+    try:
+        cnf = CNF.from_dimacs(file)
+        print(f'Solving {len(cnf.clauses)} clauses over {cnf.num_variables} variables in file: {file}...')
+        solution = solver.solve(cnf, args.n, preprocess=args.p, decompose=args.k)
+        print(solution)
+
+    except (OSError, ValueError) as err:
+        print(err)
 
 
 def main():
-    # Problems would be solved with the DPLLSolver
-    solver = DPLLSolver()
+    global args
+    args = parser.parse_args()
+
+    # The processes of a pool are daemonic, so they cannot start the processes of a portfolio or cube solver
+    if args.j > 1 and args.s in ['portfolio', 'cube']:
+        parser.error(f'-j cannot be combined with -s {args.s}, which starts its own processes')
+
+    # case: working for a cube solver on another host
+    if args.r is not None:
+        print(f'Working for the cube solver at {args.r}...')
+        run_worker(parse_address(args.r), get_authkey())
+        return
+
+    solver = create_solver(args.s)
 
     # case: solving all propositions in a file
     if args.f is not None:
         file = args.f.strip()
         solve_file(file, solver)
 
+    # case: solving a CNF formula in DIMACS format
+    elif args.d is not None:
+        solve_dimacs(args.d.strip(), solver)
+
     # case: solving a single proposition
     elif args.w is not None:
         proposition = args.w.strip()
-        solve(proposition, solver)
+        print(solve(proposition, solver))
 
     # case: interactive SAT solver
     else:
@@ -61,7 +178,7 @@ def main():
             try:
                 # Get a propositional formula from user
                 proposition = input("\n\n(CTRL+C to exit) Enter a proposition: ").strip()
-                solve(proposition, solver)
+                print(solve(proposition, solver))
             except KeyboardInterrupt:
                 print()
                 break
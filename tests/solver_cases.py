@@ -0,0 +1,92 @@
+import os
+import random
+from itertools import islice, product
+from typing import List
+
+from bsat.solvers import SATSolver
+from bsat.solvers.heuristics import DLIS, MOMs, VSIDS, JeroslowWang
+
+HEURISTICS = [VSIDS, MOMs, JeroslowWang, DLIS]
+
+
+class SolverCases:
+    """Test cases shared by all solvers, mixed into the test case of each solver.
+
+    Each case runs on every solver returned by 'solvers', as a subtest.
+    """
+    __files_path = os.path.dirname(os.path.realpath(__file__)) + '/examples/'
+
+    def solvers(self) -> List[SATSolver]:
+        """Returns the solvers to test, e.g. with each branching heuristic."""
+        raise NotImplementedError
+
+    def solve_file(self, solver: SATSolver, file: str):
+        results = {}
+        with open(self.__files_path + file, "r") as f:
+            for proposition in f.readlines():
+                solution = solver.solve(proposition)
+                results[proposition] = solution.problem, solution
+
+        return results
+
+    def for_each_solver(self):
+        for solver in self.solvers():
+            heuristic = getattr(solver, 'heuristic', None)
+            with self.subTest(solver=type(solver).__name__, heuristic=type(heuristic).__name__):
+                yield solver
+
+    def test_contradictions(self):
+        for solver in self.for_each_solver():
+            for formula, (_, solution) in self.solve_file(solver, 'contradiction.txt').items():
+                self.assertEqual(False, solution, formula + ' is satisfiable by ' + str(solution))
+
+    def test_tautologies(self):
+        for solver in self.for_each_solver():
+            for formula, (_, solution) in self.solve_file(solver, 'tautology.txt').items():
+                self.assertEqual(True, solution, f'{formula} not a tautology but {solution}')
+
+    def test_satisfiable_formulas(self):
+        for solver in self.for_each_solver():
+            for formula, (_, solution) in self.solve_file(solver, 'satisfiable.txt').items():
+                self.assertGreater(len(solution), 0, f'{formula} {solution}')
+
+    def test_validity(self):
+        for solver in self.for_each_solver():
+            with open(self.__files_path + 'tautology.txt', 'r') as f:
+                for proposition in f.readlines():
+                    self.assertTrue(solver.is_valid(proposition), proposition)
+
+            self.assertFalse(solver.is_valid('(a -> b) -> a'))
+            self.assertTrue(solver.is_equivalent('~(a & b)', '~a | ~b'))
+            self.assertTrue(solver.is_equivalent('a + b', '(a | b) & ~(a <-> b)'))
+            self.assertFalse(solver.is_equivalent('a -> b', 'b -> a'))
+
+    def test_bounded_enumeration(self):
+        # 3^12 assignments, of which only the requested ones are searched for
+        formula = ' & '.join(f'(a{c} | b{c})' for c in 'abcdefghijkl')
+        for solver in self.for_each_solver():
+            self.assertEqual(3, len(solver.solve(formula, max_solutions=3)))
+            self.assertEqual(2, len(list(islice(solver.iter_solutions(formula), 2))))
+            self.assertFalse(solver.solve(formula, max_solutions=1).is_false)
+            self.assertEqual(0, len(list(solver.iter_solutions('a & ~a'))))
+            self.assertRaises(ValueError, solver.solve, formula, max_solutions=0)
+
+    def test_assignments_cover_models(self):
+        for solver in self.for_each_solver():
+            rng = random.Random(0)
+            for _ in range(30):
+                clauses = [' | '.join(rng.choice(['', '~']) + rng.choice('abcde') for _ in range(3))
+                           for _ in range(12)]
+                solution = solver.solve(' & '.join(f'({clause})' for clause in clauses))
+
+                variables = solution.problem.variables
+                expected = sum(1 for values in product([False, True], repeat=len(variables))
+                               if all(any(values[abs(lit) - 1] == (lit > 0) for lit in clause)
+                                      for clause in solution.problem.clauses))
+
+                # Assignments are disjoint, and each leaves its unassigned variables free
+                found = 0
+                for assignment in solution.assignments:
+                    truth = assignment._truth
+                    found += 2 ** (len(variables) - (0 if truth is True else len(truth)))
+                self.assertEqual(expected, found, str(solution.problem))
@@ -0,0 +1,105 @@
+import os
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+from unittest.mock import patch
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, DPLLSolver, ResultCache, SATSolver
+from bsat.solvers.heuristics import VSIDS
+
+
+class ResultCacheTests(TestCase):
+    def tearDown(self):
+        SATSolver.cache = None
+
+    def test_key(self):
+        key = ResultCache.key(CNF('(a | b) & ~c'))
+        self.assertEqual(key, ResultCache.key(CNF('~c & (b | a)')))
+        self.assertNotEqual(key, ResultCache.key(CNF('(a | ~b) & ~c')))
+
+    def test_solver_key(self):
+        problem = CNF('(a | b) & ~c')
+        key = ResultCache.key(problem, CDCLSolver())
+        self.assertEqual(key, ResultCache.key(problem, CDCLSolver()))
+        self.assertNotEqual(key, ResultCache.key(problem))
+        self.assertNotEqual(key, ResultCache.key(problem, DPLLSolver()))
+        self.assertNotEqual(key, ResultCache.key(problem, CDCLSolver(restart_interval=50)))
+        self.assertNotEqual(key, ResultCache.key(problem, CDCLSolver(VSIDS(seed=1))))
+        self.assertNotEqual(key, ResultCache.key(problem, CDCLSolver(), preprocess=True))
+
+    def test_solvers_do_not_share(self):
+        cache = SATSolver.cache = ResultCache()
+        for solver in (CDCLSolver(), DPLLSolver(), CDCLSolver(restart_interval=50)):
+            str(solver.solve('(a | b) & ~c'))
+        self.assertEqual((0, 3), (cache.hits, cache.misses))
+        self.assertEqual(3, len(cache))
+        str(DPLLSolver().solve('~c & (b | a)'))
+        self.assertEqual((1, 3), (cache.hits, cache.misses))
+
+    def test_hits(self):
+        cache = SATSolver.cache = ResultCache()
+        for solver in (CDCLSolver(), DPLLSolver()):
+            cache.clear()
+            expected = str(solver.solve('(a | b) & ~c'))
+            self.assertEqual((0, 1), (cache.hits, cache.misses))
+            self.assertEqual(expected, str(solver.solve('~c & (b | a)')))
+            self.assertEqual(expected.translate(str.maketrans('abc', 'xyz')), str(solver.solve('(x | y) & ~z')))
+            self.assertEqual(expected.split('\t2)')[0], str(solver.solve('(a | b) & ~c', 1)))
+            self.assertFalse(solver.solve('a & ~a'))
+            self.assertFalse(solver.solve('a & ~a'))
+            self.assertEqual((4, 2), (cache.hits, cache.misses))
+
+    def test_bounded_searches(self):
+        cache = SATSolver.cache = ResultCache()
+        solver = CDCLSolver()
+        solution = solver.solve('a | b | c', 2)
+        self.assertEqual(2, len(solution.assignments))
+        self.assertIsNotNone(cache.get(cache.key(solution.problem, solver), 2))
+        self.assertIsNone(cache.get(cache.key(solution.problem, solver), 3))
+        self.assertIsNone(cache.get(cache.key(solution.problem, solver)))
+
+        models = solver.solve('a | b | c').assignments
+        self.assertEqual(len(models), len(cache.get(cache.key(solution.problem, solver))))
+        self.assertLess(len(solver.solve('(a | b) & c', 5).assignments), 5)
+        self.assertIsNotNone(cache.get(cache.key(CNF('(a | b) & c'), solver)))
+
+    def test_writes(self):
+        cache = SATSolver.cache = ResultCache()
+        solver = CDCLSolver()
+        with patch.object(cache, 'put', wraps=cache.put) as put:
+            self.assertLess(2, len(solver.solve('a | b | c | d | e').assignments))
+            self.assertEqual(1, put.call_count)
+
+            # Partly evaluated solutions are cached once they are discarded
+            solution = solver.solve('(a | b) & ~c')
+            next(iter(solution))
+            self.assertEqual(1, put.call_count)
+            del solution
+            self.assertEqual(2, put.call_count)
+            self.assertIsNotNone(cache.get(cache.key(CNF('(a | b) & ~c'), solver), 1))
+
+    def test_eviction(self):
+        cache = ResultCache(max_bytes=200)
+        keys = [cache.key(CNF(name)) for name in ('a', 'a & b', 'a & b & c')]
+        for key in keys:
+            cache.put(key, [(1, 2, 3, 4, 5)], complete=True)
+            self.assertLessEqual(cache.size, 200)
+
+        self.assertEqual(2, len(cache))
+        self.assertIsNone(cache.get(keys[0]))
+        self.assertEqual([(1, 2, 3, 4, 5)], cache.get(keys[1]))
+
+        cache.put(keys[0], [(1,)] * 100, complete=True)
+        self.assertIsNone(cache.get(keys[0]))
+
+    def test_database(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'results.db')
+            SATSolver.cache = ResultCache(path=path)
+            expected = str(CDCLSolver().solve('(a -> b) & (b -> c)'))
+            SATSolver.cache.close()
+
+            cache = SATSolver.cache = ResultCache(path=path)
+            self.assertEqual(expected, str(CDCLSolver().solve('(a -> b) & (b -> c)')))
+            self.assertEqual((1, 0), (cache.hits, cache.misses))
+            cache.close()
@@ -0,0 +1,44 @@
+from copy import copy
+from unittest import TestCase
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, DPLLSolver
+from bsat.solvers._solvers import _ClauseDatabase
+from bsat.solvers.cdcl import _luby
+
+from .solver_cases import HEURISTICS, SolverCases
+
+
+class CDCLSolverTests(SolverCases, TestCase):
+    def solvers(self):
+        # Frequent restarts and a small learned clause database exercise restarts and clause deletion
+        return [CDCLSolver(), CDCLSolver(restart_interval=2, max_learned=4)] + \
+            [CDCLSolver(heuristic()) for heuristic in HEURISTICS]
+
+    def test_agrees_with_dpll(self):
+        formulas = ['(a <-> b) + (c -> ~a) & (b | d)', '~(a & b) <-> (c + d)', '(p -> q) & (q -> r) & p & ~r']
+        for formula in formulas:
+            for encoding in CNF.ENCODINGS:
+                problem = CNF(formula, encoding)
+                expected = DPLLSolver()._solve(problem)
+                solution = CDCLSolver()._solve(problem)
+                self.assertEqual(expected.is_false, solution.is_false, f'{formula} ({encoding})')
+
+    def test_restarts(self):
+        self.assertEqual([1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8], [_luby(i) for i in range(1, 16)])
+
+    def test_learning(self):
+        # 5 pigeons in 4 holes, which is refuted only by learning clauses
+        pigeons, holes = 'abcde', 'pqrs'
+        formula = ' & '.join('(' + ' | '.join(p + h for h in holes) + ')' for p in pigeons) + ' & ' + \
+            ' & '.join(f'(~{p}{h} | ~{q}{h})' for h in holes for i, p in enumerate(pigeons) for q in pigeons[i + 1:])
+        problem = CNF(formula)
+        for solver in [CDCLSolver(), CDCLSolver(restart_interval=1, max_learned=4)]:
+            db = _ClauseDatabase(problem.clauses, problem.num_variables)
+            db.use_heuristic(copy(solver.heuristic))
+            lbd = dict()
+            self.assertFalse(solver._search(db, lbd))
+
+            # Deleted clauses are forgotten along with their LBD, and the others are all kept
+            self.assertGreater(len(db.learned), 0)
+            self.assertEqual(sorted(id(clause) for clause in db.learned), sorted(lbd))
@@ -0,0 +1,73 @@
+from unittest import TestCase
+
+from bsat.norm import CNF
+from bsat.solvers import DPLLSolver
+from bsat.solvers._solvers import _ClauseDatabase
+
+
+class ClauseDatabaseTests(TestCase):
+    def test_clauses(self):
+        # Repeated literals are removed, and tautologies left out
+        db = _ClauseDatabase([(1, 2, 1), (1, -1, 3), (-2,)], 3)
+        self.assertEqual([[1, 2], [-2]], db.clauses)
+        self.assertEqual([None] * 7, db.values)
+
+    def test_assign_and_backtrack(self):
+        db = _ClauseDatabase([(1, 2), (-1, 3), (-2, -3)], 3)
+        self.assertEqual(0, db.next_unsatisfied())
+
+        db.decide(1)
+        self.assertIsNone(db.propagate())
+        self.assertEqual([1, 3, -2], db.trail)
+        self.assertEqual(3, db.next_unsatisfied())
+        self.assertEqual({'a': True, 'b': False, 'c': True}, db.bindings(lambda lit: 'abc'[abs(lit) - 1]))
+
+        db.backtrack(0)
+        self.assertEqual([], db.trail)
+        self.assertEqual([None] * 7, db.values)
+        self.assertEqual(0, db.level)
+
+        db.decide(-3)
+        self.assertIsNone(db.propagate())
+        self.assertEqual([-3, -1, 2], db.trail)
+        self.assertEqual(1, db.level)
+
+    def test_next_unsatisfied(self):
+        db = _ClauseDatabase([(1, 2), (-1, 3), (2, 3, 4), (-2, -3)], 4)
+        db.decide(4)
+        self.assertIsNone(db.propagate())
+        self.assertEqual(0, db.next_unsatisfied())
+        self.assertEqual(3, db.next_unsatisfied(2))
+
+    def test_conflict(self):
+        db = _ClauseDatabase([(1, 2), (1, -2)], 2)
+        db.decide(-1)
+        self.assertEqual([-2, 1], sorted(db.propagate()))
+
+    def test_empty_clauses(self):
+        self.assertFalse(_ClauseDatabase([(1,), ()], 1).assign_units())
+        self.assertFalse(_ClauseDatabase([(1,), (-1,)], 1).assign_units())
+
+
+class DPLLSearchTests(TestCase):
+    def test_no_clauses(self):
+        solution = DPLLSolver()._solve(CNF.from_clauses([], ['a', 'b']))
+        self.assertEqual(1, len(solution))
+        self.assertTrue(solution.is_true)
+
+    def test_empty_clause(self):
+        self.assertTrue(DPLLSolver()._solve(CNF.from_clauses([(1, 2), ()], ['a', 'b'])).is_false)
+
+    def test_true_before_false(self):
+        solution = DPLLSolver().solve('a | b')
+        self.assertEqual([{'a': True}, {'a': False, 'b': True}], [it._truth for it in solution])
+
+    def test_deep_search(self):
+        # Every other clause needs a decision, far more decision levels than the recursion limit
+        num_variables = 5000
+        clauses = [(var, var + 1) for var in range(1, num_variables)]
+        problem = CNF.from_clauses(clauses, [f'v{var}' for var in range(num_variables)])
+        solution = DPLLSolver()._solve(problem, 1)
+        self.assertFalse(solution.is_false)
+        truth = solution.assignments[0]._truth
+        self.assertTrue(all(truth.get(f'v{a - 1}') or truth.get(f'v{b - 1}') for a, b in clauses))
@@ -0,0 +1,124 @@
+from itertools import product
+from unittest import TestCase
+from unittest.mock import patch
+
+from bsat.logic import NaryOperation
+from bsat.norm import CNF, NNF, simplify_clauses, split_components
+
+
+def models(cnf: CNF) -> set:
+    """Finds all models of a CNF by brute force, projected onto the original variables."""
+    found = set()
+    for values in product([False, True], repeat=cnf.num_variables):
+        if all(any(values[abs(lit) - 1] == (lit > 0) for lit in clause) for clause in cnf.clauses):
+            found.add(values[:len(cnf.variables)])
+
+    return found
+
+
+class CNFTests(TestCase):
+    def test_clauses(self):
+        cnf = CNF('(p | q) & ~r')
+        self.assertEqual(['p', 'q', 'r'], cnf.variables)
+        self.assertEqual([(1, 2), (-3,)], cnf.clauses)
+        self.assertEqual('(p | q) & (~r)', str(cnf))
+
+    def test_distribution(self):
+        cnf = CNF('(a & b) | c')
+        self.assertEqual([(1, 3), (2, 3)], cnf.clauses)
+
+    def test_negation_normal_form(self):
+        nnf = NNF('~(a <-> b) | ~(c + ~d) -> e')
+        self.assertEqual('(((~a | b) & (~b | a) & ((c & d) | (~d & ~c))) | e)', str(nnf))
+
+    def test_nested_negations(self):
+        cnf = CNF('~~~(a & b)')
+        self.assertEqual([(-1, -2)], cnf.clauses)
+
+    def test_constants(self):
+        self.assertEqual([], CNF('p | 1').clauses)
+        self.assertEqual([()], CNF('a & 0').clauses)
+        self.assertEqual([()], CNF('1 -> 0').clauses)
+
+    def test_simplify_clauses(self):
+        clauses = [(1, 2, 1), (3, -3), (2, 1), (1, 2, 4), (-4,), (-4, 5), (1, 2)]
+        self.assertEqual([(1, 2), (-4,)], simplify_clauses(clauses))
+        self.assertEqual([()], simplify_clauses([(1,), (), (2,)]))
+
+        formula = '(a & b) | (~a & c) | (b & c)'
+        self.assertEqual(7, len(CNF(formula, simplify=False).clauses))
+        self.assertEqual([(2, -1), (2, 3), (1, 3)], CNF(formula).clauses)
+        self.assertEqual('(b | ~a) & (b | c) & (a | c)', str(CNF(formula)))
+
+    def test_components(self):
+        clauses = [(1, -2), (3,), (), (2, 4), (-5, 3)]
+        self.assertEqual([[(1, -2), (2, 4)], [(3,), (-5, 3)], [()]], split_components(clauses))
+
+        cnf = CNF('(a | ~c) & (b | d) & (c -> e) & ~d', CNF.TSEITIN)
+        components = cnf.components()
+        self.assertEqual([['a', 'c', 'e'], ['b', 'd']], [component.variables for component in components])
+        self.assertEqual(cnf.num_variables, sum(component.num_variables for component in components))
+        cnf = CNF('a & (a | b)')
+        self.assertEqual([cnf], cnf.components())
+
+    def test_overlapping_names(self):
+        cnf = CNF('ab | ~a & b')
+        self.assertEqual(['a', 'ab', 'b'], cnf.variables)
+        self.assertEqual([(2, -1), (2, 3)], cnf.clauses)
+
+    def test_dimacs(self):
+        cnf = CNF('ab | ~a & b')
+        lines = cnf.dimacs.splitlines()
+        self.assertEqual('p cnf 3 2', lines[2])
+        self.assertEqual(['2 -1 0', '2 3 0'], lines[3:])
+
+    def test_encodings_are_equisatisfiable(self):
+        formulas = ['(a & b) | (c & d) | ~e', '(a <-> b) + (c -> ~a)', '~(a -> (b | 1)) | c',
+                    'a & ~a', 'p | ~p', '(p + q) <-> ~(q & 0)', 'b -> a', '(c | a) & b']
+        for formula in formulas:
+            expected = models(CNF(formula))
+            for encoding in [CNF.TSEITIN, CNF.PG]:
+                self.assertEqual(expected, models(CNF(formula, encoding)), f'{formula} ({encoding})')
+
+    def test_encoding_size_is_linear(self):
+        formula = ' | '.join(f'({a} & {b})' for a, b in zip('abcdefgh', 'klmnopqr'))
+        self.assertEqual(2 ** 8, len(CNF(formula).clauses))
+        self.assertEqual(25, len(CNF(formula, CNF.TSEITIN).clauses))
+        self.assertEqual(17, len(CNF(formula, CNF.PG).clauses))
+
+    def test_unknown_encoding(self):
+        with self.assertRaises(ValueError):
+            CNF('p', 'unknown')
+
+    def test_deep_formulas(self):
+        # Chains deeper than the recursion limit are converted with explicit stacks, and repeated operands removed
+        names = [a + b + c for a in 'abcdefghij' for b in 'abcdefghij' for c in 'abcdefghij'] * 5
+        conjunction = ' & '.join(names)
+        for encoding in CNF.ENCODINGS:
+            self.assertEqual(1000, len(CNF(conjunction, encoding).clauses))
+
+        nnf = NNF('~(' + ' | '.join(names) + ')')
+        self.assertEqual(1000, str(nnf).count('~'))
+        self.assertEqual(1000, len(str(NNF(conjunction)).split(' & ')))
+        self.assertEqual(1, len(CNF('~(' + ' | '.join(names) + ') -> z').clauses))
+
+    def test_nested_chains(self):
+        # Right-nested implications and alternating negations are both a single chain of OR in NNF
+        names = [a + b + c for a in 'abcdefghij' for b in 'abcdefghij' for c in 'abcdefghij']
+        implications = ' -> ('.join(names) + ')' * (len(names) - 1)
+        negations = ''.join(f'~({name} {"&" if i % 2 == 0 else "|"} ' for i, name in enumerate(names[:-1]))
+        negations += names[-1] + ')' * (len(names) - 1)
+
+        flatten = NaryOperation.flatten
+        flattened = []
+        for formula, negated in [(implications, names[:-1]), (negations, names[0:-1:2] + names[-1:])]:
+            flattened.clear()
+            with patch.object(NaryOperation, 'flatten', side_effect=lambda op, operands: (
+                    flattened.append(len(operands)) or flatten(op, operands))):
+                nnf = NNF(formula)
+
+            # Each chain becomes one n-ary operation, built once from all its operands
+            self.assertEqual(len(names) - 1, str(nnf).count(' | '))
+            self.assertEqual(len(negated), str(nnf).count('~'))
+            self.assertEqual([len(names)], flattened)
+            self.assertEqual([len(names)], [len(clause) for clause in CNF(formula).clauses])
@@ -0,0 +1,43 @@
+from unittest import TestCase
+from unittest.mock import patch
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, DPLLSolver, ModelCounter
+
+from .test_cnf import models
+
+
+class ModelCounterTests(TestCase):
+    def test_matches_brute_force(self):
+        formulas = ['(a & b) | (c & d) | ~e', '(a <-> b) + (c -> ~a)', '~(a -> (b | 1)) | c',
+                    'a & ~a', 'p | ~p', '(p + q) <-> ~(q & 0)', 'b -> a', '(a -> b) & (b -> c) & (c -> d)']
+        for formula in formulas:
+            expected = len(models(CNF(formula)))
+            for encoding in CNF.ENCODINGS:
+                self.assertEqual(expected, ModelCounter().count(CNF(formula, encoding)), f'{formula} ({encoding})')
+
+    def test_independent_components(self):
+        # 7 models for each of the 20 clauses, which would take 7^20 assignments to enumerate
+        formula = ' & '.join(f'(a{c} | b{c} | ~c{c})' for c in 'abcdefghijklmnopqrst')
+        self.assertEqual(7 ** 20, ModelCounter().count(CNF(formula)))
+
+    def test_solution_counts_models(self):
+        for solver in [DPLLSolver(), CDCLSolver()]:
+            solution = solver.solve('a | b | c | d')
+            self.assertEqual(15, solution.count_models())
+            self.assertFalse(solution.is_true)
+            self.assertTrue(solver.solve('(a -> b) | (b -> a) | c').is_true)
+
+    def test_long_clause(self):
+        # Each branch of the counter only removes one literal of the clause, far deeper than the recursion limit
+        num_variables = 2000
+        problem = CNF.from_clauses([tuple(range(1, num_variables + 1))], [f'v{var}' for var in range(num_variables)])
+        self.assertEqual(2 ** num_variables - 1, ModelCounter().count(problem))
+
+    def test_tautologies_are_not_counted(self):
+        with patch.object(ModelCounter, 'count', side_effect=AssertionError('models counted')):
+            for encoding in CNF.ENCODINGS:
+                for solver in [DPLLSolver(), CDCLSolver()]:
+                    self.assertTrue(solver.solve(CNF('(a -> b) | (b -> a) | c', encoding), 1).is_true)
+                    self.assertFalse(solver.solve(CNF('a | b | c | d', encoding), 1).is_true)
+                    self.assertEqual('Tautology', str(solver.solve(CNF('(a & b) | ~a | ~b', encoding), 1)))
@@ -0,0 +1,78 @@
+import multiprocessing
+import socket
+import time
+from unittest import TestCase
+from unittest.mock import patch
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, CubeAndConquerSolver
+from bsat.solvers.cubing import run_worker
+
+
+class CubeAndConquerSolverTests(TestCase):
+    formula = '(a | b) & (c | d) & (e | ~a) & (f | ~c) & (~e | ~f | g)'
+
+    def test_cubes(self):
+        solver = CubeAndConquerSolver(processes=1, depth=2)
+        cubes = solver.cubes(CNF('(a | b) & (a | ~b) & (c | d)'))
+        self.assertEqual([{'a': True, 'c': False, 'd': True}, {'a': True, 'c': True}], cubes)
+        self.assertEqual([], solver.cubes(CNF('(a | b) & (a | ~b) & ~a')))
+
+    def test_solve(self):
+        solver = CubeAndConquerSolver(processes=2, depth=3)
+        solution = solver.solve(self.formula)
+        self.assertEqual(CDCLSolver().solve(self.formula).count_models(), solution.count_models())
+
+        # Models of different cubes are disjoint, and cover all models together
+        variables = len(solution.problem.variables)
+        self.assertEqual(solution.count_models(), sum(2 ** (variables - len(assignment._truth))
+                                                      for assignment in solution.assignments))
+        self.assertEqual(1, len(solver.solve(self.formula, 1)))
+        self.assertTrue(solver.solve(self.formula + ' & ~b & ~d & a & ~g').is_false)
+
+    def test_model_order(self):
+        # With auxiliary variables, models of different cubes can be equal once projected, and are listed once
+        formula = '(a | b) & (c | ~(a & b)) & (d <-> (a | c))'
+        for encoding in CNF.ENCODINGS:
+            problem = CNF(formula, encoding)
+            solution = CubeAndConquerSolver(processes=2, depth=3).solve(problem)
+            names = [list(assignment._truth) for assignment in solution.assignments]
+            self.assertEqual([sorted(keys, key=problem.variables.index) for keys in names], names)
+            self.assertEqual(len(solution.assignments), len(set(map(str, solution.assignments))))
+            self.assertEqual(CDCLSolver().solve(problem).count_models(), solution.count_models())
+
+    def test_remote_workers(self):
+        with socket.socket() as s:
+            s.bind(('localhost', 0))
+            address = s.getsockname()
+
+        worker = multiprocessing.Process(target=run_worker, args=(address, b'key'))
+        worker.start()
+        solver = CubeAndConquerSolver(processes=0, depth=2, address=address, authkey=b'key')
+        self.assertEqual(str(CubeAndConquerSolver(processes=1, depth=2).solve(self.formula)),
+                         str(solver.solve(self.formula)))
+        worker.join(10)
+        self.assertEqual(0, worker.exitcode)
+
+    def test_no_workers(self):
+        with socket.socket() as s:
+            s.bind(('localhost', 0))
+            address = s.getsockname()
+
+        solver = CubeAndConquerSolver(processes=0, depth=2, address=address, authkey=b'key', worker_timeout=0.5)
+        with self.assertRaises(RuntimeError):
+            solver.solve(self.formula).assignments
+
+    def test_stop_without_wake_up(self):
+        # The thread accepting workers is left behind if it cannot be woken up, instead of waiting for it forever
+        solver = CubeAndConquerSolver(processes=1, depth=2)
+        with patch.object(socket, 'create_connection', side_effect=ConnectionRefusedError):
+            start = time.monotonic()
+            self.assertLess(0, len(solver.solve(self.formula)))
+            self.assertLess(time.monotonic() - start, 10)
+
+    def test_configuration(self):
+        with self.assertRaises(ValueError):
+            CubeAndConquerSolver(processes=0)
+        with self.assertRaises(ValueError):
+            CubeAndConquerSolver(address=('localhost', 6000))
@@ -0,0 +1,48 @@
+import os
+from io import BytesIO, StringIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bsat.norm import CNF, DimacsReader, read_dimacs, write_dimacs
+from bsat.solvers import CDCLSolver
+
+
+class DimacsTests(TestCase):
+    def test_read(self):
+        text = 'c example\nc\np cnf 5 3\n1 -2 0\n3\n 4 0 -1 0\n\n%\n0\n'
+        reader = DimacsReader(StringIO(text))
+        self.assertEqual([(1, -2), (3, 4), (-1,)], list(reader))
+        self.assertEqual((5, 3), (reader.num_variables, reader.num_clauses))
+        self.assertEqual(['example', ''], reader.comments)
+
+        self.assertEqual((5, [(1, -2), (3, 4), (-1,)]), read_dimacs(BytesIO(text.encode())))
+        self.assertEqual((4, [(4, -1), ()]), read_dimacs(StringIO('4 -1 0 0')))
+
+    def test_invalid_files(self):
+        for text in ['p cnf 2\n1 0\n', 'p dnf 2 1\n1 0\n', 'p cnf 1 1\np cnf 1 1\n', 'p cnf 2 1\n1 a 0\n']:
+            with self.assertRaises(ValueError):
+                read_dimacs(StringIO(text))
+
+    def test_write(self):
+        text = StringIO()
+        write_dimacs(text, iter([(1, -2), (), (3,)]), 3, comments=['example'])
+        self.assertEqual('c example\np cnf 3 3\n1 -2 0\n0\n3 0\n', text.getvalue())
+
+    def test_round_trip(self):
+        cnf = CNF('(a | ~b) & (b <-> c) & ~(c & d)', CNF.TSEITIN)
+        with TemporaryDirectory() as directory:
+            for name in ['problem.cnf', 'problem.cnf.gz', 'problem.cnf.xz']:
+                path = os.path.join(directory, name)
+                cnf.write_dimacs(path)
+                copy = CNF.from_dimacs(path)
+                self.assertEqual(cnf.clauses, copy.clauses)
+                self.assertEqual(cnf.num_variables, copy.num_variables)
+                self.assertEqual(['x1', 'x2'], copy.variables[:2])
+
+    def test_solve(self):
+        cnf = CNF.from_dimacs(StringIO('p cnf 3 2\n1 2 0\n-1 0\n'))
+        solution = CDCLSolver().solve(cnf)
+        self.assertEqual('x1 = 0, x2 = 1', str(solution.assignments[0]))
+        self.assertEqual(2, solution.count_models())
+        self.assertEqual('(x1 | x2) & (~x1)', str(cnf))
+        self.assertEqual('((x1 | x2) & ~x1)', str(cnf.formula))
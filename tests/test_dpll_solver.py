@@ -1,33 +1,24 @@
-import os
 from unittest import TestCase
 
-from solvers import DPLLSolver
+from bsat.solvers import DPLLSolver
 
+from .solver_cases import HEURISTICS, SolverCases
 
-class SolverTests(TestCase):
-    __files_path = os.path.dirname(os.path.realpath(__file__)) + '/examples/'
 
-    def solve_file(self, file: str):
-        solver = DPLLSolver()
-        results = {}
-        with open(file, "r") as f:
-            for proposition in f.readlines():
-                solution = solver.solve(proposition)
-                results[proposition] = solution.problem, solution
-
-        return results
-
-    def test_contradictions(self):
-        results = self.solve_file(self.__files_path + 'contradiction.txt')
-        for formula, (_, solution) in results.items():
-            self.assertEqual(False, solution, formula + ' is satisfiable by ' + str(solution))
+class SolverTests(SolverCases, TestCase):
+    def solvers(self):
+        return [DPLLSolver()] + [DPLLSolver(heuristic()) for heuristic in HEURISTICS]
 
-    def test_tautologies(self):
-        results = self.solve_file(self.__files_path + 'tautology.txt')
-        for formula, (_, solution) in results.items():
-            self.assertEqual(True, solution, f'{formula} not a tautology but {solution}')
-
-    def test_satisfiable_formulas(self):
-        results = self.solve_file(self.__files_path + 'satisfiable.txt')
-        for formula, (_, solution) in results.items():
-            self.assertGreater(len(solution), 0, f'{formula} {solution}')
+    def test_decomposition(self):
+        solver = DPLLSolver()
+        formula = ' & '.join(f'({a} | {b}) & ({a} | ~{c})' for a, b, c in ['abc', 'def', 'ghi', 'jkl'])
+        solution = solver.solve(formula, decompose=True)
+        self.assertEqual(2 ** 4, len(solution))
+        self.assertEqual(5 ** 4, solution.count_models())
+        self.assertEqual(solver.solve(formula).count_models(), solution.count_models())
+        self.assertEqual('\t1) c = 0, b = 1, f = 0, e = 1, i = 0, h = 1, l = 0, k = 1',
+                         str(solver.solve(formula, 1, decompose=True)))
+        self.assertEqual(5, len(list(solver.iter_solutions(formula, 5, decompose=True))))
+
+        self.assertTrue(solver.solve(formula + ' & (m & ~m)', decompose=True).is_false)
+        self.assertTrue(solver.solve(formula + ' & (m | ~m)', decompose=True) == solution)
@@ -0,0 +1,58 @@
+import pickle
+from unittest import TestCase
+
+from bsat.logic import BinaryOperation, ExpressionBuilder, Literal, NaryOperation, Operators, UnaryOperation
+from bsat.logic.identities import simplify_operators
+from bsat.logic.laws import de_morgans_law, distribute_ands
+
+
+class ExpressionTests(TestCase):
+    def test_equal_expressions_are_shared(self):
+        expr = ExpressionBuilder.from_proposition('(a & ~b) | (a & ~b)')
+        self.assertIs(expr.operand_1, expr.operand_2)
+        self.assertIs(expr, ExpressionBuilder.from_proposition('((a & ~b) | (a & ~b))'))
+        self.assertIs(Literal('a'), expr.operand_1.operand_1)
+        self.assertIsNot(Literal(True), Literal('1'))
+
+        built = BinaryOperation(Operators.AND, Literal('a'), UnaryOperation(Operators.NOT, Literal('b')))
+        self.assertIs(expr.operand_1, built)
+        self.assertEqual(hash(expr.operand_1), hash(built))
+        self.assertNotEqual(expr, expr.operand_1)
+
+    def test_expressions_are_immutable(self):
+        expr = ExpressionBuilder.from_proposition('a -> b')
+        with self.assertRaises(AttributeError):
+            expr.operand_1 = Literal('c')
+
+    def test_pickling_interns_expressions(self):
+        expr = ExpressionBuilder.from_proposition('(a <-> ~b) + (c | 0)')
+        self.assertIs(expr, pickle.loads(pickle.dumps(expr)))
+
+    def test_cached_properties(self):
+        expr = ExpressionBuilder.from_proposition('(b | ~a) & c')
+        self.assertIs(expr.parse_tree, expr.parse_tree)
+        self.assertIs(expr.operand_1.parse_tree, expr.parse_tree[1])
+        self.assertEqual(['a', 'b', 'c'], expr.literals)
+
+    def test_nary_operations(self):
+        a, b, c = Literal('a'), Literal('b'), Literal('c')
+        expr = NaryOperation(Operators.AND, [ExpressionBuilder.from_proposition('a & b'), c, a])
+        self.assertEqual((a, b, c), expr.operands)
+        self.assertEqual('(a & b & c)', str(expr))
+        self.assertIs(expr, NaryOperation(Operators.AND, [a, NaryOperation(Operators.AND, [b, c])]))
+        self.assertEqual(['&', 'a', 'b', 'c'], expr.parse_tree)
+        self.assertIs(expr, pickle.loads(pickle.dumps(expr)))
+
+        self.assertIs(a, NaryOperation(Operators.OR, [a, Literal(False), a]))
+        self.assertIs(Literal(True), NaryOperation(Operators.OR, [a, Literal(True)]))
+        self.assertIs(Literal(True), NaryOperation(Operators.AND, []))
+        with self.assertRaises(ValueError):
+            NaryOperation(Operators.XOR, [a, b])
+
+    def test_laws(self):
+        expr = ExpressionBuilder.from_proposition('~((a -> b) + ~~c)')
+        self.assertEqual('~(~((~(~a | b) | ~(~c)) & (~(~(~c)) | (~a | b))))', str(simplify_operators(expr)))
+        self.assertEqual('((a | ~b) & (b | c))',
+                         str(de_morgans_law(ExpressionBuilder.from_proposition('~(~a & b | ~(b | c))'))))
+        self.assertEqual('((a | c) & (b | c) & (a | d) & (b | d))',
+                         str(distribute_ands(ExpressionBuilder.from_proposition('(a & b) | (c & d)'))))
@@ -0,0 +1,32 @@
+import random
+from unittest import TestCase
+
+from bsat.solvers import CDCLSolver, DPLLSolver
+from bsat.solvers.heuristics import DLIS, MOMs, VSIDS, JeroslowWang, _Heap
+
+
+class HeuristicsTests(TestCase):
+    def test_heap(self):
+        scores = [0, 5, 3, 9, 1, 7]
+        heap = _Heap(scores, len(scores))
+        for key in range(1, len(scores)):
+            heap.push(key)
+
+        scores[4] = 10
+        heap.update(4)
+        heap.remove(3)
+        self.assertNotIn(3, heap)
+        self.assertEqual([4, 5, 1, 2], [heap.pop() for _ in range(len(heap))])
+
+    def test_solvers_agree(self):
+        rng = random.Random(0)
+        formulas = []
+        for _ in range(20):
+            clauses = [' | '.join(rng.choice(['', '~']) + rng.choice('abcdef') for _ in range(3)) for _ in range(14)]
+            formulas.append(' & '.join(f'({clause})' for clause in clauses))
+
+        expected = [DPLLSolver().solve(formula).is_false for formula in formulas]
+        for heuristic in [VSIDS(), MOMs(), JeroslowWang(), DLIS()]:
+            for solver in [DPLLSolver(heuristic), CDCLSolver(heuristic)]:
+                found = [solver.solve(formula).is_false for formula in formulas]
+                self.assertEqual(expected, found, f'{type(solver).__name__} with {type(heuristic).__name__}')
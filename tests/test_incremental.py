@@ -0,0 +1,76 @@
+import io
+from unittest import TestCase
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, SolverSession
+from bsat.solvers.heuristics import DLIS
+
+
+class SolverSessionTests(TestCase):
+    def test_assumptions(self):
+        session = SolverSession()
+        session.add('(a -> b) & (b -> c)')
+        self.assertTrue(session.solve())
+        self.assertTrue(session.solve(['a']))
+        self.assertEqual({'a': True, 'b': True, 'c': True}, session.model)
+
+        self.assertFalse(session.solve(['a', 'd', '~c']))
+        self.assertIsNone(session.model)
+        self.assertEqual(['a', '~c'], session.core)
+
+        session.add('~c')
+        self.assertFalse(session.solve(['a']))
+        self.assertEqual(['a'], session.core)
+        self.assertTrue(session.solve(['~a']))
+        self.assertEqual([], session.core)
+        self.assertEqual(['a', 'b', 'c', 'd'], session.variables)
+
+    def test_scopes(self):
+        session = SolverSession(CDCLSolver(heuristic=DLIS()))
+        session.add('a | b')
+        session.push()
+        session.add('~a')
+        session.push()
+        session.add_clause(['~b'])
+        self.assertEqual(2, session.num_scopes)
+        self.assertFalse(session.solve())
+        self.assertEqual([], session.core)
+
+        session.pop()
+        self.assertTrue(session.solve())
+        self.assertTrue(session.model['b'])
+        session.pop()
+        self.assertTrue(session.solve(['a', '~b']))
+        with self.assertRaises(IndexError):
+            session.pop()
+
+    def test_unsatisfiable(self):
+        session = SolverSession()
+        session.add('(a | b) & (~a | b) & (a | ~b) & (~a | ~b | c) & (~a | ~b | ~c)')
+        self.assertFalse(session.solve(['~c']))
+        self.assertEqual([], session.core)
+        self.assertFalse(session.solve(['c']))
+        self.assertFalse(session.solve())
+
+    def test_queries(self):
+        clauses = ['(a | ~b | c)', '(~a | d)', '(b | ~d | e)', '(~c | ~e)', '(c | d | ~f)', '(~a | ~b | f)']
+        session = SolverSession()
+        session.add(' & '.join(clauses))
+        solver = CDCLSolver()
+        for assumptions in (['a'], ['a', 'b'], ['a', 'b', 'c'], ['~d', 'a'], ['e', 'c'], ['f', '~c', '~d']):
+            expected = not solver.solve(' & '.join(clauses + assumptions), 1).is_false
+            self.assertEqual(expected, session.solve(assumptions), assumptions)
+
+    def test_dimacs_variables(self):
+        session = SolverSession()
+        session.add(CNF.from_dimacs(io.StringIO('p cnf 3 2\n1 -2 0\n2 3 0\n')))
+        self.assertFalse(session.solve(['~x1', 'x2']))
+        self.assertEqual(['~x1', 'x2'], session.core)
+        self.assertTrue(session.solve(['~x1', '~ ~x3']))
+        session.add_clause(['~x3', 'y'])
+        self.assertEqual(['x1', 'x2', 'x3', 'y'], session.variables)
+
+        # Other names must be variable names of the grammar
+        for literal in ['x4', '~_1', 'a1', '']:
+            with self.assertRaises(ValueError):
+                session.solve([literal])
@@ -0,0 +1,56 @@
+import io
+import os
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from unittest import TestCase
+from unittest.mock import patch
+
+import main
+
+
+class MainTests(TestCase):
+    def test_parallel_solvers_rejected(self):
+        for name in ['portfolio', 'cube']:
+            stderr = io.StringIO()
+            with patch.object(sys, 'argv', ['main.py', '-w', 'a | b', '-j', '2', '-s', name]), \
+                    redirect_stderr(stderr), self.assertRaises(SystemExit):
+                main.main()
+
+            self.assertIn(f'-j cannot be combined with -s {name}', stderr.getvalue())
+
+    def test_parallel_file(self):
+        formulas = ['a | b', 'a & ~a', '(a -> b) | (b -> a)', 'a & (b | c)', '~(p <-> q)', 'x & y & ~z'] * 3
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'formulas.txt')
+            with open(path, 'w') as f:
+                f.writelines(f'{formula}\n' for formula in formulas)
+
+            outputs = []
+            for processes in ['1', '2']:
+                main.args = main.parser.parse_args(['-f', path, '-j', processes])
+                stdout = io.StringIO()
+                with redirect_stdout(stdout):
+                    main.solve_file(path, main.create_solver(main.args.s))
+                outputs.append(stdout.getvalue())
+
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(formulas, [line for line in outputs[1].splitlines() if line in formulas])
+
+    def test_parallel_read_ahead(self):
+        read = 0
+
+        def propositions():
+            nonlocal read
+            for _ in range(50):
+                read += 1
+                yield 'a | b'
+
+        main.args = main.parser.parse_args(['-j', '2'])
+        with patch.object(main, 'BATCH_SIZE', 3):
+            # At most 2 batches of 3 formulas per process are read ahead of the results
+            for solved, result in enumerate(main.solve_in_pool(propositions()), 1):
+                self.assertTrue(result.startswith('a | b <=> '))
+                self.assertLessEqual(read - solved, 2 * 2 * 3)
+
+        self.assertEqual(50, read)
@@ -0,0 +1,53 @@
+import multiprocessing
+import random
+from unittest import TestCase
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, DPLLSolver, PortfolioSolver
+from bsat.solvers.portfolio import _ClauseExchange
+
+
+class _FailingSolver(DPLLSolver):
+    def _solve(self, problem, max_solutions=None):
+        raise MemoryError
+
+
+def _send(exchange: _ClauseExchange):
+    exchange.send([1, -2])
+    exchange.send([3])
+
+
+class PortfolioSolverTests(TestCase):
+    def test_solve(self):
+        solver = PortfolioSolver()
+        self.assertEqual(str(CDCLSolver().solve('(a -> b) & (b | c)')), str(solver.solve('(a -> b) & (b | c)')))
+        self.assertTrue(solver.solve('(a -> b) & a & ~b').is_false)
+        self.assertEqual(1, len(solver.solve('a | b | c', 1)))
+        self.assertTrue(solver.is_valid('a | ~a'))
+
+    def test_failures(self):
+        with self.assertRaises(ValueError):
+            PortfolioSolver([])
+        self.assertEqual('UNSAT', str(PortfolioSolver([_FailingSolver(), CDCLSolver()]).solve('a & ~a')))
+        with self.assertRaises(RuntimeError):
+            PortfolioSolver([_FailingSolver()]).solve('a')
+
+    def test_clause_exchange(self):
+        exchange = _ClauseExchange(8)
+        exchange.send([4, 5])
+        process = multiprocessing.Process(target=_send, args=(exchange,))
+        process.start()
+        process.join()
+
+        # Clauses sent by this process are skipped, and clauses which do not fit are dropped
+        self.assertEqual([[1, -2]], list(exchange.receive()))
+        self.assertEqual([], list(exchange.receive()))
+
+    def test_shared_clauses(self):
+        rng = random.Random(1)
+        solver = PortfolioSolver([CDCLSolver(restart_interval=5), CDCLSolver(restart_interval=3)], share_clauses=True)
+        for ratio in (3.5, 5.0):
+            clauses = [tuple(rng.choice([1, -1]) * var for var in rng.sample(range(1, 41), 3))
+                       for _ in range(int(ratio * 40))]
+            problem = CNF.from_clauses(clauses, [f'x{chr(97 + i // 26)}{chr(97 + i % 26)}' for i in range(40)])
+            self.assertEqual(CDCLSolver().solve(problem, 1).is_false, solver.solve(problem, 1).is_false)
@@ -0,0 +1,57 @@
+from itertools import product
+from unittest import TestCase
+
+from bsat.norm import CNF
+from bsat.solvers import CDCLSolver, DPLLSolver, Preprocessor
+
+from .test_cnf import models
+
+
+def cubes(assignments, variables) -> set:
+    """Expands assignments leaving variables unassigned into all the models they cover."""
+    found = set()
+    for assignment in assignments:
+        truth = assignment._truth if isinstance(assignment._truth, dict) else dict()
+        cube = [[truth[var]] if var in truth else [False, True] for var in variables]
+        found.update(product(*cube))
+
+    return found
+
+
+class PreprocessorTests(TestCase):
+    def test_removes_variables(self):
+        problem = CNF('(a & b) | (c & d) | (e <-> f)', CNF.TSEITIN)
+        reduced = Preprocessor().preprocess(problem)
+        self.assertLess(len(reduced.clauses), len(problem.clauses))
+        self.assertEqual(problem.num_variables, reduced.num_variables)
+
+        preprocessor = Preprocessor(elimination=False, probing=False, equivalences=False)
+        self.assertEqual([(3, 4)], preprocessor.preprocess(CNF('a & (a | b) & (~a | c | d)')).clauses)
+
+    def test_equivalent_literals(self):
+        preprocessor = Preprocessor(elimination=False)
+        reduced = preprocessor.preprocess(CNF('(a -> b) & (b -> c) & (c -> a) & (a | d) & (~c | ~d | e)'))
+        self.assertEqual([(1, 4), (-1, -4, 5)], reduced.clauses)
+        self.assertEqual([(2, [(-2, 1), (2, -1)]), (3, [(-3, 1), (3, -1)])], sorted(preprocessor.stack))
+
+    def test_unsatisfiable(self):
+        self.assertEqual([()], Preprocessor().preprocess(CNF('(a <-> ~b) & (b <-> c) & (c <-> a)')).clauses)
+        self.assertEqual([()], Preprocessor().preprocess(CNF('(a | b) & (a | ~b) & (~a | c) & (~a | ~c)')).clauses)
+
+    def test_models_are_extended(self):
+        formulas = ['(a & b) | (c & d) | ~e', '(a <-> b) + (c -> ~a)', '(a -> b) & (b -> c) & (c -> d)',
+                    'a & ~a', 'p | ~p', '(p + q) <-> ~(q & r)', '(a | b) & (~a | c) & (~b | c) & (d -> ~c)']
+        for formula in formulas:
+            expected = models(CNF(formula))
+            for solver in [DPLLSolver(), CDCLSolver()]:
+                solution = solver.solve(formula, preprocess=True)
+                self.assertEqual(expected, cubes(solution, solution.problem.variables), formula)
+
+            for encoding in [CNF.TSEITIN, CNF.PG]:
+                problem = CNF(formula, encoding)
+                solution = CDCLSolver()._solve_preprocessed(problem, Preprocessor())
+                self.assertEqual(expected, cubes(solution, problem.variables), f'{formula} ({encoding})')
+
+    def test_bounded_solutions(self):
+        solution = CDCLSolver().solve('(a | b) & (c | d) & (e | f)', 2, preprocess=Preprocessor(probing=False))
+        self.assertEqual(2, len(solution))
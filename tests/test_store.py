@@ -0,0 +1,65 @@
+import os
+from io import StringIO
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from bsat.norm import CNF, ClauseStore, read_store, write_store
+from bsat.solvers import CDCLSolver
+
+
+class ClauseStoreTests(TestCase):
+    def test_sequence(self):
+        clauses = [(1, -2), (), (3, -4, 5)]
+        store = ClauseStore(clauses)
+        self.assertEqual(3, len(store))
+        self.assertEqual(5, store.num_literals)
+        self.assertEqual(clauses, list(store))
+        self.assertEqual((3, -4, 5), store[-1])
+        self.assertEqual(clauses[1:], store[1:])
+        self.assertEqual(store, clauses)
+        with self.assertRaises(IndexError):
+            store[3]
+
+    def test_file(self):
+        with TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'problem.clauses')
+            write_store(path, [(1, -2), (2, 3)], 4, ['a', 'b', 'c'], 'tseitin', 'a | ~b')
+            num_variables, variables, store, encoding, formula = read_store(path)
+            self.assertEqual((4, ['a', 'b', 'c'], 'tseitin', 'a | ~b'), (num_variables, variables, encoding, formula))
+            self.assertEqual([(1, -2), (2, 3)], list(store))
+            store.close()
+
+            write_store(path, [(1, -2)], 2)
+            num_variables, variables, store, encoding, formula = read_store(path)
+            self.assertEqual((2, [], 'distribute', ''), (num_variables, variables, encoding, formula))
+            store.close()
+
+            with open(path, 'wb') as f:
+                f.write(b'p cnf 1 1\n1 0\n')
+            with self.assertRaises(ValueError):
+                read_store(path)
+
+    def test_save_and_load(self):
+        for formula in ['(a | ~b) & (b <-> c) & ~(c & d)', '(a -> b) | (b -> a) | (c & ~d)']:
+            for encoding in CNF.ENCODINGS:
+                cnf = CNF(formula, encoding)
+                with TemporaryDirectory() as directory:
+                    path = os.path.join(directory, 'problem.clauses')
+                    cnf.save(path)
+                    loaded = CNF.load(path)
+                    self.assertIsInstance(loaded.clauses, ClauseStore)
+                    self.assertEqual(cnf.clauses, list(loaded.clauses))
+                    self.assertEqual((cnf.variables, cnf.num_variables, cnf.encoding),
+                                     (loaded.variables, loaded.num_variables, loaded.encoding))
+
+                    # Models are counted and projected on the original variables, as for the formula itself
+                    expected, solution = CDCLSolver().solve(cnf), CDCLSolver().solve(loaded)
+                    self.assertEqual(expected.count_models(), solution.count_models(), f'{formula} ({encoding})')
+                    self.assertEqual(expected.is_true, solution.is_true, f'{formula} ({encoding})')
+                    self.assertEqual(str(expected), str(solution))
+                    loaded.clauses.close()
+
+    def test_dimacs_is_read_into_store(self):
+        cnf = CNF.from_dimacs(StringIO('p cnf 2 2\n1 2 0\n-1 0\n'))
+        self.assertIsInstance(cnf.clauses, ClauseStore)
+        self.assertEqual('x1 = 0, x2 = 1', str(CDCLSolver().solve(cnf).assignments[0]))